@@ -1,10 +1,15 @@
 import os
-from typing import Callable, List
-
-import torch
+from typing import Callable, Iterator, List, Tuple
 
 from ai.tools.csv_loader import load_params
-from ai.tools.generator import generate_image
+from ai.tools.generator import (
+    GenerationCancelled,
+    free_memory,
+    generate_image,
+    generate_images,
+    is_out_of_memory,
+    random_seed,
+)
 
 
 class _SafeDict(dict):
@@ -19,6 +24,17 @@ STYLE_HINT = (
     " tactical atmosphere"
 )
 
+# Скільки зображень проганяти через UNet за раз; при OOM зменшується автоматично.
+def _batch_size_from_env(name: str, default: int = 1) -> int:
+    # Некоректне значення змінної не повинне валити GUI під час імпорту
+    try:
+        return max(1, int(os.environ.get(name, default)))
+    except ValueError:
+        return default
+
+
+DEFAULT_BATCH_SIZE = _batch_size_from_env("LS_GEN_BATCH_SIZE")
+
 
 def _personalize_prompt(prompt_template: str, params: dict) -> str:
     """Apply CSV params to prompt while staying friendly to Ukrainian text."""
@@ -77,6 +93,80 @@ def _resolve_csv_path(csv_path: str | None) -> str | None:
     return None
 
 
+def _job_seed(seed: int | None, index: int) -> int:
+    """Row seed: seed + index when the caller fixed a base seed, otherwise a fresh random one."""
+    # Фіксований seed робить ключ кешу артів відтворюваним: той самий запуск
+    # знову бере картинки з кешу і навіть не завантажує torch
+    if seed is None:
+        return random_seed()
+    return (int(seed) + index) % (2**32 - 1)
+
+
+def _batch_key(job: dict) -> tuple:
+    """Rows can share a pipeline call only if these inputs match."""
+
+    return (
+        job["model"],
+        job["width"],
+        job["height"],
+        job["steps"],
+        job.get("negative_prompt"),
+        tuple(job.get("loras") or ()),
+    )
+
+
+def _iter_generated_batches(
+    jobs: List[dict],
+    batch_size: int,
+    is_aborted: Callable[[], bool] | None = None,
+    on_step: Callable[[int, int, float], None] | None = None,
+) -> Iterator[List[Tuple[dict, object]]]:
+    """Run jobs in compatible batches and yield ``(job, image)`` pairs per batch.
+
+    Jobs are grouped by :func:`_batch_key` (keeping their relative order) and
+    each batch is yielded as soon as it finishes so callers can save it right
+    away. On out-of-memory the batch size is halved and the batch retried.
+    Cancellation via ``is_aborted`` takes effect at the next denoising step.
+    """
+
+    groups: dict = {}
+    for job in jobs:
+        groups.setdefault(_batch_key(job), []).append(job)
+
+    batch_size = max(1, int(batch_size or 1))
+    for group in groups.values():
+        pos = 0
+        while pos < len(group):
+            if is_aborted and is_aborted():
+                return
+            chunk = group[pos:pos + batch_size]
+            head = chunk[0]
+            try:
+                images = generate_images(
+                    [job["prompt"] for job in chunk],
+                    head["model"],
+                    width=head["width"],
+                    height=head["height"],
+                    steps=head["steps"],
+                    seeds=[job["seed"] for job in chunk],
+                    negative_prompt=head.get("negative_prompt"),
+                    loras=head.get("loras"),
+                    on_step=on_step,
+                    is_aborted=is_aborted,
+                )
+            except GenerationCancelled:
+                return
+            except Exception as exc:
+                if batch_size > 1 and is_out_of_memory(exc):
+                    free_memory()
+                    batch_size = max(1, batch_size // 2)
+                    print(f"[WARNING] Out of memory — batch size reduced to {batch_size}")
+                    continue
+                raise
+            pos += len(chunk)
+            yield list(zip(chunk, images))
+
+
 def generate_ai_images(
     prompt: str,
     csv_path: str | None,
@@ -90,24 +180,31 @@ def generate_ai_images(
     language: str = "en",
     negative_prompt: str | None = None,
     loras: list[str] | None = None,
+    steps: int = 25,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    on_step: Callable[[int, int, float], None] | None = None,
+    seed: int | None = None,
 ) -> List[str]:
     """
     Generate a list of images with optional CSV-driven personalization.
 
     The helper is resilient to Ukrainian prompts (UTF-8) and will use
     personalization files when explicitly provided, resolving them inside
-    the ``config`` directory if needed.
+    the ``config`` directory if needed. Rows are rendered ``batch_size`` at a
+    time and each batch is written to disk as soon as it completes.
+
+    Row ``i`` uses ``seed + i`` when ``seed`` is given, so repeating a run is
+    served from the art cache; without it every run draws random seeds and
+    only the preview → final flow (which keeps its seeds) can hit the cache.
     """
 
     resolved_csv = _resolve_csv_path(csv_path)
-    params = load_params(resolved_csv) if resolved_csv else []
+    # Лише перші count рядків: велика колода не розбирається повністю
+    params = load_params(resolved_csv, limit=count) if resolved_csv else []
 
-    images: List[str] = []
+    jobs: List[dict] = []
 
     for i in range(count):
-        if is_aborted and is_aborted():
-            break
-
         if isinstance(params, list):
             row_params = params[i] if i < len(params) else {}
         elif isinstance(params, dict):
@@ -130,19 +227,29 @@ def generate_ai_images(
         effective_style = row_params.get("style_hint") or style_hint
         pr = _enrich_prompt_with_params(pr, row_params, style_hint=effective_style)
 
-        img = generate_image(
-            pr,
-            model_name,
-            width=width,
-            height=height,
-            negative_prompt=negative_prompt,
-            loras=loras,
+        jobs.append(
+            {
+                "index": i,
+                "prompt": pr,
+                "model": model_name,
+                "width": width,
+                "height": height,
+                "steps": steps,
+                "seed": _job_seed(seed, i),
+                "negative_prompt": negative_prompt,
+                "loras": loras or [],
+            }
         )
-        path = f"export/ai_{i+1}.png"
-        img.save(path)
-        images.append(path)
 
-    return images
+    os.makedirs("export", exist_ok=True)
+    saved: dict = {}
+    for batch in _iter_generated_batches(jobs, batch_size, is_aborted, on_step):
+        for job, img in batch:
+            path = f"export/ai_{job['index'] + 1}.png"
+            img.save(path)
+            saved[job["index"]] = path
+
+    return [saved[idx] for idx in sorted(saved)]
 
 
 def generate_previews(
@@ -159,17 +266,23 @@ def generate_previews(
     row_indices: List[int] | None = None,
     negative_prompt: str | None = None,
     loras: list[str] | None = None,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    is_aborted: Callable[[], bool] | None = None,
+    on_step: Callable[[int, int, float], None] | None = None,
+    seed: int | None = None,
 ) -> List[dict]:
     """Generate lightweight preview images with preserved seeds.
 
     Each returned item contains the preview path alongside the seed and
     parameters needed to recreate the image at higher quality later on.
+    ``seed`` works as in :func:`generate_ai_images`.
     """
 
     resolved_csv = _resolve_csv_path(csv_path)
-    params = load_params(resolved_csv) if resolved_csv else []
+    needed = max(row_indices[:count], default=-1) + 1 if row_indices else count
+    params = load_params(resolved_csv, limit=max(needed, count)) if resolved_csv else []
 
-    previews: List[dict] = []
+    jobs: List[dict] = []
 
     for i in range(count):
         if isinstance(params, list):
@@ -197,41 +310,55 @@ def generate_previews(
             style_hint=row_params.get("style_hint") or style_hint,
         )
 
-        seed = torch.randint(0, 2**32 - 1, (1,)).item()
-        img = generate_image(
-            enriched_prompt,
-            model_name,
-            width=width,
-            height=height,
-            steps=steps,
-            seed=seed,
-            negative_prompt=negative_prompt,
-            loras=loras,
-        )
-        os.makedirs("export", exist_ok=True)
-        path = f"export/preview_{i+1}.png"
-        img.save(path)
-
-        previews.append(
+        jobs.append(
             {
-                "path": path,
-                "seed": seed,
+                "index": i,
                 "prompt": enriched_prompt,
                 "model": model_name,
                 "width": width,
                 "height": height,
-                "style_hint": style_hint,
+                "steps": steps,
+                "seed": _job_seed(seed, i),
                 "negative_prompt": negative_prompt,
                 "loras": loras or [],
                 "params": row_params,
             }
         )
 
+    os.makedirs("export", exist_ok=True)
+    by_index: dict = {}
+    for batch in _iter_generated_batches(jobs, batch_size, is_aborted, on_step):
+        for job, img in batch:
+            path = f"export/preview_{job['index'] + 1}.png"
+            img.save(path)
+            by_index[job["index"]] = {
+                "path": path,
+                "seed": job["seed"],
+                "prompt": job["prompt"],
+                "model": model_name,
+                "width": width,
+                "height": height,
+                "style_hint": style_hint,
+                "negative_prompt": negative_prompt,
+                "loras": loras or [],
+                "params": job["params"],
+            }
+
+    previews = [by_index[idx] for idx in sorted(by_index)]
     return previews
 
 
-def finalize_preview(preview: dict, *, steps: int = 30) -> str:
-    """Regenerate a preview with higher quality using the same seed."""
+def finalize_preview(
+    preview: dict,
+    *,
+    steps: int = 30,
+    on_step: Callable[[int, int, float], None] | None = None,
+    is_aborted: Callable[[], bool] | None = None,
+) -> str:
+    """Regenerate a preview with higher quality using the same seed.
+
+    Raises :class:`GenerationCancelled` if ``is_aborted`` fires mid-run.
+    """
 
     prompt = preview.get("prompt", "")
     model_name = preview.get("model", "")
@@ -248,6 +375,8 @@ def finalize_preview(preview: dict, *, steps: int = 30) -> str:
         seed=seed,
         negative_prompt=preview.get("negative_prompt"),
         loras=preview.get("loras"),
+        on_step=on_step,
+        is_aborted=is_aborted,
     )
 
     os.makedirs("export", exist_ok=True)
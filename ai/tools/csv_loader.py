@@ -1,7 +1,10 @@
 import csv
 import json
 import os
-from typing import List
+from itertools import islice
+from typing import Iterator, List
+
+from renderer.core.deck_stream import DeckStream
 
 
 class _SafeDict(dict):
@@ -40,8 +43,43 @@ def _prepare_card(card: dict, prompts: dict | None, style_hint: str | None) -> d
     return card_copy
 
 
-def load_params(path) -> List[dict]:
-    """Завантажує CSV або JSON та повертає у вигляді dict або list."""
+def _prepare_stream_card(stream: DeckStream, card):
+    # Картки з {"cards": [...]} доповнюються промптом/стилем колоди;
+    # рядки CSV і простий JSON-список віддаються як є (як у load_params).
+    if stream.layout == "object" and isinstance(card, dict):
+        prompts = stream.header.get("prompts")
+        return _prepare_card(card, prompts if isinstance(prompts, dict) else {}, stream.header.get("style_hint"))
+    return card
+
+
+def _iter_stream_params(stream: DeckStream) -> Iterator[dict]:
+    for card in stream:
+        yield _prepare_stream_card(stream, card)
+
+
+def iter_params(path) -> Iterator[dict]:
+    """
+    Yield CSV rows / JSON cards one at a time without reading the whole file.
+
+    Covers CSV, a plain JSON list and the {"cards": [...]} deck layout. Other
+    JSON objects ({id: card} maps, a single parameter dict) are small and go
+    through load_params instead. Cards are prepared with the deck keys read
+    so far, so "prompts"/"style_hint" must come before "cards" here.
+    """
+
+    if not path or not os.path.exists(path):
+        return
+    if not (path.endswith(".json") or path.endswith(".csv")):
+        return
+    yield from _iter_stream_params(DeckStream(path))
+
+
+def load_params(path, limit: int | None = None) -> List[dict]:
+    """Завантажує CSV або JSON та повертає у вигляді dict або list.
+
+    limit — прочитати лише перші N карток/рядків (великі колоди не
+    розбираються до кінця).
+    """
 
     if not path:
         return []
@@ -49,6 +87,22 @@ def load_params(path) -> List[dict]:
     if not os.path.exists(path):
         return []
 
+    if limit is not None and (path.endswith(".json") or path.endswith(".csv")):
+        stream = DeckStream(path)
+        cards = iter(stream)
+        raw_rows = list(islice(cards, limit))
+        if stream.has_cards:
+            if stream.layout == "object" and "prompts" not in stream.header:
+                # "prompts" може стояти після "cards": дочитуємо потік (картки
+                # не зберігаються), щоб результат збігався з повним читанням
+                for _ in cards:
+                    pass
+            return [_prepare_stream_card(stream, card) for card in raw_rows]
+        # Об'єкт без "cards" ({id: card} або один dict параметрів) — невеликий,
+        # обробляємо звичайним шляхом
+        params = load_params(path)
+        return params[:limit] if isinstance(params, list) else params
+
     if path.endswith(".json"):
         with open(path, "r", encoding="utf-8") as f:
             data = json.load(f)
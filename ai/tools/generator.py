@@ -1,16 +1,24 @@
+import gc
 import os
-import torch
-from diffusers import (
-    DPMSolverMultistepScheduler,
-    StableDiffusionPipeline,
-    StableDiffusionXLPipeline,
-)
+import re
+import threading
+import time
+import weakref
+from collections import OrderedDict
+from types import SimpleNamespace
+
+from ai.tools.embedding_cache import EmbeddingCache
+from ai.tools.image_cache import generation_key, get_image_cache
 
 pipe = None
 current_model_path = None
 current_model_type = None
 
-torch.set_float32_matmul_precision("medium")
+# torch/diffusers імпортуються лише при першій генерації (див. load_ai_stack),
+# щоб GUI стартував без кількох секунд і сотень МБ на їх завантаження.
+_ai_stack = None
+_ai_stack_lock = threading.Lock()
+AI_STACK_TIMINGS: dict = {}
 
 
 AVAILABLE_MODELS = {
@@ -23,103 +31,356 @@ AVAILABLE_MODELS = {
 
 LORA_DIR = os.path.join("ai", "models", "lora")
 
+
+# ============================================================
+#                 LAZY TORCH / DIFFUSERS IMPORT
+# ============================================================
+def load_ai_stack():
+    """Import torch + diffusers once and return them as a namespace."""
+    global _ai_stack
+
+    if _ai_stack is not None:
+        return _ai_stack
+
+    with _ai_stack_lock:
+        if _ai_stack is None:
+            started = time.perf_counter()
+            import torch
+            from diffusers import (
+                DPMSolverMultistepScheduler,
+                StableDiffusionPipeline,
+                StableDiffusionXLPipeline,
+            )
+
+            torch.set_float32_matmul_precision("medium")
+            AI_STACK_TIMINGS["import_s"] = time.perf_counter() - started
+            print(f"[INFO] torch/diffusers завантажено за {AI_STACK_TIMINGS['import_s']:.2f} s")
+
+            _ai_stack = SimpleNamespace(
+                torch=torch,
+                DPMSolverMultistepScheduler=DPMSolverMultistepScheduler,
+                StableDiffusionPipeline=StableDiffusionPipeline,
+                StableDiffusionXLPipeline=StableDiffusionXLPipeline,
+            )
+    return _ai_stack
+
+
+def is_ai_stack_loaded() -> bool:
+    return _ai_stack is not None
+
+
+def prewarm_ai_stack() -> threading.Thread:
+    """Start importing torch/diffusers in a daemon thread and return it."""
+
+    def _run():
+        try:
+            load_ai_stack()
+        except Exception as exc:
+            print(f"[WARNING] AI pre-warm failed: {exc}")
+
+    thread = threading.Thread(target=_run, name="ai-prewarm", daemon=True)
+    thread.start()
+    return thread
+
+
+def random_seed() -> int:
+    """Draw a fresh 32-bit seed from torch's RNG."""
+    torch = load_ai_stack().torch
+    return torch.randint(0, 2**32 - 1, (1,)).item()
+
+# ============================================================
+#           PIPELINE CACHE (LRU + RAM/VRAM BUDGET)
+# ============================================================
+def _budget_from_env(name, default_mb):
+    try:
+        return float(os.environ.get(name, default_mb))
+    except ValueError:
+        return float(default_mb)
+
+
+# Один SDXL pipeline у fp16 займає ~6.9 ГБ; типовий бюджет RAM має вміщати
+# щонайменше два, інакше перемикання RealVisXL ↔ DreamShaperXL щоразу
+# викидає іншу модель з кешу.
+SDXL_FP16_MB = 7000
+RAM_BUDGET_SHARE = 0.6
+
+
+def _host_ram_mb():
+    try:
+        import psutil  # є в залежностях accelerate
+
+        return psutil.virtual_memory().total / (1024 * 1024)
+    except Exception:
+        pass
+    try:
+        return os.sysconf("SC_PAGE_SIZE") * os.sysconf("SC_PHYS_PAGES") / (1024 * 1024)
+    except (AttributeError, ValueError, OSError):
+        return None
+
+
+def default_ram_budget_mb():
+    """RAM_BUDGET_SHARE of the host's memory, but never less than two fp16 SDXL pipelines."""
+    total = _host_ram_mb()
+    share = total * RAM_BUDGET_SHARE if total else 0
+    return max(2 * SDXL_FP16_MB, share)
+
+
+class PipelineCache:
+    """
+    Тримає кілька завантажених pipeline'ів замість одного.
+
+    Активний pipeline живе на GPU; неактивні вивантажуються на CPU
+    (а не видаляються), поки їх сумарний розмір вміщається у vram_budget_mb.
+    Коли pipeline'и, що лежать у RAM (device == "cpu"), перевищують
+    ram_budget_mb, найдавніше використаний неактивний видаляється повністю;
+    моделі на GPU рахуються лише у vram_budget_mb. На машинах без CUDA
+    все лежить у RAM і діє лише ram_budget_mb.
+    """
+
+    def __init__(self, ram_budget_mb=None, vram_budget_mb=None):
+        self.ram_budget_mb = ram_budget_mb if ram_budget_mb is not None else _budget_from_env("LS_GEN_RAM_BUDGET_MB", default_ram_budget_mb())
+        # 0 → на GPU тримаємо лише активну модель (безпечно для 6 ГБ VRAM)
+        self.vram_budget_mb = vram_budget_mb if vram_budget_mb is not None else _budget_from_env("LS_GEN_VRAM_BUDGET_MB", 0)
+        self._entries = OrderedDict()  # key -> {"pipe", "size_mb", "device"}
+        self.active_key = None
+        self.hits = 0
+        self.misses = 0
+        self.offloads = 0
+        self.evictions = 0
+
+    # ------------------------------------------------------------
+    def get(self, key, device):
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self._entries.move_to_end(key)
+        if entry["device"] != str(device):
+            print(f"[CACHE] {key[1]} → {device}")
+            entry["pipe"].to(device)
+            entry["device"] = str(device)
+        self._activate(key, device)
+        return entry["pipe"]
+
+    # ------------------------------------------------------------
+    def put(self, key, pipeline, device):
+        self._entries[key] = {
+            "pipe": pipeline,
+            "size_mb": _pipeline_size_mb(pipeline),
+            "device": str(device),
+        }
+        self._entries.move_to_end(key)
+        self._activate(key, device)
+
+    # ------------------------------------------------------------
+    def release_active(self, keep=None):
+        """Звільнити VRAM від поточної моделі перед тим, як завантажувати іншу."""
+        self.active_key = None
+        self._enforce_vram_budget(keep=keep)
+
+    def _activate(self, key, device):
+        self.active_key = key
+        if str(device) != "cpu":
+            self._enforce_vram_budget()
+        self._enforce_ram_budget()
+
+    def _enforce_vram_budget(self, keep=None):
+        on_gpu = [
+            k for k, e in self._entries.items()
+            if e["device"] != "cpu" and k not in (self.active_key, keep)
+        ]
+        used = sum(self._entries[k]["size_mb"] for k in on_gpu)
+        # on_gpu впорядкований від найдавніше використаного
+        for k in on_gpu:
+            if used <= self.vram_budget_mb:
+                break
+            entry = self._entries[k]
+            print(f"[CACHE] Вивантаження на CPU: {k[1]}")
+            entry["pipe"].to("cpu")
+            entry["device"] = "cpu"
+            used -= entry["size_mb"]
+            self.offloads += 1
+        _empty_cuda_cache()
+
+    def _enforce_ram_budget(self):
+        in_ram = [k for k, e in self._entries.items() if e["device"] == "cpu"]
+        total = sum(self._entries[k]["size_mb"] for k in in_ram)
+        for k in in_ram:
+            if total <= self.ram_budget_mb:
+                break
+            if k == self.active_key:
+                continue
+            print(f"[CACHE] Видалення з кешу: {k[1]}")
+            total -= self._entries.pop(k)["size_mb"]
+            self.evictions += 1
+        gc.collect()
+        _empty_cuda_cache()
+
+    # ------------------------------------------------------------
+    def discard(self, key):
+        self._entries.pop(key, None)
+        if self.active_key == key:
+            self.active_key = None
+
+    def stats(self) -> dict:
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "offloads": self.offloads,
+            "evictions": self.evictions,
+            "models": {k[1]: {"device": e["device"], "size_mb": round(e["size_mb"])} for k, e in self._entries.items()},
+        }
+
+
+def _pipeline_size_mb(pipeline) -> float:
+    """Оцінка розміру ваг pipeline'а (сума параметрів і буферів усіх nn.Module)."""
+    total = 0
+    for component in getattr(pipeline, "components", {}).values():
+        for tensors in (getattr(component, "parameters", None), getattr(component, "buffers", None)):
+            if tensors is None:
+                continue
+            try:
+                total += sum(t.numel() * t.element_size() for t in tensors())
+            except Exception:
+                pass
+    return total / (1024 * 1024)
+
+
+def _empty_cuda_cache():
+    if _ai_stack is not None and _ai_stack.torch.cuda.is_available():
+        _ai_stack.torch.cuda.empty_cache()
+
+
+def _select_device():
+    torch = load_ai_stack().torch
+    if torch.cuda.is_available():
+        return torch.device("cuda"), torch.float16
+    # fp16 на CPU або не підтримується, або дуже повільний
+    return torch.device("cpu"), torch.float32
+
+
+pipeline_cache = PipelineCache()
+
+
+def configure_pipeline_cache(ram_budget_mb=None, vram_budget_mb=None):
+    """Change the pipeline cache budgets; cached pipelines are re-checked on next load."""
+    if ram_budget_mb is not None:
+        pipeline_cache.ram_budget_mb = float(ram_budget_mb)
+    if vram_budget_mb is not None:
+        pipeline_cache.vram_budget_mb = float(vram_budget_mb)
+
+
 # ============================================================
 #                 LOAD MODEL (RTX 3060 OPTIMIZED)
 # ============================================================
 def load_model(model_type, model_path):
     global pipe, current_model_path, current_model_type
 
-    # Якщо модель змінюється — перезавантажуємо повністю
-    if pipe is None or current_model_path != model_path or current_model_type != model_type:
-
-        current_model_path = model_path
-        current_model_type = model_type
-        pipe = None
-
-        print(f"[INFO] Завантаження моделі: {model_path} ({model_type})")
-
-        device = torch.device("cuda")
-        dtype = torch.float16
-
-        # -----------------------------
-        # SDXL PIPELINE
-        # -----------------------------
-        if model_type == "sdxl":
-            pipe = StableDiffusionXLPipeline.from_pretrained(
-                model_path,
-                torch_dtype=dtype,
-                use_safetensors=True,
-                variant="fp16"
-            ).to(device)
-
-        # -----------------------------
-        # SD 1.5 PIPELINE
-        # -----------------------------
-        elif model_type == "sd15":
-            pipe = StableDiffusionPipeline.from_pretrained(
-                model_path,
-                torch_dtype=dtype,
-                use_safetensors=True
-            ).to(device)
-
-        else:
-            raise ValueError(f"Unknown model type: {model_type}")
-
-        # =================================================
-        #                 RTX 3060 ОПТИМІЗАЦІЇ
-        # =================================================
-
-        print("[OPT] Applying RTX 3060 optimizations...")
-
-        # 1. Attention slicing — економить VRAM
-        pipe.enable_attention_slicing()
-        print("[OPT] attention slicing enabled")
-
-        # 2. VAE slicing — зменшує навантаження на VRAM
-        try:
-            pipe.vae.enable_slicing()
-            print("[OPT] VAE slicing enabled")
-        except:
-            print("[OPT WARNING] VAE slicing unavailable")
+    key = (model_type, model_path)
+    device, _ = _select_device()
 
-        # 3. VAE tiling — дуже важливо для SDXL на 6GB VRAM
-        try:
-            pipe.vae.enable_tiling()
-            print("[OPT] VAE tiling enabled")
-        except:
-            print("[OPT WARNING] VAE tiling unavailable")
-
-        # 4. scheduler DPM++ 2M Karras — найкращий баланс швидкість/якість
-        pipe.scheduler = DPMSolverMultistepScheduler.from_config(
-            pipe.scheduler.config,
-            # DreamShaperXL ships with a scheduler config that sets
-            # ``algorithm_type="deis"`` and ``final_sigmas_type="zero"``.
-            # That combination fails on recent diffusers with the runtime
-            # error: ``final_sigmas_type zero is not supported for``
-            # ``algorithm_type deis``. Forcing the safer "sigma_min"
-            # variant keeps DPM++ 2M behavior while avoiding the crash.
-            final_sigmas_type="sigma_min",
-        )
-        print("[OPT] Scheduler: DPM++ 2M (sigma_min final sigmas)")
+    if pipe is not None and key == (current_model_type, current_model_path):
+        return pipe
 
-        # 5. torch.compile — дає +10–20% швидкості навіть на Windows
-        try:
-            # torch.compile на Windows дуже повільний під час warmup → вимикаємо
-            print("[OPT] torch.compile disabled (Windows safe mode)")
-        except Exception as e:
-            print(f"[OPT WARNING] torch.compile failed: {e}")
+    pipeline_cache.release_active(keep=key)
+    cached = pipeline_cache.get(key, device)
+    if cached is None:
+        # Нова модель — завантажуємо з диска, оптимізуємо і прогріваємо
+        cached = _create_pipeline(model_type, model_path)
+        pipeline_cache.put(key, cached, device)
 
-        # 6. Перший прогін для прогріву (warmup)
-        try:
-            print("[INFO] Warmup...")
-            _ = pipe(
-                prompt="warmup test",
-                num_inference_steps=1,
-                width=512,
-                height=512
-            )
-        except:
-            print("[INFO] Warmup skipped (safe)")
+    pipe = cached
+    current_model_path = model_path
+    current_model_type = model_type
+    return pipe
+
+
+def _create_pipeline(model_type, model_path):
+    print(f"[INFO] Завантаження моделі: {model_path} ({model_type})")
+
+    ai = load_ai_stack()
+    device, dtype = _select_device()
+
+    # -----------------------------
+    # SDXL PIPELINE
+    # -----------------------------
+    if model_type == "sdxl":
+        pipe = ai.StableDiffusionXLPipeline.from_pretrained(
+            model_path,
+            torch_dtype=dtype,
+            use_safetensors=True,
+            variant="fp16"
+        ).to(device)
+
+    # -----------------------------
+    # SD 1.5 PIPELINE
+    # -----------------------------
+    elif model_type == "sd15":
+        pipe = ai.StableDiffusionPipeline.from_pretrained(
+            model_path,
+            torch_dtype=dtype,
+            use_safetensors=True
+        ).to(device)
+
+    else:
+        raise ValueError(f"Unknown model type: {model_type}")
+
+    # =================================================
+    #                 RTX 3060 ОПТИМІЗАЦІЇ
+    # =================================================
+
+    print("[OPT] Applying RTX 3060 optimizations...")
+
+    # 1. Attention slicing — економить VRAM
+    pipe.enable_attention_slicing()
+    print("[OPT] attention slicing enabled")
+
+    # 2. VAE slicing — зменшує навантаження на VRAM
+    try:
+        pipe.vae.enable_slicing()
+        print("[OPT] VAE slicing enabled")
+    except:
+        print("[OPT WARNING] VAE slicing unavailable")
+
+    # 3. VAE tiling — дуже важливо для SDXL на 6GB VRAM
+    try:
+        pipe.vae.enable_tiling()
+        print("[OPT] VAE tiling enabled")
+    except:
+        print("[OPT WARNING] VAE tiling unavailable")
+
+    # 4. scheduler DPM++ 2M Karras — найкращий баланс швидкість/якість
+    pipe.scheduler = ai.DPMSolverMultistepScheduler.from_config(
+        pipe.scheduler.config,
+        # DreamShaperXL ships with a scheduler config that sets
+        # ``algorithm_type="deis"`` and ``final_sigmas_type="zero"``.
+        # That combination fails on recent diffusers with the runtime
+        # error: ``final_sigmas_type zero is not supported for``
+        # ``algorithm_type deis``. Forcing the safer "sigma_min"
+        # variant keeps DPM++ 2M behavior while avoiding the crash.
+        final_sigmas_type="sigma_min",
+    )
+    print("[OPT] Scheduler: DPM++ 2M (sigma_min final sigmas)")
+
+    # 5. torch.compile — дає +10–20% швидкості навіть на Windows
+    try:
+        # torch.compile на Windows дуже повільний під час warmup → вимикаємо
+        print("[OPT] torch.compile disabled (Windows safe mode)")
+    except Exception as e:
+        print(f"[OPT WARNING] torch.compile failed: {e}")
+
+    # 6. Перший прогін для прогріву (warmup)
+    try:
+        print("[INFO] Warmup...")
+        _ = pipe(
+            prompt="warmup test",
+            num_inference_steps=1,
+            width=512,
+            height=512
+        )
+    except:
+        print("[INFO] Warmup skipped (safe)")
 
     return pipe
 
@@ -144,38 +405,101 @@ def get_available_loras():
     return {name: path for name, path in _discover_lora_files()}
 
 
+# Стан LoRA для кожного pipeline'а: які адаптери вже завантажені і які активні.
+# WeakKeyDictionary — запис зникає разом із pipeline'ом, видаленим з кешу.
+_lora_state: "weakref.WeakKeyDictionary" = weakref.WeakKeyDictionary()
+LORA_STATS = {"hits": 0, "loads": 0, "unchanged_calls": 0}
+
+
+def _adapter_name(name: str) -> str:
+    # PEFT не приймає крапки та інші спецсимволи в назвах адаптерів
+    return "lora_" + re.sub(r"[^0-9A-Za-z_]", "_", name)
+
+
+def get_lora_cache_stats() -> dict:
+    """Return LoRA adapter reuse counters and the hit rate."""
+    total = LORA_STATS["hits"] + LORA_STATS["loads"]
+    return {**LORA_STATS, "hit_rate": (LORA_STATS["hits"] / total) if total else 0.0}
+
+
 def _apply_loras(selected_loras: list[str]):
+    """
+    Активує лише вибрані LoRA, довантажуючи з диска тільки нові.
+
+    Завантажені адаптери лишаються в pipeline'і: повторний вибір того ж
+    набору нічого не читає, а зміна набору лише перемикає set_adapters.
+    """
     global pipe
 
     if pipe is None:
         return
 
-    if hasattr(pipe, "disable_lora"):
+    if not hasattr(pipe, "set_adapters"):
+        _apply_loras_legacy(selected_loras)
+        return
+
+    available = get_available_loras()
+    wanted = tuple(dict.fromkeys(name for name in (selected_loras or []) if name in available))
+
+    try:
+        state = _lora_state.setdefault(pipe, {"loaded": {}, "active": ()})
+    except TypeError:
+        state = {"loaded": {}, "active": ()}
+    loaded = state["loaded"]
+
+    if wanted == state["active"] and all(_lora_signature(available[n]) == loaded.get(n) for n in wanted):
+        LORA_STATS["unchanged_calls"] += 1
+        LORA_STATS["hits"] += len(wanted)
+        return
+
+    for name in wanted:
+        path = available[name]
+        signature = _lora_signature(path)
+        if loaded.get(name) == signature:
+            LORA_STATS["hits"] += 1
+            continue
+        if name in loaded and hasattr(pipe, "delete_adapters"):
+            # Файл змінився на диску — перечитуємо
+            pipe.delete_adapters(_adapter_name(name))
+        print(f"[LORA] Завантаження: {name}")
+        pipe.load_lora_weights(path, adapter_name=_adapter_name(name))
+        loaded[name] = signature
+        LORA_STATS["loads"] += 1
+
+    if wanted:
+        if not state["active"] and hasattr(pipe, "enable_lora"):
+            pipe.enable_lora()
+        pipe.set_adapters([_adapter_name(n) for n in wanted])
+    elif hasattr(pipe, "disable_lora"):
         pipe.disable_lora()
-    elif hasattr(pipe, "unload_lora_weights"):
+
+    state["active"] = wanted
+    stats = get_lora_cache_stats()
+    print(f"[LORA] Активні: {list(wanted) or '—'} (hit rate {stats['hit_rate']:.0%})")
+
+
+def _lora_signature(path: str):
+    try:
+        st = os.stat(path)
+        return (path, st.st_mtime, st.st_size)
+    except OSError:
+        return (path, None, None)
+
+
+def _apply_loras_legacy(selected_loras: list[str]):
+    """Старі diffusers без set_adapters: вивантажуємо й завантажуємо заново."""
+    if hasattr(pipe, "unload_lora_weights"):
         try:
             pipe.unload_lora_weights()
         except Exception:
             pass
 
     available = get_available_loras()
-    adapter_names: list[str] = []
-
-    for idx, name in enumerate(selected_loras or []):
+    for name in selected_loras or []:
         path = available.get(name)
-        if not path:
-            continue
-        adapter_name = f"lora_{idx}_{name}"
-        pipe.load_lora_weights(path, adapter_name=adapter_name)
-        adapter_names.append(adapter_name)
-
-    if adapter_names:
-        if hasattr(pipe, "set_adapters"):
-            pipe.set_adapters(adapter_names)
-        elif hasattr(pipe, "set_adapter"):
-            pipe.set_adapter(adapter_names[-1])
-
-
+        if path:
+            pipe.load_lora_weights(path)
+            LORA_STATS["loads"] += 1
 
 
 # ============================================================
@@ -188,6 +512,10 @@ DEFAULT_NEGATIVE_PROMPT = (
 )
 
 
+class GenerationCancelled(Exception):
+    """Raised when is_aborted() turned true while the pipeline was running."""
+
+
 def generate_image(
     prompt,
     model_name,
@@ -197,33 +525,250 @@ def generate_image(
     seed=None,
     negative_prompt: str | None = None,
     loras: list[str] | None = None,
+    on_step=None,
+    is_aborted=None,
 ):
     """
     Генерує одне зображення, використовуючи модель з AVAILABLE_MODELS.
+
+    on_step(step, total, seconds) викликається після кожного кроку денойзингу;
+    якщо is_aborted() повертає True, прогін зупиняється на поточному кроці
+    і піднімається GenerationCancelled.
+    """
+
+    return generate_images(
+        [prompt],
+        model_name,
+        width=width,
+        height=height,
+        steps=steps,
+        seeds=[seed],
+        negative_prompt=negative_prompt,
+        loras=loras,
+        on_step=on_step,
+        is_aborted=is_aborted,
+    )[0]
+
+
+# ============================================================
+#                GENERATE IMAGES (BATCHED)
+# ============================================================
+GUIDANCE_SCALE = 5.0
+
+
+def _art_cache_key(prompt, negative, model_name, width, height, steps, seed, loras):
+    model_type, model_path = AVAILABLE_MODELS[model_name]
+    available = get_available_loras()
+    lora_inputs = [
+        [name, *_lora_signature(available[name])[1:]]
+        for name in dict.fromkeys(loras or [])
+        if name in available
+    ]
+    return generation_key(
+        prompt=prompt,
+        negative_prompt=negative,
+        model=[model_name, model_type, model_path],
+        width=width,
+        height=height,
+        steps=steps,
+        seed=int(seed),
+        guidance_scale=GUIDANCE_SCALE,
+        loras=lora_inputs,
+    )
+
+
+# ============================================================
+#             PROMPT EMBEDDING CACHE (TEXT ENCODERS)
+# ============================================================
+prompt_embedding_cache = EmbeddingCache(_budget_from_env("LS_GEN_EMBED_CACHE_MB", 256))
+
+
+def _encode_text(pipe, text, device):
     """
+    Кодує один текст і повертає тензори на CPU.
 
+    SDXL → (embeds, pooled), SD 1.5 → (embeds, None). Негативний prompt
+    кодується тим самим шляхом, що й позитивний, тож один запис кешу
+    придатний для обох ролей.
+    """
+    torch = load_ai_stack().torch
+    with torch.no_grad():
+        if hasattr(pipe, "text_encoder_2"):
+            embeds, _, pooled, _ = pipe.encode_prompt(
+                prompt=text,
+                device=device,
+                num_images_per_prompt=1,
+                do_classifier_free_guidance=False,
+            )
+            return embeds.to("cpu"), pooled.to("cpu")
+        embeds, _ = pipe.encode_prompt(
+            prompt=text,
+            device=device,
+            num_images_per_prompt=1,
+            do_classifier_free_guidance=False,
+        )
+        return embeds.to("cpu"), None
+
+
+def _prompt_embedding_kwargs(pipe, prompts, negative):
+    """
+    Повертає prompt_embeds/negative_prompt_embeds (і pooled для SDXL) для
+    pipe(...), беручи тексти з кешу. None → передати pipeline'у сирий текст.
+    """
+    if not hasattr(pipe, "encode_prompt"):
+        return None
+
+    torch = load_ai_stack().torch
+    device = getattr(pipe, "_execution_device", None) or pipe.device
+
+    # LoRA може змінювати text encoder, тож активний набір — частина ключа
+    try:
+        state = _lora_state.get(pipe)
+    except TypeError:
+        state = None
+    loras_key = tuple((n, state["loaded"].get(n)) for n in state["active"]) if state else ()
+    model_key = (current_model_type, current_model_path, loras_key)
+
+    def lookup(text):
+        key = (model_key, text)
+        cached = prompt_embedding_cache.get(key)
+        if cached is None:
+            cached = _encode_text(pipe, text, device)
+            prompt_embedding_cache.put(key, cached)
+        return cached
+
+    try:
+        positive = [lookup(text) for text in prompts]
+        neg_embeds, neg_pooled = lookup(negative)
+    except Exception as exc:
+        print(f"[WARNING] Prompt embedding cache bypassed: {exc}")
+        return None
+
+    count = len(prompts)
+    kwargs = {
+        "prompt_embeds": torch.cat([e for e, _ in positive]).to(device),
+        "negative_prompt_embeds": neg_embeds.repeat(count, 1, 1).to(device),
+    }
+    if neg_pooled is not None:
+        kwargs["pooled_prompt_embeds"] = torch.cat([p for _, p in positive]).to(device)
+        kwargs["negative_pooled_prompt_embeds"] = neg_pooled.repeat(count, 1).to(device)
+    return kwargs
+
+
+def generate_images(
+    prompts: list[str],
+    model_name,
+    width=664,
+    height=1040,
+    steps=25,
+    seeds: list[int] | None = None,
+    negative_prompt: str | None = None,
+    loras: list[str] | None = None,
+    on_step=None,
+    is_aborted=None,
+):
+    """
+    Генерує кілька зображень за один прохід pipeline'а.
+
+    Кожен елемент отримує власний torch.Generator зі своїм seed, тож
+    результат збігається з generate_image(..., seed=seed) для того ж prompt.
+    Зображення, які вже є в дисковому кеші (ai.tools.image_cache), не
+    генеруються повторно — модель для них навіть не завантажується.
+    on_step / is_aborted — як у generate_image.
+    """
+
+    if not prompts:
+        return []
     if model_name not in AVAILABLE_MODELS:
         raise ValueError(f"Модель '{model_name}' не знайдена у AVAILABLE_MODELS")
 
+    seeds = list(seeds) if seeds else [None] * len(prompts)
+    seeds = [s if s is not None else random_seed() for s in seeds]
+    negative = negative_prompt or DEFAULT_NEGATIVE_PROMPT
+
+    results = [None] * len(prompts)
+    cache = get_image_cache()
+    keys = []
+    if cache is not None:
+        keys = [
+            _art_cache_key(p, negative, model_name, width, height, steps, s, loras)
+            for p, s in zip(prompts, seeds)
+        ]
+        results = [cache.get(k) for k in keys]
+        # atime попадань — один запис index.json на пакет
+        cache.flush()
+
+    missing = [i for i, img in enumerate(results) if img is None]
+    if not missing:
+        return results
+    if is_aborted and is_aborted():
+        raise GenerationCancelled()
+
     model_type, model_path = AVAILABLE_MODELS[model_name]
 
     pipe = load_model(model_type, model_path)
     _apply_loras(loras or [])
 
-    # Seed
-    if seed is None:
-        seed = torch.randint(0, 2**32 - 1, (1,)).item()
-    generator = torch.manual_seed(seed)
+    torch = load_ai_stack().torch
+    generators = [torch.Generator("cpu").manual_seed(int(seeds[i])) for i in missing]
 
-    # --- Генерація ---
-    image = pipe(
-        prompt=prompt,
-        negative_prompt=negative_prompt or DEFAULT_NEGATIVE_PROMPT,
+    text_kwargs = _prompt_embedding_kwargs(pipe, [prompts[i] for i in missing], negative)
+    if text_kwargs is None:
+        text_kwargs = {
+            "prompt": [prompts[i] for i in missing],
+            "negative_prompt": [negative] * len(missing),
+        }
+
+    step_kwargs = {}
+    cancelled = []
+    if on_step or is_aborted:
+        step_kwargs["callback_on_step_end"] = _make_step_callback(steps, on_step, is_aborted, cancelled)
+
+    images = pipe(
+        **text_kwargs,
         num_inference_steps=steps,
         width=width,
         height=height,
-        generator=generator,
-        guidance_scale=5.0,
-    ).images[0]
+        generator=generators[0] if len(generators) == 1 else generators,
+        guidance_scale=GUIDANCE_SCALE,
+        **step_kwargs,
+    ).images
+
+    if cancelled:
+        # Перерваний прогін повертає недоденойзені латенти — не зберігаємо їх
+        raise GenerationCancelled()
+
+    for i, img in zip(missing, images):
+        results[i] = img
+        if cache is not None:
+            cache.put(keys[i], img)
+    return results
+
+
+def _make_step_callback(total, on_step, is_aborted, cancelled: list):
+    """callback_on_step_end для diffusers: звіт про крок і переривання через pipe._interrupt."""
+    last = [time.perf_counter()]
+
+    def callback(pipeline, step, timestep, callback_kwargs):
+        now = time.perf_counter()
+        if on_step:
+            on_step(step + 1, total, now - last[0])
+        last[0] = now
+        if is_aborted and is_aborted():
+            cancelled.append(step)
+            pipeline._interrupt = True
+        return callback_kwargs
+
+    return callback
+
+
+def is_out_of_memory(exc: BaseException) -> bool:
+    """True for CUDA/CPU out-of-memory errors raised by torch."""
+    if type(exc).__name__ == "OutOfMemoryError":
+        return True
+    return isinstance(exc, (RuntimeError, MemoryError)) and "out of memory" in str(exc).lower()
+
 
-    return image
+def free_memory():
+    gc.collect()
+    _empty_cuda_cache()
@@ -0,0 +1,160 @@
+import hashlib
+import json
+import os
+import threading
+import time
+
+from PIL import Image
+
+from renderer.core.paths import PROJECT_PATH
+
+# Кеш згенерованих зображень на диску, адресований хешем усіх вхідних параметрів.
+# index.json тримає розмір і час останнього доступу кожного запису, тож пошук
+# і LRU-витіснення не потребують обходу директорії. Попадання оновлюють atime
+# лише в пам'яті; index.json пишеться в put(), при витісненні та у flush()
+# наприкінці пакета, а не на кожне get().
+
+CACHE_VERSION = 1
+DEFAULT_MAX_MB = 2048
+
+
+def generation_key(**inputs) -> str:
+    """Stable sha256 over every input that influences the generated pixels."""
+    payload = json.dumps({"v": CACHE_VERSION, **inputs}, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class ImageCache:
+    def __init__(self, root: str, max_mb: float = DEFAULT_MAX_MB):
+        self.root = root
+        self.max_bytes = int(max_mb * 1024 * 1024)
+        self.index_path = os.path.join(root, "index.json")
+        self._lock = threading.Lock()
+        self._index = None
+        self._dirty = False
+        self.hits = 0
+        self.misses = 0
+
+    # ------------------------------------------------------------
+    def _load_index(self) -> dict:
+        if self._index is None:
+            try:
+                with open(self.index_path, "r", encoding="utf-8") as f:
+                    data = json.load(f)
+                self._index = data.get("entries", {}) if data.get("version") == CACHE_VERSION else {}
+            except (OSError, ValueError):
+                self._index = {}
+        return self._index
+
+    def _save_index(self):
+        os.makedirs(self.root, exist_ok=True)
+        tmp = self.index_path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump({"version": CACHE_VERSION, "entries": self._index}, f)
+        os.replace(tmp, self.index_path)
+        self._dirty = False
+
+    def flush(self):
+        """Write index.json if get() changed it since the last write."""
+        with self._lock:
+            if self._dirty:
+                self._save_index()
+
+    def _file_for(self, key: str) -> str:
+        return os.path.join(self.root, key[:2], f"{key}.png")
+
+    # ------------------------------------------------------------
+    def get(self, key: str):
+        """Return the cached PIL image or None."""
+        with self._lock:
+            index = self._load_index()
+            entry = index.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            path = self._file_for(key)
+            try:
+                with Image.open(path) as src:
+                    src.load()
+                    img = src.copy()
+            except OSError:
+                # Файл видалили поза кешем — забуваємо запис
+                index.pop(key, None)
+                self._dirty = True
+                self.misses += 1
+                return None
+            entry["atime"] = time.time()
+            self._dirty = True
+            self.hits += 1
+            return img
+
+    def put(self, key: str, image) -> str:
+        with self._lock:
+            index = self._load_index()
+            path = self._file_for(key)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            image.save(path, "PNG")
+            index[key] = {"size": os.path.getsize(path), "atime": time.time()}
+            self._evict()
+            self._save_index()
+            return path
+
+    def _evict(self):
+        total = sum(e["size"] for e in self._index.values())
+        if total <= self.max_bytes:
+            return
+        for key, entry in sorted(self._index.items(), key=lambda kv: kv[1]["atime"]):
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(self._file_for(key))
+            except OSError:
+                pass
+            total -= entry["size"]
+            del self._index[key]
+
+    # ------------------------------------------------------------
+    def stats(self) -> dict:
+        with self._lock:
+            index = self._load_index()
+            total = self.hits + self.misses
+            return {
+                "entries": len(index),
+                "size_mb": round(sum(e["size"] for e in index.values()) / (1024 * 1024), 2),
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": (self.hits / total) if total else 0.0,
+            }
+
+    def clear(self):
+        with self._lock:
+            for key in list(self._load_index()):
+                try:
+                    os.remove(self._file_for(key))
+                except OSError:
+                    pass
+            self._index = {}
+            self._save_index()
+
+
+_default_cache = None
+
+
+def _max_mb_from_env(name: str, default: float = DEFAULT_MAX_MB) -> float:
+    try:
+        return float(os.environ.get(name, default))
+    except ValueError:
+        return float(default)
+
+
+def get_image_cache():
+    """Shared art cache, or None when disabled with LS_GEN_ART_CACHE=0."""
+    global _default_cache
+    if os.environ.get("LS_GEN_ART_CACHE", "1") == "0":
+        return None
+    if _default_cache is None:
+        _default_cache = ImageCache(
+            os.environ.get("LS_GEN_ART_CACHE_DIR", PROJECT_PATH(os.path.join("cache", "ai_images"))),
+            _max_mb_from_env("LS_GEN_ART_CACHE_MB"),
+        )
+    return _default_cache
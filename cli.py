@@ -0,0 +1,497 @@
+"""Headless LS_gen pipeline: deck JSON → PNG cards → PDF.
+
+Usage:
+    python -m ls_gen render --deck import/deck_95.json --out export/95 --pdf --workers 8
+    python cli.py render --deck import/deck_95.json --summary export/95/timings.json
+    python cli.py render --deck import/deck_95.json --pdf --nup --paper a4 --back assets/back.png
+    python cli.py render --deck import/deck_95.json --pdf --pdf-stream --pdf-encoding jpeg --workers 8
+    python cli.py render --deck import/deck_95.json --atlas --atlas-grid 10x7 --atlas-cell-width 400
+    python cli.py scene-export --deck import/deck_95.json --out export/95_scene --workers 4
+    QT_QPA_PLATFORM=offscreen python cli.py scene-bench --deck import/deck_95.json
+    python cli.py watch --deck import/deck_95.json --out export/95_watch
+    python cli.py deck-mem --deck import/deck_95.json --cards 50000
+
+Nothing here imports torch. render never imports PySide6; scene-export,
+scene-bench and watch import it lazily and default to the offscreen Qt
+platform, so every command runs on a display-less build box.
+The timing summary is printed to stdout as JSON; all other output goes to stderr.
+"""
+
+from __future__ import annotations
+
+import argparse
+import contextlib
+import json
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from renderer.core.batch_renderer import iter_render_stream, render_deck  # noqa: E402
+from renderer.core.json_loader import JSONLoader, deck_cache_enabled  # noqa: E402
+from renderer.core.paths import PROJECT_PATH  # noqa: E402
+from renderer.core.render_manifest import RenderManifest  # noqa: E402
+
+DEFAULT_TEMPLATE = PROJECT_PATH("renderer/templates/template.json")
+DEFAULT_LAYOUT = PROJECT_PATH("renderer/layouts/template_layout.json")
+
+
+def _log(message: str) -> None:
+    print(message, file=sys.stderr, flush=True)
+
+
+def _load_template(path: str) -> dict:
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def _load_deck(path: str, columnar: bool = False, rebuild_cache: bool = False):
+    """
+    Load a deck (through the binary sidecar cache unless LS_GEN_DECK_CACHE=0)
+    and report cards whose art was not found in <deck folder>/../arts.
+    """
+    loader = JSONLoader(path, use_cache=deck_cache_enabled(), rebuild_cache=rebuild_cache)
+    deck = loader.load(columnar=columnar)
+    _log(f"[CACHE] {loader.cache_status}: {path}")
+    if loader.unmatched_art:
+        preview = ", ".join(loader.unmatched_art[:5])
+        more = f" (+{len(loader.unmatched_art) - 5})" if len(loader.unmatched_art) > 5 else ""
+        _log(f"[ART] {len(loader.unmatched_art)}/{len(deck)} cards without art in {loader.arts_dir}: {preview}{more}")
+    return deck, loader
+
+
+def _manifest_summary(manifest) -> dict:
+    if manifest is None:
+        return {}
+    return {
+        "manifest": manifest.path,
+        "skipped": manifest.skipped,
+        "renamed": manifest.renamed,
+        "removed": len(manifest.removed),
+    }
+
+
+# ─────────────────────────────────────────────
+# render
+# ─────────────────────────────────────────────
+
+def cmd_render(args) -> int:
+    timings: dict = {}
+    started = time.perf_counter()
+
+    if args.stream and args.incremental:
+        raise ValueError("--stream and --incremental cannot be combined")
+
+    t0 = time.perf_counter()
+    template = _load_template(args.template)
+    if args.stream:
+        # Колода не читається наперед: картки йдуть у рендер по мірі розбору файлу
+        loader = JSONLoader(args.deck)
+        deck_name = os.path.splitext(os.path.basename(args.deck))[0]
+    else:
+        deck, loader = _load_deck(args.deck, args.columnar, args.rebuild_cache)
+        deck_name = deck.name
+    timings["load_s"] = time.perf_counter() - t0
+
+    out_dir = args.out or os.path.join("export", deck_name)
+    manifest = RenderManifest(out_dir) if args.incremental else None
+
+    def progress(done, total, path):
+        if not args.quiet:
+            _log(f"[{done}/{total}] {path}")
+
+    t0 = time.perf_counter()
+    if args.stream:
+        images = []
+        for _, path in iter_render_stream(loader.iter_cards(), template, out_dir, workers=args.workers):
+            if not images:
+                timings["first_card_s"] = time.perf_counter() - t0
+            images.append(path)
+            progress(len(images), "?", path)
+    else:
+        images = render_deck(deck, template, out_dir, workers=args.workers, progress=progress, manifest=manifest)
+    timings["render_s"] = time.perf_counter() - t0
+
+    pdf_path = None
+    pdf_stats = None
+    if args.pdf:
+        # Імпорт тут: reportlab потрібен лише з --pdf
+        from renderer.core.pdf_exporter import CardGeometry, export_pdf_from_list, export_pdf_imposed
+
+        pdf_path = os.path.join(out_dir, f"{deck_name}.pdf")
+        t0 = time.perf_counter()
+        # export_pdf_* друкують у stdout — тримаємо stdout чистим для JSON
+        with contextlib.redirect_stdout(sys.stderr):
+            if args.pdf_stream:
+                from renderer.core.pdf_exporter import plan_sheet
+                from renderer.core.pdf_stream import export_pdf_stream
+
+                layout = plan_sheet(CardGeometry.from_template(template), args.paper) if args.nup else None
+                pdf_stats = export_pdf_stream(
+                    images, pdf_path, layout, encoding=args.pdf_encoding, quality=args.pdf_quality,
+                    workers=args.workers, back=args.back, flip=args.flip, crop_marks=not args.no_crop_marks,
+                )
+            elif args.nup:
+                pdf_stats = export_pdf_imposed(
+                    images, pdf_path, CardGeometry.from_template(template), paper=args.paper,
+                    crop_marks=not args.no_crop_marks, back=args.back, flip=args.flip,
+                )
+            else:
+                pdf_stats = export_pdf_from_list(images, pdf_path)
+        timings["pdf_s"] = time.perf_counter() - t0
+
+    atlas = None
+    if args.atlas:
+        from renderer.core.atlas_exporter import export_atlas
+
+        cols, _, rows = args.atlas_grid.lower().partition("x")
+        names = [card.name for card in deck.cards] if not args.stream and len(deck) == len(images) else None
+        t0 = time.perf_counter()
+        with contextlib.redirect_stdout(sys.stderr):
+            index = export_atlas(
+                images, os.path.join(out_dir, "atlas"), deck_name, grid=(int(cols), int(rows or cols)),
+                cell_width=args.atlas_cell_width, names=names,
+            )
+        timings["atlas_s"] = time.perf_counter() - t0
+        atlas = {"index": os.path.abspath(index["index_path"]), "sheets": len(index["sheets"]), "cell": index["cell"]}
+
+    timings["total_s"] = time.perf_counter() - started
+
+    summary = {
+        "deck": deck_name,
+        "deck_path": os.path.abspath(args.deck),
+        "template": os.path.abspath(args.template),
+        "out_dir": os.path.abspath(out_dir),
+        "cards": len(images),
+        "workers": args.workers or os.cpu_count() or 1,
+        "pdf": os.path.abspath(pdf_path) if pdf_path else None,
+        "pdf_stats": pdf_stats,
+        "atlas": atlas,
+        "timings": {k: round(v, 4) for k, v in timings.items()},
+        "cards_per_s": round(len(images) / timings["render_s"], 2) if timings["render_s"] else None,
+        "unmatched_art": loader.unmatched_art,
+        "deck_cache": loader.cache_status,
+        **_manifest_summary(manifest),
+    }
+    text = json.dumps(summary, ensure_ascii=False, indent=2)
+    if args.summary:
+        folder = os.path.dirname(args.summary)
+        if folder:
+            os.makedirs(folder, exist_ok=True)
+        with open(args.summary, "w", encoding="utf-8") as f:
+            f.write(text)
+    print(text)
+    return 0
+
+
+# ─────────────────────────────────────────────
+# scene-export
+# ─────────────────────────────────────────────
+
+def cmd_scene_export(args) -> int:
+    """Export a deck through the headless QGraphicsScene renderer (no view), sharded across processes."""
+    from renderer.core.scene_sharding import export_deck_sharded
+
+    t0 = time.perf_counter()
+    deck, loader = _load_deck(args.deck, args.columnar, args.rebuild_cache)
+    load_s = time.perf_counter() - t0
+    out_dir = args.out or os.path.join("export", deck.name)
+    manifest = RenderManifest(out_dir) if args.incremental else None
+    worker_rates: dict = {}
+
+    def progress(event):
+        worker_rates[event.worker] = round(event.cards_per_s, 2)
+        if not args.quiet:
+            _log(
+                f"[{event.done}/{event.total}] worker {event.worker} "
+                f"{event.worker_done}/{event.worker_total} {event.cards_per_s:.1f} cards/s {event.path}"
+            )
+
+    t0 = time.perf_counter()
+    paths = export_deck_sharded(
+        deck, args.layout, out_dir, workers=args.workers, frame_path=args.frame, progress=progress,
+        manifest=manifest,
+    )
+    render_s = time.perf_counter() - t0
+    summary = {
+        "deck": deck.name,
+        "layout": os.path.abspath(args.layout),
+        "out_dir": os.path.abspath(out_dir),
+        "cards": len(paths),
+        "workers": len(worker_rates),
+        "timings": {"load_s": round(load_s, 4), "render_s": round(render_s, 4)},
+        "cards_per_s": round(len(paths) / render_s, 2) if render_s else None,
+        "worker_cards_per_s": {str(k): v for k, v in sorted(worker_rates.items())},
+        "unmatched_art": loader.unmatched_art,
+        "deck_cache": loader.cache_status,
+        **_manifest_summary(manifest),
+    }
+    print(json.dumps(summary, ensure_ascii=False, indent=2))
+    return 0
+
+
+# ─────────────────────────────────────────────
+# watch
+# ─────────────────────────────────────────────
+
+def cmd_watch(args) -> int:
+    """Re-render only the affected cards whenever the deck, layout or art files change."""
+    from renderer.core.deck_watch import DeckWatchSession
+    from renderer.core.scene_renderer import SceneCardRenderer
+    from renderer.core.scene_sharding import plan_scene_jobs
+
+    session = DeckWatchSession(
+        args.deck,
+        layout_paths=[args.layout, args.frame],
+        art_dirs=args.arts or None,
+        debounce=args.debounce,
+    )
+    renderer = SceneCardRenderer(args.layout, frame_path=args.frame)
+    update = session.initial()
+    out_dir = args.out or os.path.join("export", update.deck.name)
+    os.makedirs(out_dir, exist_ok=True)
+    previous_paths: set = set()
+    _log(f"[WATCH] {session.deck_path}, {args.layout}, {', '.join(session.art_dirs)}")
+
+    try:
+        while update is not None:
+            t0 = time.perf_counter()
+            if update.layout_changed:
+                try:
+                    renderer = SceneCardRenderer(args.layout, frame_path=args.frame)
+                except (OSError, ValueError) as exc:
+                    # Редактор ще дописує layout — лишаємо попередній рендерер і чекаємо далі
+                    _log(f"[WATCH WARNING] {args.layout}: {exc}")
+                    update = session.next_update()
+                    continue
+            jobs = plan_scene_jobs(update.deck, out_dir, avoid_existing=False)
+            for idx in update.indices:
+                _, payload, out_path = jobs[idx]
+                renderer.export_card(payload, update.deck.deck_color, out_path)
+            # Картки, що зникли або змінили ім'я, залишили старі PNG
+            current_paths = {job[2] for job in jobs}
+            for stale in sorted(previous_paths - current_paths):
+                if os.path.exists(stale):
+                    os.remove(stale)
+            previous_paths = current_paths
+            _log(
+                f"[WATCH] {update.reason}: {len(update.indices)} card(s) re-rendered "
+                f"in {time.perf_counter() - t0:.2f}s"
+            )
+            update = session.next_update()
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+# ─────────────────────────────────────────────
+# scene-bench
+# ─────────────────────────────────────────────
+
+def _dispose_scene_view(view):
+    """Delete the view's items and scene on the Qt side before Python drops its wrappers."""
+    from PySide6.QtCore import QCoreApplication, QEvent
+
+    scene = view.scene()
+    view.scene_items.clear()
+    if scene is not None:
+        scene.clear()
+        scene.deleteLater()
+    view.deleteLater()
+    # deleteLater без циклу подій спрацьовує лише так
+    QCoreApplication.sendPostedEvents(None, QEvent.DeferredDelete)
+
+
+def cmd_scene_bench(args) -> int:
+    """Per-card SceneExporter time: layout rebuilt per card vs. one reused scene."""
+    from renderer.core.scene_exporter import SceneExporter
+    from renderer.core.scene_renderer import ensure_offscreen_app
+    from renderer.widgets.card_scene_view import CardSceneView
+
+    app = ensure_offscreen_app()  # noqa: F841
+    deck = JSONLoader(args.deck).load()
+    if args.limit:
+        deck.cards = deck.cards[: args.limit]
+    out_root = args.out or os.path.join("export", "_scene_bench")
+    results: dict = {}
+
+    # Старий шлях: load_template() перед кожною карткою. Міряємо на вибірці —
+    # сотні перебудов сцени повільні й не змінюють середнього часу на картку.
+    reload_cards = deck.cards[: args.reload_sample] if args.reload_sample else deck.cards
+    out_dir = os.path.join(out_root, "reload")
+    os.makedirs(out_dir, exist_ok=True)
+    t0 = time.perf_counter()
+    for idx, card in enumerate(reload_cards):
+        # Свіжа в'юха на кожне перезавантаження, як у старому експорті, — і
+        # одразу прибрана, щоб елементи сцени не доживали до завершення процесу
+        view = CardSceneView()
+        view.load_template(args.layout)
+        view.apply_card_data(card.payload, deck.deck_color)
+        view.export_to_png(os.path.join(out_dir, f"{idx:04d}.png"))
+        _dispose_scene_view(view)
+    results["reload"] = (time.perf_counter() - t0, len(reload_cards))
+
+    # Новий шлях: сцена будується один раз, далі лише текст і арт
+    view = CardSceneView(args.layout)
+    t0 = time.perf_counter()
+    SceneExporter(view).export_deck(deck, os.path.join(out_root, "reuse"))
+    results["reuse"] = (time.perf_counter() - t0, len(deck))
+    _dispose_scene_view(view)
+
+    per_card = {k: (elapsed / n if n else 0.0) for k, (elapsed, n) in results.items()}
+    summary = {
+        "deck": deck.name,
+        "layout": os.path.abspath(args.layout),
+        "cards": {k: n for k, (_, n) in results.items()},
+        "ms_per_card": {k: round(v * 1000, 2) for k, v in per_card.items()},
+        "total_s": {k: round(elapsed, 4) for k, (elapsed, _) in results.items()},
+        "speedup": round(per_card["reload"] / per_card["reuse"], 2) if per_card["reuse"] else None,
+    }
+    print(json.dumps(summary, ensure_ascii=False, indent=2))
+    return 0
+
+
+# ─────────────────────────────────────────────
+# deck-mem
+# ─────────────────────────────────────────────
+
+def _synthetic_deck(source: str, count: int, path: str) -> None:
+    """Write `count` cards cycled from `source` (names made unique) to `path`."""
+    with open(source, "r", encoding="utf-8") as f:
+        base = json.load(f)
+    cards = base.get("cards") or [{"name": "Card", "type": "unit"}]
+    with open(path, "w", encoding="utf-8") as f:
+        header = {k: v for k, v in base.items() if k != "cards"}
+        f.write(json.dumps(header, ensure_ascii=False)[:-1] + (", " if header else "") + '"cards": [')
+        for i in range(count):
+            card = dict(cards[i % len(cards)])
+            card["name"] = f"{card.get('name', 'Card')} {i + 1}"
+            f.write(("," if i else "") + json.dumps(card, ensure_ascii=False))
+        f.write("]}")
+
+
+def _measure_load(path: str, columnar: bool):
+    tracemalloc.start()
+    t0 = time.perf_counter()
+    deck = JSONLoader(path, use_cache=False).load(columnar=columnar)
+    elapsed = time.perf_counter() - t0
+    retained, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return deck, {
+        "retained_mb": round(retained / 2**20, 2),
+        "peak_mb": round(peak / 2**20, 2),
+        "load_s": round(elapsed, 4),
+    }
+
+
+def cmd_deck_mem(args) -> int:
+    """Memory held by a loaded deck: dict per card vs. DeckColumns, on a synthetic deck."""
+    os.makedirs(os.path.dirname(os.path.abspath(args.out)), exist_ok=True)
+    _synthetic_deck(args.deck, args.cards, args.out)
+    try:
+        results = {}
+        decks = {}
+        for mode, columnar in (("dicts", False), ("columns", True)):
+            decks[mode], results[mode] = _measure_load(args.out, columnar)
+        # Колонки мають віддавати ті самі payload'и, що й звичайне завантаження
+        same = all(a.payload == b.payload for a, b in zip(decks["dicts"].cards, decks["columns"].cards))
+    finally:
+        if not args.keep:
+            os.remove(args.out)
+    summary = {
+        "deck": os.path.abspath(args.deck),
+        "cards": args.cards,
+        "results": results,
+        "ratio": round(results["dicts"]["retained_mb"] / results["columns"]["retained_mb"], 2)
+        if results["columns"]["retained_mb"] else None,
+        "payloads_equal": same,
+    }
+    print(json.dumps(summary, ensure_ascii=False, indent=2))
+    return 0 if same else 1
+
+
+# ─────────────────────────────────────────────
+# ENTRY POINT
+# ─────────────────────────────────────────────
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="ls_gen", description="LS_gen headless tools")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    render = sub.add_parser("render", help="Render a deck JSON to PNG cards (and optionally PDF)")
+    render.add_argument("--deck", required=True, help="Path to deck JSON")
+    render.add_argument("--template", default=DEFAULT_TEMPLATE, help="CardRenderer template JSON")
+    render.add_argument("--out", default=None, help="Output directory (default: export/<deck name>)")
+    render.add_argument("--pdf", action="store_true", help="Also build <deck name>.pdf in the output directory")
+    render.add_argument("--nup", action="store_true", help="With --pdf: lay cards out N-up on print sheets at their physical size")
+    render.add_argument("--paper", default="a4", choices=["a4", "letter", "a3"], help="Sheet size for --nup")
+    render.add_argument("--back", default=None, help="With --nup: card back image, adds a duplex back page after every sheet")
+    render.add_argument("--flip", default="long", choices=["long", "short"], help="Duplex flip edge for --back")
+    render.add_argument("--no-crop-marks", action="store_true", help="With --nup: omit crop marks")
+    render.add_argument("--pdf-stream", action="store_true", help="With --pdf: encode images in worker processes and stream the PDF to disk")
+    render.add_argument("--pdf-encoding", default="flate", choices=["flate", "jpeg"], help="Image encoding for --pdf-stream")
+    render.add_argument("--pdf-quality", type=int, default=90, help="JPEG quality for --pdf-stream --pdf-encoding jpeg")
+    render.add_argument("--atlas", action="store_true", help="Also pack the cards into grid sheets + JSON index in <out>/atlas")
+    render.add_argument("--atlas-grid", default="10x7", help="Atlas grid as COLSxROWS (default 10x7)")
+    render.add_argument("--atlas-cell-width", type=int, default=None, help="Atlas cell width in px (default: card width)")
+    render.add_argument("--workers", type=int, default=None, help="Worker processes (default: all cores)")
+    render.add_argument("--summary", default=None, help="Also write the JSON timing summary to this file")
+    render.add_argument("--stream", action="store_true", help="Stream cards from the deck file instead of loading it first")
+    render.add_argument("--incremental", action="store_true", help="Skip cards unchanged since the last run (<out>.manifest.json)")
+    render.add_argument("--columnar", action="store_true", help="Hold the deck in the column store (less memory on huge decks)")
+    render.add_argument("--rebuild-cache", action="store_true", help="Ignore and rewrite the deck's binary cache (<deck>.cache.pkl)")
+    render.add_argument("-q", "--quiet", action="store_true", help="Do not log per-card progress")
+    render.set_defaults(func=cmd_render)
+
+    scene = sub.add_parser("scene-export", help="Export a deck via the headless scene renderer (offscreen Qt)")
+    scene.add_argument("--deck", required=True, help="Path to deck JSON")
+    scene.add_argument("--layout", default=DEFAULT_LAYOUT, help="CardSceneView layout JSON")
+    scene.add_argument("--frame", default=None, help="Optional frame PNG drawn under the items")
+    scene.add_argument("--out", default=None, help="Output directory (default: export/<deck name>)")
+    scene.add_argument("--workers", type=int, default=None, help="Worker processes (default: all cores)")
+    scene.add_argument("--incremental", action="store_true", help="Skip cards unchanged since the last run (<out>.manifest.json)")
+    scene.add_argument("--columnar", action="store_true", help="Hold the deck in the column store (less memory on huge decks)")
+    scene.add_argument("--rebuild-cache", action="store_true", help="Ignore and rewrite the deck's binary cache (<deck>.cache.pkl)")
+    scene.add_argument("-q", "--quiet", action="store_true", help="Do not log per-card progress")
+    scene.set_defaults(func=cmd_scene_export)
+
+    watch = sub.add_parser("watch", help="Re-render affected cards when the deck, layout or art files change")
+    watch.add_argument("--deck", required=True, help="Path to deck JSON")
+    watch.add_argument("--layout", default=DEFAULT_LAYOUT, help="CardSceneView layout JSON")
+    watch.add_argument("--frame", default=None, help="Optional frame PNG drawn under the items")
+    watch.add_argument("--arts", action="append", default=[], help="Art folder to watch (default: <deck folder>/../arts)")
+    watch.add_argument("--out", default=None, help="Output directory (default: export/<deck name>)")
+    watch.add_argument("--debounce", type=float, default=0.5, help="Seconds of quiet before re-rendering")
+    watch.set_defaults(func=cmd_watch)
+
+    bench = sub.add_parser("scene-bench", help="Time SceneExporter per card: per-card layout reload vs. reused scene")
+    bench.add_argument("--deck", required=True, help="Path to deck JSON")
+    bench.add_argument("--layout", default=DEFAULT_LAYOUT, help="CardSceneView layout JSON")
+    bench.add_argument("--out", default=None, help="Scratch output directory (default: export/_scene_bench)")
+    bench.add_argument("--limit", type=int, default=0, help="Only export the first N cards")
+    bench.add_argument("--reload-sample", type=int, default=5, help="Cards timed on the per-card reload path (0 = all)")
+    bench.set_defaults(func=cmd_scene_bench)
+
+    mem = sub.add_parser("deck-mem", help="Compare memory of a dict-per-card deck vs. the column store")
+    mem.add_argument("--deck", default=PROJECT_PATH("import/deck_95.json"), help="Deck JSON the synthetic cards are cycled from")
+    mem.add_argument("--cards", type=int, default=50000, help="Synthetic deck size")
+    mem.add_argument("--out", default=os.path.join("export", "_deck_mem.json"), help="Where to write the synthetic deck")
+    mem.add_argument("--keep", action="store_true", help="Keep the synthetic deck file")
+    mem.set_defaults(func=cmd_deck_mem)
+
+    return parser
+
+
+def main(argv=None) -> int:
+    args = build_parser().parse_args(argv)
+    try:
+        return args.func(args)
+    except (FileNotFoundError, ValueError, KeyError) as exc:
+        _log(f"[ERROR] {exc}")
+        return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
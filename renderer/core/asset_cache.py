@@ -0,0 +1,127 @@
+"""Process-wide LRU cache of decoded card assets (frames, icons, fonts)."""
+
+from __future__ import annotations
+
+import os
+import threading
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
+
+from PIL import Image, ImageFont
+
+
+AssetKey = Tuple[str, Optional[Tuple[int, int]], float]
+
+
+class AssetCache:
+    """
+    Зберігає декодовані RGBA-зображення, ключ — (шлях, розмір, mtime).
+
+    Зміна файлу на диску змінює mtime, тож застарілий запис просто
+    перестає збігатися і з часом витісняється за LRU-політикою.
+    """
+
+    def __init__(self, max_entries: int = 128):
+        self.max_entries = max(1, int(max_entries))
+        self._images: "OrderedDict[AssetKey, Image.Image]" = OrderedDict()
+        self._fonts: Dict[Tuple[str, float, float], ImageFont.FreeTypeFont] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    # -------------------------------------------------
+    # ЗОБРАЖЕННЯ
+    # -------------------------------------------------
+    def get_image(self, path: str, size: Optional[Tuple[int, int]] = None) -> Optional[Image.Image]:
+        """
+        Повертає RGBA-зображення (за потреби масштабоване LANCZOS до size).
+        Повертає None, якщо файл відсутній або не читається.
+
+        Результат спільний для всіх викликів — не змінюйте його на місці.
+        """
+        try:
+            mtime = os.path.getmtime(path)
+        except (OSError, TypeError):
+            return None
+
+        key: AssetKey = (os.path.abspath(path), tuple(size) if size else None, mtime)
+        with self._lock:
+            cached = self._images.get(key)
+            if cached is not None:
+                self._images.move_to_end(key)
+                self.hits += 1
+                return cached
+            self.misses += 1
+
+        try:
+            with Image.open(path) as src:
+                img = src.convert("RGBA")
+            if size and img.size != tuple(size):
+                img = img.resize(tuple(size), Image.LANCZOS)
+        except Exception:
+            return None
+
+        with self._lock:
+            self._images[key] = img
+            self._images.move_to_end(key)
+            while len(self._images) > self.max_entries:
+                self._images.popitem(last=False)
+                self.evictions += 1
+        return img
+
+    # -------------------------------------------------
+    # ШРИФТИ
+    # -------------------------------------------------
+    def get_font(self, path: str, size: float) -> ImageFont.FreeTypeFont:
+        """Повертає спільний FreeTypeFont для (шлях, розмір)."""
+        mtime = os.path.getmtime(path)
+        key = (os.path.abspath(path), size, mtime)
+        with self._lock:
+            font = self._fonts.get(key)
+            if font is not None:
+                self.hits += 1
+                return font
+            self.misses += 1
+
+        font = ImageFont.truetype(path, size)
+        with self._lock:
+            self._fonts[key] = font
+        return font
+
+    # -------------------------------------------------
+    # СЛУЖБОВЕ
+    # -------------------------------------------------
+    def stats(self) -> dict:
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "images": len(self._images),
+                "fonts": len(self._fonts),
+                "hit_rate": (self.hits / total) if total else 0.0,
+            }
+
+    def clear(self):
+        with self._lock:
+            self._images.clear()
+            self._fonts.clear()
+            self.hits = 0
+            self.misses = 0
+            self.evictions = 0
+
+
+_default_cache: Optional[AssetCache] = None
+_default_lock = threading.Lock()
+
+
+def get_asset_cache() -> AssetCache:
+    """Повертає спільний для процесу AssetCache."""
+    global _default_cache
+    if _default_cache is None:
+        with _default_lock:
+            if _default_cache is None:
+                _default_cache = AssetCache()
+    return _default_cache
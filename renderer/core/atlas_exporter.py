@@ -0,0 +1,170 @@
+"""Grid atlas export (Tabletop Simulator style): cards packed into fixed-grid PNG sheets plus a JSON index."""
+
+from __future__ import annotations
+
+import json
+import os
+import struct
+import zlib
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from PIL import Image, ImageOps
+
+# Аркуш пишеться смугами: на кожен рядок сітки відкриваються лише cols
+# карток, смуга масштабується й одразу стискається в IDAT, тож у пам'яті
+# ніколи немає ні всієї колоди, ні всього аркуша. 10×7 — межа сітки TTS.
+
+ATLAS_VERSION = 1
+DEFAULT_GRID = (10, 7)
+MAX_SHEET_SIDE = 8192
+
+
+class PngStreamWriter:
+    """8-bit RGBA PNG written scanline band by band (filter type 0, one zlib stream)."""
+
+    def __init__(self, path: str, width: int, height: int):
+        self.path = path
+        self.width = width
+        self.height = height
+        self.rows_written = 0
+        self._tmp = path + ".tmp"
+        self.fh = open(self._tmp, "wb")
+        self.fh.write(b"\x89PNG\r\n\x1a\n")
+        self._chunk(b"IHDR", struct.pack(">IIBBBBB", width, height, 8, 6, 0, 0, 0))
+        self._zip = zlib.compressobj(6)
+
+    def _chunk(self, kind: bytes, data: bytes):
+        self.fh.write(struct.pack(">I", len(data)))
+        self.fh.write(kind)
+        self.fh.write(data)
+        self.fh.write(struct.pack(">I", zlib.crc32(kind + data) & 0xFFFFFFFF))
+
+    def write_band(self, band: Image.Image):
+        """Append band.height scanlines; band must be RGBA and exactly `width` wide."""
+        raw = band.tobytes()
+        stride = self.width * 4
+        scanlines = b"".join(b"\x00" + raw[y * stride:(y + 1) * stride] for y in range(band.height))
+        data = self._zip.compress(scanlines)
+        if data:
+            self._chunk(b"IDAT", data)
+        self.rows_written += band.height
+
+    def close(self):
+        if self.rows_written != self.height:
+            raise ValueError(f"PNG {self.path}: записано {self.rows_written} з {self.height} рядків")
+        self._chunk(b"IDAT", self._zip.flush())
+        self._chunk(b"IEND", b"")
+        self.fh.close()
+        os.replace(self._tmp, self.path)
+
+    def abort(self):
+        self.fh.close()
+        try:
+            os.remove(self._tmp)
+        except OSError:
+            pass
+
+
+def _cell_size(first_image: str, cols: int, cell_width: Optional[int]) -> Tuple[int, int]:
+    with Image.open(first_image) as im:
+        card_w, card_h = im.size
+    width = cell_width or min(card_w, MAX_SHEET_SIDE // cols)
+    return width, max(1, round(width * card_h / card_w))
+
+
+def export_atlas(
+    image_list: Sequence[str],
+    out_dir: str,
+    name: str = "deck",
+    grid: Tuple[int, int] = DEFAULT_GRID,
+    cell_width: Optional[int] = None,
+    names: Optional[Sequence[str]] = None,
+) -> Dict:
+    """
+    Pack card PNGs into <name>_sheetNN.png grids and write <name>_atlas.json.
+
+    cell_width задає роздільність клітинки (висота — за пропорціями першої
+    картки); типово — рідний розмір картки, але не ширше MAX_SHEET_SIDE на
+    аркуш. Останній аркуш має лише потрібну кількість рядків.
+    Returns the index that is written to JSON.
+    """
+    cols, rows = grid
+    if cols < 1 or rows < 1:
+        raise ValueError(f"Некоректна сітка атласу: {cols}×{rows}")
+
+    cards: List[Tuple[str, str]] = []
+    for index, img_path in enumerate(image_list):
+        if not os.path.exists(img_path):
+            print(f"[ATLAS WARNING] Файл не існує і буде пропущено: {img_path}")
+            continue
+        label = names[index] if names is not None else os.path.splitext(os.path.basename(img_path))[0]
+        cards.append((img_path, label))
+    if not cards:
+        raise ValueError("Список зображень порожній — нема що експортувати.")
+
+    cell_w, cell_h = _cell_size(cards[0][0], cols, cell_width)
+    if cols * cell_w > MAX_SHEET_SIDE or rows * cell_h > MAX_SHEET_SIDE:
+        raise ValueError(
+            f"Аркуш {cols * cell_w}×{rows * cell_h} px більший за {MAX_SHEET_SIDE} px — зменште cell_width або сітку"
+        )
+    os.makedirs(out_dir, exist_ok=True)
+
+    per_sheet = cols * rows
+    index: Dict = {
+        "version": ATLAS_VERSION,
+        "grid": [cols, rows],
+        "cell": [cell_w, cell_h],
+        "sheets": [],
+        "cards": [],
+    }
+    for sheet_no, start in enumerate(range(0, len(cards), per_sheet)):
+        sheet_cards = cards[start:start + per_sheet]
+        sheet_rows = -(-len(sheet_cards) // cols)
+        sheet_path = os.path.join(out_dir, f"{name}_sheet{sheet_no + 1:02d}.png")
+        writer = PngStreamWriter(sheet_path, cols * cell_w, sheet_rows * cell_h)
+        try:
+            for row in range(sheet_rows):
+                band = Image.new("RGBA", (cols * cell_w, cell_h), (0, 0, 0, 0))
+                for col, (img_path, label) in enumerate(sheet_cards[row * cols:(row + 1) * cols]):
+                    x = col * cell_w
+                    try:
+                        with Image.open(img_path) as im:
+                            card = ImageOps.contain(im.convert("RGBA"), (cell_w, cell_h), Image.LANCZOS)
+                    except Exception as e:
+                        print(f"[ATLAS ERROR] Помилка {img_path}: {e}")
+                        continue
+                    # Інші пропорції — по центру клітинки
+                    band.paste(card, (x + (cell_w - card.width) // 2, (cell_h - card.height) // 2))
+                    cell = row * cols + col
+                    index["cards"].append(
+                        {
+                            "index": start + cell,
+                            "name": label,
+                            "source": os.path.abspath(img_path),
+                            "sheet": sheet_no,
+                            "cell": cell,
+                            "col": col,
+                            "row": row,
+                            "rect": [x, row * cell_h, cell_w, cell_h],
+                        }
+                    )
+                writer.write_band(band)
+            writer.close()
+        except BaseException:
+            writer.abort()
+            raise
+        index["sheets"].append(
+            {
+                "path": os.path.basename(sheet_path),
+                "size": [cols * cell_w, sheet_rows * cell_h],
+                "grid": [cols, sheet_rows],
+                "cards": len(sheet_cards),
+            }
+        )
+        print(f"Атлас: {sheet_path} ({len(sheet_cards)} карток)")
+
+    index_path = os.path.join(out_dir, f"{name}_atlas.json")
+    with open(index_path, "w", encoding="utf-8") as f:
+        json.dump(index, f, ensure_ascii=False, indent=2)
+    index["index_path"] = index_path
+    return index
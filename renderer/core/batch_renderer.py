@@ -0,0 +1,201 @@
+"""Render a whole deck through CardRenderer using a pool of worker processes."""
+
+from __future__ import annotations
+
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+from .models import CardModel, DeckModel
+from .naming import build_unique_path, card_suffix, slugify_card_name
+from .paths import PROJECT_PATH
+from .render_manifest import IncrementalRun, RenderManifest, asset_versions, card_digest, content_digest
+from .renderer import CardRenderer
+
+
+RenderJob = Tuple[int, Dict, str]
+
+# Один CardRenderer на процес: шрифти й рамка створюються в initializer,
+# а не для кожної картки.
+_worker_renderer: Optional[CardRenderer] = None
+
+
+def card_render_data(card: CardModel) -> Dict:
+    """Map a normalized deck card onto the keys CardRenderer.render understands."""
+
+    data: Dict = {"title": card.name}
+    desc = card.get("description") or card.get("text") or card.get("effect")
+    if desc:
+        data["description"] = str(desc)
+    art_path = card.get("art_path")
+    if art_path and os.path.exists(art_path):
+        data["img"] = art_path
+    for key in ("atk", "def", "stb"):
+        value = card.get(key)
+        if value is not None and value != "":
+            data[key] = value
+    return data
+
+
+def _init_worker(template: Dict) -> None:
+    global _worker_renderer
+    _worker_renderer = CardRenderer(template)
+
+
+def _render_job(job: RenderJob) -> Tuple[int, str]:
+    index, data, out_path = job
+    image = _worker_renderer.render(data)
+    image.save(out_path)
+    return index, out_path
+
+
+def plan_deck_jobs(deck: DeckModel, out_dir: str, avoid_existing: bool = True) -> List[RenderJob]:
+    """Assign every card its output path up front so naming stays deterministic."""
+
+    used_paths: Set[str] = set()
+    jobs: List[RenderJob] = []
+    for idx, card in enumerate(deck.cards):
+        safe_name = slugify_card_name(card.name)
+        out_path = build_unique_path(
+            out_dir, safe_name, card_suffix(card, idx), used_paths, avoid_existing=avoid_existing
+        )
+        jobs.append((idx, card_render_data(card), out_path))
+    return jobs
+
+
+def renderer_digest_for(template: Dict):
+    """Per-card hash function for CardRenderer output: data, template, art and assets/."""
+
+    template_hash = content_digest(template)
+    assets = asset_versions(
+        [PROJECT_PATH("assets/fonts"), PROJECT_PATH("assets/icons"), PROJECT_PATH("assets/frames/frame.png")]
+    )
+    return lambda data: card_digest(data, template=template_hash, assets=assets, art_path=data.get("img"))
+
+
+def iter_render_deck(
+    deck: DeckModel,
+    template: Dict,
+    out_dir: str,
+    workers: Optional[int] = None,
+    chunksize: Optional[int] = None,
+    manifest: Optional[RenderManifest] = None,
+) -> Iterator[Tuple[int, str]]:
+    """
+    Yield (card_position, png_path) in deck order as cards finish rendering.
+
+    workers=None uses every core; workers<=1 renders in the calling process.
+    With a manifest, cards whose hash is unchanged are yielded without
+    rendering and PNGs of removed cards are deleted.
+    """
+
+    os.makedirs(out_dir, exist_ok=True)
+    jobs = plan_deck_jobs(deck, out_dir, avoid_existing=manifest is None)
+    with IncrementalRun(manifest, jobs, lambda: renderer_digest_for(template)) as run:
+        rendered = _run_jobs(run.stale, template, workers, chunksize)
+        try:
+            for index, _, out_path in jobs:
+                if run.needs_render(out_path):
+                    index, out_path = next(rendered)
+                    run.record(out_path)
+                yield index, out_path
+        finally:
+            rendered.close()
+
+
+def _run_jobs(
+    jobs: List[RenderJob],
+    template: Dict,
+    workers: Optional[int],
+    chunksize: Optional[int],
+) -> Iterator[Tuple[int, str]]:
+    if not jobs:
+        return
+
+    workers = workers or os.cpu_count() or 1
+    workers = max(1, min(workers, len(jobs)))
+
+    if workers == 1:
+        _init_worker(template)
+        for job in jobs:
+            yield _render_job(job)
+        return
+
+    if chunksize is None:
+        # Невеликі пакети тримають порядок видачі рівним і
+        # водночас зменшують накладні витрати на pickle.
+        chunksize = max(1, len(jobs) // (workers * 8))
+
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        initializer=_init_worker,
+        initargs=(template,),
+    ) as pool:
+        yield from pool.map(_render_job, jobs, chunksize=chunksize)
+
+
+def iter_render_stream(
+    cards: Iterable[CardModel],
+    template: Dict,
+    out_dir: str,
+    workers: Optional[int] = None,
+    window: Optional[int] = None,
+) -> Iterator[Tuple[int, str]]:
+    """
+    Render cards as they arrive from a streaming loader (JSONLoader.iter_cards).
+
+    Unlike iter_render_deck the deck is never materialized: at most `window`
+    cards are in flight, so the first PNG appears right away and memory stays
+    flat. Yields (card_position, png_path) in input order.
+    """
+
+    os.makedirs(out_dir, exist_ok=True)
+    used_paths: Set[str] = set()
+
+    def jobs() -> Iterator[RenderJob]:
+        for position, card in enumerate(cards):
+            safe_name = slugify_card_name(card.name)
+            out_path = build_unique_path(out_dir, safe_name, card_suffix(card, position), used_paths)
+            yield position, card_render_data(card), out_path
+
+    workers = workers or os.cpu_count() or 1
+    if workers <= 1:
+        _init_worker(template)
+        for job in jobs():
+            yield _render_job(job)
+        return
+
+    window = window or workers * 4
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        initializer=_init_worker,
+        initargs=(template,),
+    ) as pool:
+        in_flight: deque = deque()
+        for job in jobs():
+            in_flight.append(pool.submit(_render_job, job))
+            if len(in_flight) >= window:
+                yield in_flight.popleft().result()
+        while in_flight:
+            yield in_flight.popleft().result()
+
+
+def render_deck(
+    deck: DeckModel,
+    template: Dict,
+    out_dir: str,
+    workers: Optional[int] = None,
+    progress: Optional[Callable[[int, int, str], None]] = None,
+    manifest: Optional[RenderManifest] = None,
+) -> List[str]:
+    """Render every card of the deck to PNG and return the paths in deck order."""
+
+    total = len(deck)
+    paths: List[str] = []
+    cards = iter_render_deck(deck, template, out_dir, workers, manifest=manifest)
+    for done, (_, path) in enumerate(cards, start=1):
+        paths.append(path)
+        if progress:
+            progress(done, total, path)
+    return paths
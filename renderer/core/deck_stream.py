@@ -0,0 +1,151 @@
+"""Row-by-row readers for very large CSV/JSON decks (flat peak memory)."""
+
+from __future__ import annotations
+
+import csv
+import json
+from typing import Any, Dict, Iterator
+
+CHUNK_SIZE = 1 << 16
+
+_decoder = json.JSONDecoder()
+_NUMBER_END = frozenset(" \t\r\n,]}")
+
+
+class _JsonStream:
+    """
+    Minimal incremental JSON reader over a text file.
+
+    Containers we stream through (the top-level object and the cards array)
+    are walked token by token; every value inside them is decoded whole with
+    JSONDecoder.raw_decode, reading more text only when the buffer ends
+    mid-value.
+    """
+
+    def __init__(self, fh, chunk_size: int = CHUNK_SIZE):
+        self.fh = fh
+        self.chunk_size = chunk_size
+        self.buf = ""
+        self.pos = 0
+        self.eof = False
+
+    def _fill(self) -> bool:
+        if self.eof:
+            return False
+        chunk = self.fh.read(self.chunk_size)
+        if not chunk:
+            self.eof = True
+            return False
+        # Відкидаємо вже прочитане, щоб буфер не ріс разом із файлом
+        if self.pos:
+            self.buf = self.buf[self.pos:]
+            self.pos = 0
+        self.buf += chunk
+        return True
+
+    def peek(self) -> str:
+        """Next non-whitespace character without consuming it; '' at end of file."""
+        while True:
+            while self.pos < len(self.buf) and self.buf[self.pos] in " \t\r\n":
+                self.pos += 1
+            if self.pos < len(self.buf):
+                return self.buf[self.pos]
+            if not self._fill():
+                return ""
+
+    def expect(self, char: str):
+        found = self.peek()
+        if found != char:
+            raise ValueError(f"JSON: очікувався '{char}', знайдено '{found or 'EOF'}'")
+        self.pos += 1
+
+    def value(self) -> Any:
+        self.peek()
+        while True:
+            try:
+                obj, end = _decoder.raw_decode(self.buf, self.pos)
+            except json.JSONDecodeError:
+                if self._fill():
+                    continue
+                raise
+            # Число на межі буфера могло обірватися ("12" замість "125", "2." замість "2.5"):
+            # приймаємо його лише коли за ним уже видно роздільник
+            truncated = end == len(self.buf) or (
+                isinstance(obj, (int, float)) and not isinstance(obj, bool)
+                and self.buf[end] not in _NUMBER_END
+            )
+            if truncated and self._fill():
+                continue
+            self.pos = end
+            return obj
+
+    def iter_array(self) -> Iterator[Any]:
+        self.expect("[")
+        if self.peek() == "]":
+            self.pos += 1
+            return
+        while True:
+            yield self.value()
+            if self.peek() == ",":
+                self.pos += 1
+                continue
+            self.expect("]")
+            return
+
+
+class DeckStream:
+    """
+    Iterate raw card dicts from a CSV or JSON deck without loading the whole file.
+
+    JSON may be a plain list of cards or an object with a "cards" array.
+    Top-level keys are collected into ``header`` as they are read, so keys
+    written before "cards" (deck_color, prompts, style_hint — the order the
+    data editor saves in) are known when the first card is yielded. An
+    object without "cards" ends up entirely in ``header`` and yields nothing;
+    ``has_cards`` tells the two cases apart. ``layout`` is "csv", "list" or
+    "object" once iteration has started.
+    """
+
+    def __init__(self, path: str, chunk_size: int = CHUNK_SIZE):
+        self.path = path
+        self.chunk_size = chunk_size
+        self.header: Dict[str, Any] = {}
+        self.has_cards = False
+        self.layout = ""
+
+    def __iter__(self) -> Iterator[Any]:
+        if self.path.lower().endswith(".csv"):
+            self.has_cards = True
+            self.layout = "csv"
+            with open(self.path, "r", encoding="utf-8", newline="") as fh:
+                yield from csv.DictReader(fh)
+            return
+
+        with open(self.path, "r", encoding="utf-8") as fh:
+            stream = _JsonStream(fh, self.chunk_size)
+            first = stream.peek()
+            if first == "[":
+                self.has_cards = True
+                self.layout = "list"
+                yield from stream.iter_array()
+                return
+            if first != "{":
+                # Скаляр або порожній файл — карток немає
+                return
+            self.layout = "object"
+            stream.expect("{")
+            if stream.peek() == "}":
+                return
+            while True:
+                key = stream.value()
+                stream.expect(":")
+                if key == "cards" and stream.peek() == "[":
+                    self.has_cards = True
+                    yield from stream.iter_array()
+                else:
+                    self.header[key] = stream.value()
+                if stream.peek() == ",":
+                    stream.pos += 1
+                    continue
+                stream.expect("}")
+                return
@@ -0,0 +1,179 @@
+"""Poll deck, layout and art files; debounce bursts and work out which cards changed."""
+
+from __future__ import annotations
+
+import json
+import os
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from .json_loader import JSONLoader
+from .models import DeckModel
+
+# Без сторонніх залежностей (watchdog тощо): раз на interval порівнюємо
+# (mtime, size) файлів. Серія записів (редактор зберігає кілька разів поспіль)
+# повертається одним оновленням лише після debounce секунд тиші.
+
+Stamp = Tuple[int, int]
+
+
+def default_art_dir(deck_path: str) -> str:
+    """The folder JSONLoader._autodetect_art looks in: <deck folder>/../arts."""
+    return os.path.abspath(os.path.join(os.path.dirname(deck_path), "..", "arts"))
+
+
+def snapshot(paths: Iterable[str]) -> Dict[str, Stamp]:
+    """(mtime_ns, size) of every watched file; directories contribute their direct children."""
+    stamps: Dict[str, Stamp] = {}
+    for path in paths:
+        if not path:
+            continue
+        path = os.path.abspath(path)
+        if os.path.isdir(path):
+            try:
+                with os.scandir(path) as entries:
+                    for entry in entries:
+                        if entry.is_file():
+                            st = entry.stat()
+                            stamps[entry.path] = (st.st_mtime_ns, st.st_size)
+            except OSError:
+                pass
+            continue
+        try:
+            st = os.stat(path)
+        except OSError:
+            continue
+        stamps[path] = (st.st_mtime_ns, st.st_size)
+    return stamps
+
+
+class ChangeWatcher:
+    def __init__(self, paths: Iterable[str], interval: float = 0.25, debounce: float = 0.5):
+        self.paths = [os.path.abspath(p) for p in paths if p]
+        self.interval = interval
+        self.debounce = debounce
+        self._stamps = snapshot(self.paths)
+        self._pending: Set[str] = set()
+        self._last_change = 0.0
+
+    def poll(self) -> Set[str]:
+        """Return the changed paths once writes have been quiet for `debounce` seconds."""
+        current = snapshot(self.paths)
+        changed = {p for p in set(current) | set(self._stamps) if current.get(p) != self._stamps.get(p)}
+        self._stamps = current
+        now = time.monotonic()
+        if changed:
+            self._pending |= changed
+            self._last_change = now
+            return set()
+        if self._pending and now - self._last_change >= self.debounce:
+            ready, self._pending = self._pending, set()
+            return ready
+        return set()
+
+    def wait(self, stop_event: Optional[threading.Event] = None) -> Set[str]:
+        """Block until a debounced batch of changes is ready; empty set if stopped."""
+        while stop_event is None or not stop_event.is_set():
+            ready = self.poll()
+            if ready:
+                return ready
+            if stop_event is not None:
+                stop_event.wait(self.interval)
+            else:
+                time.sleep(self.interval)
+        return set()
+
+
+@dataclass
+class WatchUpdate:
+    deck: DeckModel
+    indices: List[int]                       # картки для перерендеру, у порядку колоди
+    removed: List[int] = field(default_factory=list)  # позиції, яких більше немає
+    layout_changed: bool = False
+    changed_paths: Set[str] = field(default_factory=set)
+    reason: str = ""
+
+
+def _payload_key(payload: Dict) -> str:
+    return json.dumps(payload, sort_keys=True, ensure_ascii=False, default=str)
+
+
+def affected_cards(
+    old_deck: Optional[DeckModel],
+    new_deck: DeckModel,
+    changed_paths: Set[str],
+    layout_paths: Iterable[str] = (),
+) -> Tuple[List[int], List[int], str]:
+    """
+    Map changed files onto card positions.
+
+    layout/template/frame → every card; deck JSON → cards whose payload
+    (including the auto-detected art_path) differs; art file → cards using it.
+    Returns (indices to render, removed positions, reason).
+    """
+    all_indices = list(range(len(new_deck)))
+    layouts = {os.path.abspath(p) for p in layout_paths if p}
+    if old_deck is None:
+        return all_indices, [], "initial"
+    if changed_paths & layouts:
+        return all_indices, [], "layout"
+    if old_deck.deck_color != new_deck.deck_color:
+        return all_indices, [], "deck_color"
+
+    indices: Set[int] = set()
+    for idx, card in enumerate(new_deck.cards):
+        old = old_deck.card_at(idx)
+        if old is None or _payload_key(old.payload) != _payload_key(card.payload):
+            indices.add(idx)
+        art = card.get("art_path")
+        if art and os.path.abspath(art) in changed_paths:
+            indices.add(idx)
+    removed = list(range(len(new_deck), len(old_deck)))
+    reason = "deck" if os.path.abspath(new_deck.path) in changed_paths else "art"
+    return sorted(indices), removed, reason
+
+
+class DeckWatchSession:
+    """Keeps the last loaded deck and turns file changes into WatchUpdate objects."""
+
+    def __init__(
+        self,
+        deck_path: str,
+        layout_paths: Iterable[str] = (),
+        art_dirs: Optional[Iterable[str]] = None,
+        interval: float = 0.25,
+        debounce: float = 0.5,
+    ):
+        self.deck_path = os.path.abspath(deck_path)
+        self.layout_paths = [os.path.abspath(p) for p in layout_paths if p]
+        self.art_dirs = list(art_dirs) if art_dirs is not None else [default_art_dir(self.deck_path)]
+        self.watcher = ChangeWatcher(
+            [self.deck_path, *self.layout_paths, *self.art_dirs], interval=interval, debounce=debounce
+        )
+        self.deck: Optional[DeckModel] = None
+
+    def initial(self) -> WatchUpdate:
+        self.deck = JSONLoader(self.deck_path).load()
+        return WatchUpdate(self.deck, list(range(len(self.deck))), reason="initial")
+
+    def next_update(self, stop_event: Optional[threading.Event] = None) -> Optional[WatchUpdate]:
+        """Wait for the next debounced change that affects at least one card; None once stopped."""
+        while stop_event is None or not stop_event.is_set():
+            changed = self.watcher.wait(stop_event)
+            if not changed:
+                continue
+            try:
+                deck = JSONLoader(self.deck_path).load()
+            except (OSError, ValueError, KeyError):
+                # Файл ще дописується або тимчасово зламаний — чекаємо наступного збереження
+                continue
+            indices, removed, reason = affected_cards(self.deck, deck, changed, self.layout_paths)
+            self.deck = deck
+            if indices or removed:
+                return WatchUpdate(
+                    deck, indices, removed,
+                    layout_changed=reason == "layout", changed_paths=changed, reason=reason,
+                )
+        return None
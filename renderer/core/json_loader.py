@@ -1,24 +1,128 @@
+import contextlib
 import json
 import os
-from typing import List
+import pickle
+import threading
+import unicodedata
+from typing import Dict, Iterator, List, Optional, Tuple
 
-from .models import CardModel, DeckModel
+from .deck_stream import DeckStream
+from .models import CardModel, DeckColumns, DeckModel, format_card_prompt
+
+# Розширення арту в порядку пріоритету: якщо є і .png, і .jpg — береться .png
+ART_EXTENSIONS = (".png", ".jpg", ".webp")
+
+# arts_dir → (mtime_ns теки, {ключ: шлях}). Одна os.scandir на теку, доки
+# в ній не з'явиться/зникне/перейменується файл (це змінює mtime теки).
+_art_indexes: Dict[str, Tuple[int, Dict[str, str]]] = {}
+_art_indexes_lock = threading.Lock()
+
+# Бінарний кеш нормалізованої колоди поруч із нею: deck_95.json → deck_95.json.cache.pkl.
+# Дійсний, доки збігаються версія лоадера, (mtime, size) колоди та mtime теки
+# артів. LOADER_VERSION треба піднімати при зміні нормалізації. Один файл
+# тримає обидві форми ("data" і "columns"), тож GUI і CLI не затирають кеш одне
+# одного. Це pickle — не відкривайте чужі .cache.pkl: тому JSONLoader кешує
+# лише на явне use_cache=True (так робить CLI; вимикається LS_GEN_DECK_CACHE=0),
+# а GUI і режим спостереження читають колоду без кешу.
+LOADER_VERSION = 2
+CACHE_SUFFIX = ".cache.pkl"
+
+
+def deck_cache_path(deck_path: str) -> str:
+    return deck_path + CACHE_SUFFIX
+
+
+def deck_cache_enabled() -> bool:
+    return os.environ.get("LS_GEN_DECK_CACHE", "1") != "0"
+
+
+def _file_stamp(path: str) -> Optional[Tuple[int, int]]:
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return st.st_mtime_ns, st.st_size
+
+
+def sanitize_art_name(name: str) -> str:
+    # NFC до фільтра: у NFD "Й" = "И" + U+0306, і combining-знак не isalnum()
+    name = unicodedata.normalize("NFC", name)
+    return "".join(c for c in name if c.isalnum() or c in " _-").rstrip()
+
+
+def art_key(stem: str) -> str:
+    """Case-insensitive, NFC-normalized key: 'Кулеметник' (NFD, any case) → one key."""
+    return unicodedata.normalize("NFC", stem).casefold()
+
+
+def build_art_index(arts_dir: str) -> Dict[str, str]:
+    index: Dict[str, str] = {}
+    ranks: Dict[str, int] = {}
+    try:
+        entries = list(os.scandir(arts_dir))
+    except OSError:
+        return index
+    for entry in entries:
+        stem, ext = os.path.splitext(entry.name)
+        ext = ext.lower()
+        if ext not in ART_EXTENSIONS or not entry.is_file():
+            continue
+        key = art_key(stem)
+        rank = ART_EXTENSIONS.index(ext)
+        if key not in ranks or rank < ranks[key]:
+            index[key] = entry.path
+            ranks[key] = rank
+    return index
+
+
+def get_art_index(arts_dir: str) -> Dict[str, str]:
+    """Cached art index for arts_dir, rebuilt when the folder's mtime changes."""
+    try:
+        mtime = os.stat(arts_dir).st_mtime_ns
+    except OSError:
+        return {}
+    with _art_indexes_lock:
+        cached = _art_indexes.get(arts_dir)
+        if cached is not None and cached[0] == mtime:
+            return cached[1]
+    index = build_art_index(arts_dir)
+    with _art_indexes_lock:
+        _art_indexes[arts_dir] = (mtime, index)
+    return index
 
 
 class JSONLoader:
-    def __init__(self, deck_path):
+    def __init__(self, deck_path, use_cache: bool = False, rebuild_cache: bool = False):
         self.deck_path = deck_path
+        self.use_cache = use_cache
+        # Ігнорувати наявний кеш і записати його заново
+        self.rebuild_cache = rebuild_cache
+        # "hit" / "miss" / "off" після останнього load()
+        self.cache_status = "off"
+        self._stamp: Optional[Dict] = None
+        # Дійсний вміст sidecar'а з цим штампом — до нього дописується інша форма
+        self._sidecar: Dict = {}
         self.deck_folder = os.path.dirname(deck_path)
         self.data = None
+        self.arts_dir = os.path.abspath(os.path.join(self.deck_folder, "..", "arts"))
+        self._art_index: Optional[Dict[str, str]] = None
+        # Назви карток, для яких арт не знайдено під час останнього load()
+        self.unmatched_art: List[str] = []
 
-    def load(self) -> DeckModel:
+    def load(self, columnar: bool = False) -> DeckModel:
+        if columnar:
+            return self.load_columns()
         if not os.path.exists(self.deck_path):
             raise FileNotFoundError(f"JSON deck not found: {self.deck_path}")
 
-        with open(self.deck_path, "r", encoding="utf-8") as f:
-            self.data = json.load(f)
-
-        self.normalize()
+        cached = self._read_cache("data")
+        if cached is not None:
+            self.data = cached
+        else:
+            with open(self.deck_path, "r", encoding="utf-8") as f:
+                self.data = json.load(f)
+            self.normalize()
+            self._write_cache("data", self.data)
         deck_name = os.path.splitext(os.path.basename(self.deck_path))[0]
         cards: List[CardModel] = [CardModel(index=i, payload=card) for i, card in enumerate(self.data["cards"])]
 
@@ -40,48 +144,175 @@ class JSONLoader:
 
         deck_color = self.data.get("deck_color", "#FFFFFF")
         prompts = self.data.get("prompts", {})
+        self._art_index = get_art_index(self.arts_dir)
+        self.unmatched_art = []
 
         for card in self.data["cards"]:
-            card["deck_color"] = deck_color
-            card["prompt"] = self._get_prompt(prompts, card)
+            self._normalize_card(card, deck_color, prompts)
+
+    def _normalize_card(self, card: dict, deck_color: str, prompts: dict):
+        card["deck_color"] = deck_color
+        card["prompt"] = self._get_prompt(prompts, card)
+
+        # арт (опція)
+        card["art_path"] = self._autodetect_art(card)
+        if card["art_path"] is None:
+            self.unmatched_art.append(card["name"])
+
+    # ─────────────────────────────────────────────
+    # Потокове читання великих колод (CSV/JSON)
+    # ─────────────────────────────────────────────
+    def iter_cards(self) -> Iterator[CardModel]:
+        """
+        Yield normalized CardModels one by one without holding the whole deck.
+
+        Works for deck JSON and CSV. deck_color/prompts are taken from the
+        keys written before "cards"; self.data holds those keys while
+        streaming.
+        """
+        if not os.path.exists(self.deck_path):
+            raise FileNotFoundError(f"Deck not found: {self.deck_path}")
+
+        stream = DeckStream(self.deck_path)
+        self.data = stream.header
+        self._art_index = get_art_index(self.arts_dir)
+        self.unmatched_art = []
+        for index, card in enumerate(stream):
+            if not isinstance(card, dict):
+                continue
+            card.setdefault("name", f"Card {index + 1}")
+            self._normalize_card(
+                card, stream.header.get("deck_color", "#FFFFFF"), stream.header.get("prompts", {})
+            )
+            yield CardModel(index=index, payload=card)
+        if not stream.has_cards:
+            raise ValueError("JSON deck не містить масиву 'cards'")
+
+    def load_columns(self) -> DeckModel:
+        """
+        Load the deck into a DeckColumns store (see models.py) card by card.
+
+        Payload dicts are dropped as soon as they are appended, so the whole
+        deck is never held as dicts unless deck_color/prompts are written
+        after "cards" and the deck has to be re-read with load().
+        """
+        cached = self._read_cache("columns")
+        if cached is not None:
+            header, columns = cached
+            return self._column_deck(columns, header)
+
+        columns: Optional[DeckColumns] = None
+        for card in self.iter_cards():
+            if columns is None:
+                columns = DeckColumns(self.data.get("deck_color", "#FFFFFF"), self.data.get("prompts", {}))
+            columns.append(card.payload)
+        header = self.data
+        if columns is None:
+            columns = DeckColumns(header.get("deck_color", "#FFFFFF"), header.get("prompts", {}))
+        elif (columns.deck_color, columns.prompts) != (header.get("deck_color", "#FFFFFF"), header.get("prompts", {})):
+            # Ключі колоди стоять після "cards" — потоком їх не було видно
+            deck = self.load()
+            columns = DeckColumns(deck.deck_color, deck.prompts)
+            for card in deck.cards:
+                columns.append(card.payload)
+            header = self.data
+        header = {k: v for k, v in header.items() if k != "cards"}
+        self._write_cache("columns", (header, columns))
+        return self._column_deck(columns, header)
+
+    def _column_deck(self, columns: DeckColumns, header: Dict) -> DeckModel:
+        return DeckModel.from_columns(
+            name=os.path.splitext(os.path.basename(self.deck_path))[0],
+            path=self.deck_path,
+            columns=columns,
+            metadata={k: v for k, v in header.items() if k not in {"cards", "deck_color", "prompts"}},
+        )
+
+    # ─────────────────────────────────────────────
+    # Бінарний кеш колоди
+    # ─────────────────────────────────────────────
+    def _cache_stamp(self) -> Dict:
+        arts = _file_stamp(self.arts_dir)
+        return {
+            "version": LOADER_VERSION,
+            "source": _file_stamp(self.deck_path),
+            "arts_dir": self.arts_dir,
+            "arts_mtime": arts[0] if arts else None,
+        }
+
+    def _read_cache(self, kind: str):
+        """Cached `kind` ("data" or "columns") if the sidecar is still valid, else None."""
+        if not self.use_cache:
+            self.cache_status = "off"
+            return None
+        # Штамп знімаємо до читання колоди: якщо її перезапишуть під час
+        # нормалізації, кеш вийде "старішим" за файл і наступного разу не підійде
+        self._stamp = self._cache_stamp()
+        self._sidecar = {}
+        self.cache_status = "miss"
+        if self.rebuild_cache:
+            return None
+        try:
+            with open(deck_cache_path(self.deck_path), "rb") as fh:
+                cached = pickle.load(fh)
+        except (OSError, pickle.UnpicklingError, EOFError, AttributeError, ImportError, ValueError):
+            return None
+        if not isinstance(cached, dict) or cached.get("stamp") != self._stamp:
+            return None
+        self._sidecar = cached
+        if kind not in cached:
+            return None
+
+        self.cache_status = "hit"
+        self.unmatched_art = list(cached.get("unmatched_art", []))
+        mtime = cached["stamp"]["arts_mtime"]
+        if mtime is not None:
+            # Індекс артів з кешу теж актуальний — наступним лоадерам не треба scandir
+            with _art_indexes_lock:
+                _art_indexes.setdefault(self.arts_dir, (mtime, cached.get("art_index", {})))
+        self._art_index = cached.get("art_index", {})
+        return cached[kind]
 
-            # арт (опція)
-            card["art_path"] = self._autodetect_art(card)
+    def _write_cache(self, kind: str, value):
+        stamp = self._stamp
+        if not self.use_cache or stamp is None or stamp["source"] is None:
+            return
+        path = deck_cache_path(self.deck_path)
+        tmp = path + ".tmp"
+        try:
+            # Друга форма з того ж штампу лишається поруч
+            sidecar = {k: v for k, v in self._sidecar.items() if k in ("data", "columns")}
+            sidecar.update(
+                {
+                    "stamp": stamp,
+                    kind: value,
+                    "unmatched_art": self.unmatched_art,
+                    "art_index": self._art_index or {},
+                }
+            )
+            with open(tmp, "wb") as fh:
+                pickle.dump(sidecar, fh, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp, path)
+            self._sidecar = sidecar
+        except OSError:
+            # Тека лише для читання тощо — кеш необов'язковий
+            with contextlib.suppress(OSError):
+                os.remove(tmp)
 
     # ─────────────────────────────────────────────
     # Пошук prompt'а для типу картки
     # ─────────────────────────────────────────────
     def _get_prompt(self, prompts, card):
-        t = card.get("type", "")
-        if t in prompts:
-            try:
-                return prompts[t].format(name=card["name"])
-            except KeyError:
-                return prompts[t]
-        return ""
+        return format_card_prompt(prompts, card)
 
     # ─────────────────────────────────────────────
     # Автовизначення шляху до арту
     # /arts/<deck_name>/<card_name>.png
     # ─────────────────────────────────────────────
     def _autodetect_art(self, card):
-        name = card["name"]
-        sanitized = "".join(c for c in name if c.isalnum() or c in " _-").rstrip()
-
-        arts_dir = os.path.join(self.deck_folder, "..", "arts")
-        arts_dir = os.path.abspath(arts_dir)
-
-        candidates = [
-            os.path.join(arts_dir, f"{sanitized}.png"),
-            os.path.join(arts_dir, f"{sanitized}.jpg"),
-            os.path.join(arts_dir, f"{sanitized}.webp"),
-        ]
-
-        for c in candidates:
-            if os.path.exists(c):
-                return c
-
-        return None
+        if self._art_index is None:
+            self._art_index = get_art_index(self.arts_dir)
+        return self._art_index.get(art_key(sanitize_art_name(card["name"])))
 
 # ─────────────────────────────────────────────
 # Простий завантажувач template.json
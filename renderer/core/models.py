@@ -2,8 +2,11 @@
 
 from __future__ import annotations
 
+import sys
+from array import array
+from collections.abc import Sequence
 from dataclasses import dataclass, field
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
 
 
 @dataclass
@@ -17,20 +20,223 @@ class TemplateLayout:
         return TemplateLayout(path=self.path, data=copy.deepcopy(self.data))
 
 
-@dataclass
+def format_card_prompt(prompts: Dict, card) -> str:
+    """Prompt template for the card's type with {name} filled in; "" if the type has none."""
+    t = card.get("type", "")
+    if t in prompts:
+        try:
+            return prompts[t].format(name=card["name"])
+        except KeyError:
+            return prompts[t]
+    return ""
+
+
+# ─────────────────────────────────────────────
+# Колонкове зберігання колоди
+# ─────────────────────────────────────────────
+# Замість dict на кожну картку: числові стати — у array('h'), решта значень —
+# коди в словнику унікальних значень (рядки через sys.intern), порядок ключів
+# картки — код у таблиці "розкладок". deck_color і prompt, що збігаються з
+# виведеними з колоди, не зберігаються зовсім. Значення, що не влазять у
+# колонку (списки, великі числа тощо), лежать в overflow.
+
+NUMERIC_FIELDS = ("atk", "def", "stb", "init", "rng", "move", "cost")
+DERIVED_FIELDS = ("deck_color", "prompt")
+
+_NUMERIC_MISSING = -32768
+_OVERFLOW = 0xFFFFFFFF
+_ABSENT = object()
+
+
+class DeckColumns:
+    """Column store of card payloads; ``row(i)`` rebuilds the exact dict JSONLoader produced."""
+
+    def __init__(self, deck_color: str = "#FFFFFF", prompts: Optional[Dict] = None):
+        self.deck_color = deck_color
+        self.prompts = prompts or {}
+        self._length = 0
+        self._layouts: List[Dict[str, bool]] = []     # ключ → виведений (не зберігається)
+        self._layout_codes: Dict[tuple, int] = {}
+        self._row_layout = array("I")
+        self._numeric: Dict[str, array] = {}
+        self._codes: Dict[str, array] = {}
+        self._values: List = [None]
+        # Окремий словник на тип: інакше 1, 1.0 і True злиплися б в одне значення
+        self._value_codes: Dict[type, Dict] = {type(None): {None: 0}, str: {}, int: {}, float: {}, bool: {}}
+        self._overflow: Dict[Tuple[int, str], object] = {}
+
+    def __len__(self) -> int:
+        return self._length
+
+    def append(self, payload: Dict) -> int:
+        index = self._length
+        layout: Dict[str, bool] = {}
+        for key, value in payload.items():
+            if key == "deck_color" and value == self.deck_color:
+                layout[key] = True
+            elif key == "prompt" and value == format_card_prompt(self.prompts, payload):
+                layout[key] = True
+            else:
+                layout[key] = False
+                self._store(index, key, value)
+
+        # Колонки, яких у цій картці немає, вирівнюємо заглушкою
+        for key, column in self._numeric.items():
+            if len(column) == index:
+                column.append(_NUMERIC_MISSING)
+        for key, column in self._codes.items():
+            if len(column) == index:
+                column.append(0)
+
+        layout_key = tuple(layout.items())
+        code = self._layout_codes.get(layout_key)
+        if code is None:
+            code = self._layout_codes[layout_key] = len(self._layouts)
+            self._layouts.append(layout)
+        self._row_layout.append(code)
+        self._length += 1
+        return index
+
+    def _store(self, index: int, key: str, value):
+        if key in NUMERIC_FIELDS:
+            column = self._numeric.get(key)
+            if column is None:
+                column = self._numeric[key] = array("h", [_NUMERIC_MISSING]) * index
+            if type(value) is int and _NUMERIC_MISSING < value <= 32767:
+                column.append(value)
+            else:
+                column.append(_NUMERIC_MISSING)
+                self._overflow[(index, key)] = value
+            return
+
+        column = self._codes.get(key)
+        if column is None:
+            column = self._codes[key] = array("I", [0]) * index
+        codes = self._value_codes.get(type(value))
+        if codes is not None:
+            code = codes.get(value)
+            if code is None:
+                if type(value) is str:
+                    value = sys.intern(value)
+                code = codes[value] = len(self._values)
+                self._values.append(value)
+            column.append(code)
+        else:
+            column.append(_OVERFLOW)
+            self._overflow[(index, key)] = value
+
+    def _value(self, index: int, key: str, derived: bool):
+        if derived:
+            if key == "deck_color":
+                return self.deck_color
+            return format_card_prompt(self.prompts, _RowView(self, index))
+        numeric = self._numeric.get(key)
+        if numeric is not None:
+            value = numeric[index]
+            return self._overflow[(index, key)] if value == _NUMERIC_MISSING else value
+        code = self._codes[key][index]
+        return self._overflow[(index, key)] if code == _OVERFLOW else self._values[code]
+
+    def get(self, index: int, key: str, default=None):
+        derived = self._layouts[self._row_layout[index]].get(key, _ABSENT)
+        if derived is _ABSENT:
+            return default
+        return self._value(index, key, derived)
+
+    def row(self, index: int) -> Dict:
+        """A fresh payload dict for the card; edits to it are not written back."""
+        layout = self._layouts[self._row_layout[index]]
+        return {key: self._value(index, key, derived) for key, derived in layout.items()}
+
+
+class _RowView:
+    """Minimal dict-like row accessor for format_card_prompt."""
+
+    __slots__ = ("columns", "index")
+
+    def __init__(self, columns: DeckColumns, index: int):
+        self.columns = columns
+        self.index = index
+
+    def get(self, key, default=None):
+        return self.columns.get(self.index, key, default)
+
+    def __getitem__(self, key):
+        value = self.columns.get(self.index, key, _ABSENT)
+        if value is _ABSENT:
+            raise KeyError(key)
+        return value
+
+
 class CardModel:
-    index: int
-    payload: Dict
+    """
+    One card: either a plain payload dict or a view over a DeckColumns row.
+
+    Column-backed cards build ``payload`` on each access, so code that
+    needs to edit a card should work on a copy and not expect it to stick.
+    """
+
+    __slots__ = ("index", "_payload", "_columns")
+
+    def __init__(self, index: int, payload: Optional[Dict] = None, columns: Optional[DeckColumns] = None):
+        self.index = index
+        self._payload = payload if payload is not None or columns is not None else {}
+        self._columns = columns
+
+    @property
+    def payload(self) -> Dict:
+        if self._payload is not None:
+            return self._payload
+        return self._columns.row(self.index)
+
+    @payload.setter
+    def payload(self, value: Dict):
+        self._payload = value
+        self._columns = None
 
     @property
     def name(self) -> str:
-        return self.payload.get("name", f"Card {self.index + 1}")
+        return self.get("name", f"Card {self.index + 1}")
 
     def get(self, key: str, default=None):
-        return self.payload.get(key, default)
+        if self._payload is not None:
+            return self._payload.get(key, default)
+        return self._columns.get(self.index, key, default)
 
     def __getitem__(self, item):
-        return self.payload[item]
+        if self._payload is not None:
+            return self._payload[item]
+        value = self._columns.get(self.index, item, _ABSENT)
+        if value is _ABSENT:
+            raise KeyError(item)
+        return value
+
+    def __eq__(self, other):
+        if not isinstance(other, CardModel):
+            return NotImplemented
+        return self.index == other.index and self.payload == other.payload
+
+    def __repr__(self) -> str:
+        return f"CardModel(index={self.index!r}, payload={self.payload!r})"
+
+
+class ColumnCards(Sequence):
+    """Read-only list of CardModel views over a DeckColumns; views are created on access."""
+
+    def __init__(self, columns: DeckColumns):
+        self.columns = columns
+
+    def __len__(self) -> int:
+        return len(self.columns)
+
+    def __getitem__(self, item):
+        if isinstance(item, slice):
+            return [CardModel(i, columns=self.columns) for i in range(*item.indices(len(self.columns)))]
+        if item < 0:
+            item += len(self.columns)
+        if not 0 <= item < len(self.columns):
+            raise IndexError("card index out of range")
+        return CardModel(item, columns=self.columns)
 
 
 @dataclass
@@ -41,6 +247,20 @@ class DeckModel:
     cards: List[CardModel] = field(default_factory=list)
     prompts: Dict = field(default_factory=dict)
     metadata: Dict = field(default_factory=dict)
+    # Заповнено, коли колода завантажена в колонки (cards тоді — ColumnCards)
+    columns: Optional[DeckColumns] = None
+
+    @classmethod
+    def from_columns(cls, name: str, path: str, columns: DeckColumns, metadata: Optional[Dict] = None) -> "DeckModel":
+        return cls(
+            name=name,
+            path=path,
+            deck_color=columns.deck_color,
+            cards=ColumnCards(columns),
+            prompts=columns.prompts,
+            metadata=metadata or {},
+            columns=columns,
+        )
 
     def card_at(self, index: int) -> Optional[CardModel]:
         if 0 <= index < len(self.cards):
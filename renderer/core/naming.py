@@ -0,0 +1,61 @@
+"""Qt-free helpers for naming exported card files."""
+
+from __future__ import annotations
+
+import os
+import re
+from typing import Optional, Set
+
+
+WINDOWS_FORBIDDEN = set('<>:"/\\|?*')
+
+
+def slugify_card_name(name: str) -> str:
+    """Return a filesystem-safe slug for the given card name."""
+
+    if not name:
+        return "card"
+
+    slug = "".join("_" if ch in WINDOWS_FORBIDDEN else ch for ch in name)
+    slug = re.sub(r"[^A-Za-z0-9._-]+", "_", slug)
+    slug = re.sub(r"_+", "_", slug).strip("._- ")
+    return slug.lower() or "card"
+
+
+def card_suffix(card, position: int) -> str:
+    """Return the zero-padded ordinal used in exported file names."""
+
+    index = getattr(card, "index", None)
+    if isinstance(index, int):
+        return f"{index + 1:03d}"
+    return f"{position + 1:03d}"
+
+
+def build_unique_path(
+    export_dir: str,
+    safe_name: str,
+    suffix: Optional[str],
+    used_paths: Set[str],
+    ext: str = ".png",
+    avoid_existing: bool = True,
+) -> str:
+    """
+    Return a path inside export_dir that is not used yet and remember it.
+
+    avoid_existing=False ignores files already on disk, so an incremental
+    re-export maps every card back onto the file it wrote last time.
+    """
+
+    stem = safe_name
+    if suffix:
+        stem = f"{safe_name}-{suffix}"
+
+    candidate = stem
+    counter = 1
+    path = os.path.join(export_dir, f"{candidate}{ext}")
+    while path in used_paths or (avoid_existing and os.path.exists(path)):
+        candidate = f"{stem}-{counter}"
+        path = os.path.join(export_dir, f"{candidate}{ext}")
+        counter += 1
+    used_paths.add(path)
+    return path
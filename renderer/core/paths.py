@@ -32,3 +32,24 @@ def ABSOLUTE_PATH(relative_path: str) -> str:
     """
     base = application_base_dir()
     return str(base.joinpath(relative_path))
+
+
+# ─────────────────────────────────────────────
+# PROJECT ROOT RESOLVER
+# ─────────────────────────────────────────────
+
+def project_base_dir() -> Path:
+    """
+    Повертає корінь ls_gen (там, де лежать assets/, ai/, import/).
+    ABSOLUTE_PATH рахує шляхи від renderer/, тому спільні ресурси
+    потрібно шукати рівнем вище.
+    """
+    if hasattr(sys, "_MEIPASS"):
+        return Path(sys.argv[0]).resolve().parent
+
+    return application_base_dir().parent
+
+
+def PROJECT_PATH(relative_path: str) -> str:
+    """Формує абсолютний шлях відносно кореня проєкту."""
+    return str(project_base_dir().joinpath(relative_path))
@@ -1,7 +1,53 @@
 from reportlab.pdfgen import canvas
-from reportlab.lib.pagesizes import letter
-from reportlab.lib.utils import ImageReader
+from reportlab.lib.pagesizes import A3, A4, landscape, letter
+from reportlab.lib.units import mm
+from dataclasses import dataclass, field
+from typing import List, Optional, Sequence, Tuple, Union
+import json
 import os
+import time
+
+from .paths import PROJECT_PATH
+from .render_manifest import file_digest
+
+# ─────────────────────────────────────────────
+# Одне зображення — один XObject
+# ─────────────────────────────────────────────
+# reportlab вже перевикористовує image XObject, якщо drawImage отримує той
+# самий шлях до файлу, але однакові картинки з різними іменами (копії одного
+# юніта, спільний плейсхолдер, сорочка) вбудовує й стискає заново. Тому
+# кожен файл зводимо до першого шляху з таким самим sha256 вмісту.
+
+class ImageDedup:
+    def __init__(self):
+        self.by_digest: dict = {}
+        self.placed = 0
+
+    def resolve(self, path: str) -> str:
+        """Canonical path for the file's content; same content → same XObject."""
+        self.placed += 1
+        return self.by_digest.setdefault(file_digest(path) or path, path)
+
+    @property
+    def unique(self) -> int:
+        return len(self.by_digest)
+
+
+def _pdf_stats(output_path: str, pages: int, dedup: ImageDedup, started: float) -> dict:
+    stats = {
+        "pages": pages,
+        "images_placed": dedup.placed,
+        "images_embedded": dedup.unique,
+        "bytes": os.path.getsize(output_path),
+        "seconds": round(time.perf_counter() - started, 4),
+    }
+    print(
+        f"PDF збережено: {output_path} — {stats['pages']} стор., "
+        f"{stats['images_embedded']}/{stats['images_placed']} унікальних зображень, "
+        f"{stats['bytes'] / 1024:.0f} КБ за {stats['seconds']:.2f} с"
+    )
+    return stats
+
 
 # ─────────────────────────────────────────────
 # ПРАВИЛЬНИЙ PDF EXPORTER ДЛЯ LS_gen
@@ -10,7 +56,8 @@ import os
 def export_pdf_from_list(image_list, output_path):
     """
     Створює PDF з переліку PNG/JPG зображень.
-    Кожне зображення → нова сторінка.
+    Кожне зображення → нова сторінка; однакові за вмістом файли
+    вбудовуються один раз. Повертає розмір файлу, час і кількість зображень.
     Підтримує LS_gen і PyInstaller.
     """
 
@@ -23,8 +70,11 @@ def export_pdf_from_list(image_list, output_path):
         os.makedirs(folder, exist_ok=True)
 
     # PDF документ
+    started = time.perf_counter()
     pdf = canvas.Canvas(output_path, pagesize=letter)
     page_w, page_h = letter
+    dedup = ImageDedup()
+    pages = 0
 
     for img_path in image_list:
         if not os.path.exists(img_path):
@@ -32,14 +82,237 @@ def export_pdf_from_list(image_list, output_path):
             continue
 
         try:
-            img = ImageReader(img_path)
-            pdf.drawImage(img, 0, 0, width=page_w, height=page_h, preserveAspectRatio=True)
+            pdf.drawImage(dedup.resolve(img_path), 0, 0, width=page_w, height=page_h, preserveAspectRatio=True)
             pdf.showPage()
+            pages += 1
         except Exception as e:
             print(f"[PDF ERROR] Помилка {img_path}: {e}")
 
     pdf.save()
-    print(f"PDF збережено: {output_path}")
+    return _pdf_stats(output_path, pages, dedup, started)
+
+
+# ─────────────────────────────────────────────
+# Спуск полос: N карток на аркуш A4/Letter/A3
+# ─────────────────────────────────────────────
+# PNG картки — це формат після обрізки (width_mm × height_mm з template.json).
+# На аркуші кожна картка займає комірку trim + 2×bleed, тож між сусідніми
+# картками лишається запас під різ, а мітки обрізки стоять на полях аркуша
+# навпроти кожної лінії різу. Сам bleed не друкується: PNG малюється рівно
+# в trim, а поле bleed лишається білим (розтягнути картинку на bleed означало
+# б зсунути лінію різу всередину арту). Зображення відкриваються по одному
+# під час малювання, а не всі наперед.
+
+PAPER_SIZES = {"a4": A4, "letter": letter, "a3": A3}
+DEFAULT_TEMPLATE = PROJECT_PATH("renderer/templates/template.json")
+
+CROP_MARK_LENGTH = 4 * mm
+CROP_MARK_GAP = 1.5 * mm     # відступ мітки від краю bleed
+CROP_MARK_WIDTH = 0.25       # pt
+
+
+@dataclass
+class CardGeometry:
+    width_mm: float = 63
+    height_mm: float = 88
+    bleed_mm: float = 3
+
+    @classmethod
+    def from_template(cls, template: Union[dict, str, None] = None) -> "CardGeometry":
+        """Physical card size from a template dict or path (its "card" block)."""
+        if template is None or isinstance(template, str):
+            with open(template or DEFAULT_TEMPLATE, "r", encoding="utf-8") as f:
+                template = json.load(f)
+        card = template.get("card", {})
+        if "width_mm" not in card:
+            # Піксельний template без фізичного розміру — типові 63×88 мм
+            return cls()
+        return cls(card["width_mm"], card.get("height_mm", cls.height_mm), card.get("bleed_mm", 0))
+
+
+@dataclass
+class SheetLayout:
+    page_size: Tuple[float, float]
+    cols: int
+    rows: int
+    trim: Tuple[float, float]                 # розмір картки в pt
+    bleed: float
+    slots: List[Tuple[float, float]] = field(default_factory=list)  # лівий нижній кут trim, рядками згори
+    orientation: str = "portrait"
+
+    @property
+    def per_sheet(self) -> int:
+        return self.cols * self.rows
+
+    def back_slot(self, index: int, flip: str = "long") -> int:
+        """Slot on the back page that lands behind front slot `index` after duplex flip."""
+        row, col = divmod(index, self.cols)
+        # Довгий край книжкового аркуша вертикальний — дзеркалимо стовпці;
+        # в альбомного він горизонтальний — дзеркалимо рядки
+        mirror_rows = (flip == "short") != (self.orientation == "landscape")
+        if mirror_rows:
+            return (self.rows - 1 - row) * self.cols + col
+        return row * self.cols + (self.cols - 1 - col)
+
+
+def plan_sheet(
+    geometry: CardGeometry,
+    paper: str = "a4",
+    orientation: str = "auto",
+    margin_mm: float = 10,
+) -> SheetLayout:
+    """
+    Grid of cards centred on the sheet; orientation="auto" picks whichever
+    of portrait/landscape fits more cards.
+    """
+    if paper.lower() not in PAPER_SIZES:
+        raise ValueError(f"Невідомий формат паперу: {paper} (доступні: {', '.join(PAPER_SIZES)})")
+    portrait = PAPER_SIZES[paper.lower()]
+    candidates = {"portrait": [portrait], "landscape": [landscape(portrait)]}.get(
+        orientation, [portrait, landscape(portrait)]
+    )
+
+    trim_w, trim_h = geometry.width_mm * mm, geometry.height_mm * mm
+    bleed = geometry.bleed_mm * mm
+    slot_w, slot_h = trim_w + 2 * bleed, trim_h + 2 * bleed
+    margin = margin_mm * mm
+
+    best = None
+    for page_w, page_h in candidates:
+        cols = int((page_w - 2 * margin) // slot_w)
+        rows = int((page_h - 2 * margin) // slot_h)
+        if best is None or cols * rows > best[0] * best[1]:
+            best = (cols, rows, (page_w, page_h))
+    cols, rows, (page_w, page_h) = best
+    if cols < 1 or rows < 1:
+        raise ValueError(f"Картка {geometry.width_mm}×{geometry.height_mm} мм не вміщується на {paper}")
+
+    left = (page_w - cols * slot_w) / 2 + bleed
+    top = page_h - (page_h - rows * slot_h) / 2 - bleed
+    slots = [
+        (left + col * slot_w, top - trim_h - row * slot_h)
+        for row in range(rows)
+        for col in range(cols)
+    ]
+    return SheetLayout(
+        (page_w, page_h), cols, rows, (trim_w, trim_h), bleed, slots,
+        "landscape" if page_w > page_h else "portrait",
+    )
+
+
+def crop_mark_lines(layout: SheetLayout) -> List[Tuple[float, float, float, float]]:
+    """Crop mark segments on the sheet margins, opposite every cut line of the grid."""
+    trim_w, trim_h = layout.trim
+    xs = sorted({x for x, _ in layout.slots} | {x + trim_w for x, _ in layout.slots})
+    ys = sorted({y for _, y in layout.slots} | {y + trim_h for _, y in layout.slots})
+    grid_left = xs[0] - layout.bleed - CROP_MARK_GAP
+    grid_right = xs[-1] + layout.bleed + CROP_MARK_GAP
+    grid_bottom = ys[0] - layout.bleed - CROP_MARK_GAP
+    grid_top = ys[-1] + layout.bleed + CROP_MARK_GAP
+
+    lines = []
+    for x in xs:
+        lines.append((x, grid_top, x, grid_top + CROP_MARK_LENGTH))
+        lines.append((x, grid_bottom, x, grid_bottom - CROP_MARK_LENGTH))
+    for y in ys:
+        lines.append((grid_left, y, grid_left - CROP_MARK_LENGTH, y))
+        lines.append((grid_right, y, grid_right + CROP_MARK_LENGTH, y))
+    return lines
+
+
+def _draw_crop_marks(pdf, layout: SheetLayout):
+    pdf.saveState()
+    pdf.setLineWidth(CROP_MARK_WIDTH)
+    pdf.setStrokeColorRGB(0, 0, 0)
+    pdf.lines(crop_mark_lines(layout))
+    pdf.restoreState()
+
+
+def check_backs(image_list: Sequence[str], back: Union[str, Sequence[str], None]):
+    """A list of backs must have one entry per card image."""
+    if back is None or isinstance(back, str):
+        return
+    if len(back) != len(image_list):
+        raise ValueError(f"Сорочок {len(back)}, а карток {len(image_list)} — потрібна одна сорочка на картку")
+
+
+def export_pdf_imposed(
+    image_list: Sequence[str],
+    output_path: str,
+    geometry: Optional[CardGeometry] = None,
+    paper: str = "a4",
+    orientation: str = "auto",
+    crop_marks: bool = True,
+    back: Union[str, Sequence[str], None] = None,
+    flip: str = "long",
+    margin_mm: float = 10,
+) -> dict:
+    """
+    Lay cards out N-up on print sheets with crop marks.
+
+    back — одна сорочка для всіх карток або список (по одній на картку): після
+    кожного аркуша лицьових сторін іде аркуш зворотів, віддзеркалений під
+    двосторонній друк з перегортанням по довгому (flip="long") чи короткому краю
+    з урахуванням орієнтації аркуша. PNG малюються в розмір trim, bleed не друкується.
+    Повертає короткий підсумок: аркуші, сторінки, карток на аркуш.
+    """
+    geometry = geometry or CardGeometry.from_template()
+    layout = plan_sheet(geometry, paper, orientation, margin_mm)
+    check_backs(image_list, back)
+
+    images = []
+    backs = []
+    for index, img_path in enumerate(image_list):
+        if not os.path.exists(img_path):
+            print(f"[PDF WARNING] Файл не існує і буде пропущено: {img_path}")
+            continue
+        images.append(img_path)
+        if back is not None:
+            backs.append(back if isinstance(back, str) else back[index])
+    if not images:
+        raise ValueError("Список зображень порожній — нема що експортувати.")
+
+    folder = os.path.dirname(output_path)
+    if folder:
+        os.makedirs(folder, exist_ok=True)
+
+    started = time.perf_counter()
+    pdf = canvas.Canvas(output_path, pagesize=layout.page_size)
+    trim_w, trim_h = layout.trim
+    dedup = ImageDedup()
+    sheets = 0
+    for start in range(0, len(images), layout.per_sheet):
+        sheet = images[start:start + layout.per_sheet]
+        for slot, img_path in enumerate(sheet):
+            x, y = layout.slots[slot]
+            try:
+                pdf.drawImage(dedup.resolve(img_path), x, y, width=trim_w, height=trim_h)
+            except Exception as e:
+                print(f"[PDF ERROR] Помилка {img_path}: {e}")
+        if crop_marks:
+            _draw_crop_marks(pdf, layout)
+        pdf.showPage()
+        sheets += 1
+
+        if backs:
+            for slot, back_path in enumerate(backs[start:start + layout.per_sheet]):
+                x, y = layout.slots[layout.back_slot(slot, flip)]
+                try:
+                    pdf.drawImage(dedup.resolve(back_path), x, y, width=trim_w, height=trim_h)
+                except Exception as e:
+                    print(f"[PDF ERROR] Помилка {back_path}: {e}")
+            pdf.showPage()
+
+    pdf.save()
+    return {
+        **_pdf_stats(output_path, sheets * (2 if backs else 1), dedup, started),
+        "sheets": sheets,
+        "per_sheet": layout.per_sheet,
+        "grid": [layout.cols, layout.rows],
+        "paper": paper.lower(),
+        "orientation": layout.orientation,
+        "page_size_mm": [round(v / mm, 1) for v in layout.page_size],
+    }
 
 
 # ─────────────────────────────────────────────
@@ -0,0 +1,298 @@
+"""Streaming PDF export: images pre-encoded in a process pool, PDF objects written as they arrive."""
+
+from __future__ import annotations
+
+import io
+import os
+import time
+import zlib
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Tuple, Union
+
+from PIL import Image
+
+from .pdf_exporter import CROP_MARK_WIDTH, ImageDedup, SheetLayout, _pdf_stats, check_backs, crop_mark_lines, letter
+
+# reportlab тримає весь документ у пам'яті до save() і стискає кожен PNG на
+# потоці, що викликав експорт. Тут кожне унікальне зображення кодується у
+# воркері (JPEG або Flate), а PDF-об'єкти пишуться у файл одразу, у порядку
+# сторінок. Пам'ять обмежена вікном закодованих зображень "у польоті",
+# у пам'яті лишаються тільки зсуви об'єктів для xref.
+
+ENCODINGS = ("flate", "jpeg")
+
+# (шлях, x, y, ширина, висота) у pt
+Placement = Tuple[str, float, float, float, float]
+
+
+@dataclass
+class EncodedImage:
+    path: str
+    width: int
+    height: int
+    filter: str
+    data: bytes
+
+
+def encode_image(path: str, encoding: str = "flate", quality: int = 90) -> EncodedImage:
+    """RGB image stream for a PDF XObject; alpha is dropped, as reportlab's drawImage does without a mask."""
+    with Image.open(path) as im:
+        rgb = im.convert("RGB")
+    if encoding == "jpeg":
+        buf = io.BytesIO()
+        rgb.save(buf, "JPEG", quality=quality)
+        return EncodedImage(path, rgb.width, rgb.height, "DCTDecode", buf.getvalue())
+    return EncodedImage(path, rgb.width, rgb.height, "FlateDecode", zlib.compress(rgb.tobytes(), 6))
+
+
+def _encode_job(job: Tuple[str, str, int]) -> Tuple[str, Optional[EncodedImage], str]:
+    path, encoding, quality = job
+    try:
+        return path, encode_image(path, encoding, quality), ""
+    except Exception as exc:
+        return path, None, str(exc)
+
+
+def iter_encoded(
+    paths: Iterable[str],
+    encoding: str = "flate",
+    quality: int = 90,
+    workers: Optional[int] = None,
+    window: Optional[int] = None,
+) -> Iterator[Tuple[str, Optional[EncodedImage], str]]:
+    """Encode images in a process pool; yields (path, image or None, error) in input order."""
+    jobs = ((path, encoding, quality) for path in paths)
+    workers = workers or os.cpu_count() or 1
+    if workers <= 1:
+        for job in jobs:
+            yield _encode_job(job)
+        return
+
+    window = window or workers * 4
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        in_flight: deque = deque()
+        for job in jobs:
+            in_flight.append(pool.submit(_encode_job, job))
+            if len(in_flight) >= window:
+                yield in_flight.popleft().result()
+        while in_flight:
+            yield in_flight.popleft().result()
+
+
+def _num(value: float) -> str:
+    return f"{value:.3f}".rstrip("0").rstrip(".")
+
+
+class StreamingPdfWriter:
+    """Minimal PDF 1.4 writer: objects go straight to disk, the catalog and xref are written on close()."""
+
+    CATALOG_ID = 1
+    PAGES_ID = 2
+
+    def __init__(self, path: str):
+        self.path = path
+        self._tmp = path + ".tmp"
+        self.fh = open(self._tmp, "wb")
+        self.fh.write(b"%PDF-1.4\n%\xe2\xe3\xcf\xd3\n")
+        self.offsets: Dict[int, int] = {}
+        self.page_ids: List[int] = []
+        self._next_id = 3
+
+    def _alloc(self) -> int:
+        obj_id = self._next_id
+        self._next_id += 1
+        return obj_id
+
+    def _write_object(self, obj_id: int, body: bytes, stream: Optional[bytes] = None):
+        self.offsets[obj_id] = self.fh.tell()
+        self.fh.write(f"{obj_id} 0 obj\n".encode("ascii"))
+        self.fh.write(body)
+        if stream is not None:
+            self.fh.write(b"\nstream\n")
+            self.fh.write(stream)
+            self.fh.write(b"\nendstream")
+        self.fh.write(b"\nendobj\n")
+
+    def add_image(self, image: EncodedImage) -> int:
+        obj_id = self._alloc()
+        header = (
+            f"<< /Type /XObject /Subtype /Image /Width {image.width} /Height {image.height} "
+            f"/ColorSpace /DeviceRGB /BitsPerComponent 8 /Filter /{image.filter} /Length {len(image.data)} >>"
+        )
+        self._write_object(obj_id, header.encode("ascii"), image.data)
+        return obj_id
+
+    def add_page(self, page_size: Tuple[float, float], content: str, images: Dict[str, int]):
+        content_id = self._alloc()
+        data = zlib.compress(content.encode("ascii"))
+        self._write_object(content_id, f"<< /Length {len(data)} /Filter /FlateDecode >>".encode("ascii"), data)
+
+        page_id = self._alloc()
+        xobjects = " ".join(f"/{name} {obj_id} 0 R" for name, obj_id in images.items())
+        body = (
+            f"<< /Type /Page /Parent {self.PAGES_ID} 0 R "
+            f"/MediaBox [0 0 {_num(page_size[0])} {_num(page_size[1])}] "
+            f"/Resources << /XObject << {xobjects} >> /ProcSet [/PDF /ImageC] >> "
+            f"/Contents {content_id} 0 R >>"
+        )
+        self._write_object(page_id, body.encode("ascii"))
+        self.page_ids.append(page_id)
+
+    def close(self):
+        kids = " ".join(f"{page_id} 0 R" for page_id in self.page_ids)
+        self._write_object(
+            self.PAGES_ID, f"<< /Type /Pages /Kids [{kids}] /Count {len(self.page_ids)} >>".encode("ascii")
+        )
+        self._write_object(self.CATALOG_ID, f"<< /Type /Catalog /Pages {self.PAGES_ID} 0 R >>".encode("ascii"))
+
+        xref_offset = self.fh.tell()
+        size = self._next_id
+        self.fh.write(f"xref\n0 {size}\n0000000000 65535 f \n".encode("ascii"))
+        for obj_id in range(1, size):
+            self.fh.write(f"{self.offsets[obj_id]:010d} 00000 n \n".encode("ascii"))
+        self.fh.write(
+            f"trailer\n<< /Size {size} /Root {self.CATALOG_ID} 0 R >>\nstartxref\n{xref_offset}\n%%EOF\n".encode("ascii")
+        )
+        self.fh.close()
+        os.replace(self._tmp, self.path)
+
+    def abort(self):
+        self.fh.close()
+        try:
+            os.remove(self._tmp)
+        except OSError:
+            pass
+
+
+def _fit(page_size: Tuple[float, float], path: str) -> Tuple[float, float, float, float]:
+    """Image box scaled to the page with its aspect ratio kept, centred (reportlab preserveAspectRatio)."""
+    with Image.open(path) as im:
+        img_w, img_h = im.size
+    page_w, page_h = page_size
+    scale = min(page_w / img_w, page_h / img_h)
+    w, h = img_w * scale, img_h * scale
+    return (page_w - w) / 2, (page_h - h) / 2, w, h
+
+
+def plan_pages(
+    images: Sequence[str],
+    layout: Optional[SheetLayout] = None,
+    backs: Sequence[str] = (),
+    flip: str = "long",
+) -> Iterator[Tuple[Tuple[float, float], List[Placement], bool]]:
+    """(page size, placements, draw crop marks) for every page, in order."""
+    if layout is None:
+        for path in images:
+            try:
+                box = _fit(letter, path)
+            except Exception as e:
+                print(f"[PDF ERROR] Помилка {path}: {e}")
+                continue
+            yield letter, [(path, *box)], False
+        return
+    trim_w, trim_h = layout.trim
+    for start in range(0, len(images), layout.per_sheet):
+        front = [
+            (path, *layout.slots[slot], trim_w, trim_h)
+            for slot, path in enumerate(images[start:start + layout.per_sheet])
+        ]
+        yield layout.page_size, front, True
+        if backs:
+            back = [
+                (path, *layout.slots[layout.back_slot(slot, flip)], trim_w, trim_h)
+                for slot, path in enumerate(backs[start:start + layout.per_sheet])
+            ]
+            yield layout.page_size, back, False
+
+
+def export_pdf_stream(
+    image_list: Sequence[str],
+    output_path: str,
+    layout: Optional[SheetLayout] = None,
+    encoding: str = "flate",
+    quality: int = 90,
+    workers: Optional[int] = None,
+    back: Union[str, Sequence[str], None] = None,
+    flip: str = "long",
+    crop_marks: bool = True,
+    window: Optional[int] = None,
+) -> dict:
+    """
+    Write a PDF with the streaming writer.
+
+    layout=None puts one card per Letter page like export_pdf_from_list; a
+    SheetLayout from plan_sheet() gives the N-up sheets of export_pdf_imposed.
+    Identical files are encoded and embedded once.
+    """
+    if encoding not in ENCODINGS:
+        raise ValueError(f"Невідоме кодування зображень: {encoding} (доступні: {', '.join(ENCODINGS)})")
+    check_backs(image_list, back)
+
+    images: List[str] = []
+    backs: List[str] = []
+    for index, img_path in enumerate(image_list):
+        if not os.path.exists(img_path):
+            print(f"[PDF WARNING] Файл не існує і буде пропущено: {img_path}")
+            continue
+        images.append(img_path)
+        if back is not None:
+            backs.append(back if isinstance(back, str) else back[index])
+    if not images:
+        raise ValueError("Список зображень порожній — нема що експортувати.")
+
+    folder = os.path.dirname(output_path)
+    if folder:
+        os.makedirs(folder, exist_ok=True)
+
+    started = time.perf_counter()
+    dedup = ImageDedup()
+    pages = [
+        (size, [(dedup.resolve(path), *box) for path, *box in placements], marks)
+        for size, placements, marks in plan_pages(images, layout, backs, flip)
+    ]
+    # Унікальні файли в порядку першої появи — у тому ж порядку їх і споживаємо
+    unique = list(dict.fromkeys(placement[0] for _, placements, _ in pages for placement in placements))
+    encoded = iter_encoded(unique, encoding, quality, workers, window)
+
+    writer = StreamingPdfWriter(output_path)
+    try:
+        object_ids: Dict[str, Optional[int]] = {}
+        for size, placements, marks in pages:
+            commands: List[str] = []
+            resources: Dict[str, int] = {}
+            for path, x, y, w, h in placements:
+                if path not in object_ids:
+                    done_path, image, error = next(encoded)
+                    if image is None:
+                        print(f"[PDF ERROR] Помилка {done_path}: {error}")
+                        object_ids[path] = None
+                    else:
+                        object_ids[path] = writer.add_image(image)
+                obj_id = object_ids[path]
+                if obj_id is None:
+                    continue
+                name = f"Im{obj_id}"
+                resources[name] = obj_id
+                commands.append(f"q {_num(w)} 0 0 {_num(h)} {_num(x)} {_num(y)} cm /{name} Do Q")
+            if layout is None and not resources:
+                # Як export_pdf_from_list: картка, що не відкрилась, не дає порожньої сторінки
+                continue
+            if marks and crop_marks and layout is not None:
+                commands.append(f"q {_num(CROP_MARK_WIDTH)} w 0 G")
+                commands.extend(
+                    f"{_num(x1)} {_num(y1)} m {_num(x2)} {_num(y2)} l S" for x1, y1, x2, y2 in crop_mark_lines(layout)
+                )
+                commands.append("Q")
+            writer.add_page(size, "\n".join(commands), resources)
+        encoded.close()
+        writer.close()
+    except BaseException:
+        writer.abort()
+        encoded.close()
+        raise
+
+    stats = _pdf_stats(output_path, len(writer.page_ids), dedup, started)
+    stats.update({"encoding": encoding, "workers": workers or os.cpu_count() or 1})
+    return stats
@@ -0,0 +1,264 @@
+"""Content-hash manifest that lets deck exports re-render only changed cards."""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import unicodedata
+from typing import Callable, Dict, Iterable, List, Optional
+
+# Маніфест лежить поруч із текою експорту: export/95 → export/95.manifest.json.
+# Для кожної картки зберігається хеш payload'а, шаблону, вмісту арту та версій
+# ассетів і ім'я її PNG. Ключ — стабільна ідентичність картки (нормалізована
+# назва + номер входження), а не ім'я файлу: у ньому є порядковий суфікс, тож
+# вставка рядка посеред колоди зсуває імена всіх наступних карток. Такі файли
+# перейменовуються, а не рендеряться заново. Незмінений хеш + наявний файл = пропуск.
+
+MANIFEST_VERSION = 2
+
+_file_digests: Dict[tuple, str] = {}
+
+
+def manifest_path(out_dir: str) -> str:
+    return os.path.normpath(out_dir) + ".manifest.json"
+
+
+def content_digest(payload) -> str:
+    """sha256 of a JSON-serializable value (templates, layouts, payloads)."""
+    text = json.dumps(payload, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def file_digest(path: Optional[str]) -> Optional[str]:
+    """sha256 of the file contents, memoized per (path, size, mtime); None if missing."""
+    if not path:
+        return None
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    key = (os.path.abspath(path), st.st_size, st.st_mtime_ns)
+    digest = _file_digests.get(key)
+    if digest is None:
+        h = hashlib.sha256()
+        with open(path, "rb") as fh:
+            for chunk in iter(lambda: fh.read(1 << 20), b""):
+                h.update(chunk)
+        digest = _file_digests[key] = h.hexdigest()
+    return digest
+
+
+def asset_versions(paths: Iterable[str]) -> str:
+    """Cheap version stamp of shared assets (fonts, frames, icons): path, size and mtime."""
+    stamp = []
+    for root in sorted(set(p for p in paths if p)):
+        files = [root]
+        if os.path.isdir(root):
+            files = sorted(
+                os.path.join(dirpath, name)
+                for dirpath, _, names in os.walk(root)
+                for name in names
+            )
+        for path in files:
+            try:
+                st = os.stat(path)
+            except OSError:
+                stamp.append((path, None))
+                continue
+            stamp.append((path, st.st_size, st.st_mtime_ns))
+    return content_digest(stamp)
+
+
+def card_digest(payload: Dict, *, template: str, assets: str, deck_color: str = "", art_path: Optional[str] = None) -> str:
+    return content_digest(
+        {
+            "v": MANIFEST_VERSION,
+            "payload": payload,
+            "deck_color": deck_color,
+            "template": template,
+            "assets": assets,
+            "art": file_digest(art_path),
+        }
+    )
+
+
+def layout_assets(layout: Dict, frame_path: Optional[str] = None) -> str:
+    """Asset version stamp for a CardSceneView layout: item assets plus the frame."""
+    items = layout.get("items", {}).values()
+    return asset_versions([cfg.get("asset") for cfg in items] + [frame_path])
+
+
+def scene_digest_for(layout: Dict, deck_color: str, frame_path: Optional[str] = None):
+    """Per-card hash function for scene exports (SceneExporter / SceneCardRenderer)."""
+    template = content_digest(layout)
+    assets = layout_assets(layout, frame_path)
+    return lambda payload: card_digest(
+        payload, template=template, assets=assets, deck_color=deck_color, art_path=payload.get("art_path")
+    )
+
+
+def card_name(data: Dict) -> str:
+    """Card name from a render job's data: scene payloads use "name", CardRenderer data "title"."""
+    return str(data.get("name") or data.get("title") or "")
+
+
+def card_identity(name: str, seen: Dict[str, int]) -> str:
+    """Stable manifest key: normalized name plus its occurrence number within the deck."""
+    base = unicodedata.normalize("NFC", name).strip().casefold()
+    occurrence = seen.get(base, 0)
+    seen[base] = occurrence + 1
+    return f"{base}#{occurrence}"
+
+
+def select_stale(
+    manifest: "RenderManifest",
+    jobs: List[tuple],
+    digest_for: Callable[[Dict], str],
+    name_for: Callable[[Dict], str] = card_name,
+):
+    """
+    Split (index, data, out_path) jobs into those that must be rendered.
+
+    Returns (stale_jobs, {out_path: digest}). Unchanged cards whose file name
+    shifted are renamed in place; PNGs of cards that left the deck are removed.
+    """
+    digests: Dict[str, str] = {}
+    identities: Dict[str, str] = {}
+    seen: Dict[str, int] = {}
+    for _, data, out_path in jobs:
+        digests[out_path] = digest_for(data)
+        identities[out_path] = card_identity(name_for(data), seen)
+    manifest.relocate(identities, digests)
+    stale = [job for job in jobs if not manifest.is_fresh(job[2], digests[job[2]])]
+    return stale, digests
+
+
+class IncrementalRun:
+    """
+    One export pass over planned (index, data, out_path) jobs.
+
+    With a manifest, `stale` holds only the cards whose hash changed (see
+    select_stale), record() notes each rendered card and leaving the `with`
+    block saves the manifest. Without one every job is stale and record/save
+    do nothing, so exporters use one code path for both modes.
+    """
+
+    def __init__(
+        self,
+        manifest: Optional["RenderManifest"],
+        jobs: List[tuple],
+        digest_factory: Callable[[], Callable[[Dict], str]],
+    ):
+        self.manifest = manifest
+        self.digests: Dict[str, str] = {}
+        if manifest is None:
+            self.stale = list(jobs)
+        else:
+            # Фабрика, бо хеш-функції потрібен layout/шаблон — без маніфесту його не читаємо
+            self.stale, self.digests = select_stale(manifest, jobs, digest_factory())
+        self._stale_paths = {job[2] for job in self.stale}
+
+    def needs_render(self, out_path: str) -> bool:
+        return out_path in self._stale_paths
+
+    def record(self, out_path: str):
+        if self.manifest is not None:
+            self.manifest.record(out_path, self.digests[out_path])
+
+    def __enter__(self) -> "IncrementalRun":
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if self.manifest is not None:
+            self.manifest.save()
+        return False
+
+
+class RenderManifest:
+    def __init__(self, out_dir: str):
+        self.out_dir = out_dir
+        self.path = manifest_path(out_dir)
+        # ідентичність картки → {"file": ім'я PNG, "digest": хеш}
+        self.entries: Dict[str, Dict[str, str]] = {}
+        self.skipped = 0
+        self.renamed = 0
+        self.removed: List[str] = []
+        self._identities: Dict[str, str] = {}
+        try:
+            with open(self.path, "r", encoding="utf-8") as fh:
+                data = json.load(fh)
+            if data.get("version") == MANIFEST_VERSION:
+                self.entries = dict(data.get("cards", {}))
+        except (OSError, ValueError):
+            self.entries = {}
+
+    def key_for(self, out_path: str) -> str:
+        """Card identity bound to out_path by relocate(); the file name for unbound paths."""
+        return self._identities.get(out_path, os.path.basename(out_path))
+
+    def relocate(self, identities: Dict[str, str], digests: Dict[str, str]):
+        """
+        Bind out_path → identity for this run and move files to their new names.
+
+        Cards with an unchanged hash keep their PNG under the new name; files
+        of cards that left the deck are deleted. Moves go through temporary
+        names, so two cards swapping names never overwrite each other.
+        """
+        self._identities = dict(identities)
+        wanted = {identity: path for path, identity in identities.items()}
+        moves = []
+        for identity in sorted(self.entries):
+            entry = self.entries[identity]
+            new_path = wanted.get(identity)
+            target = os.path.basename(new_path) if new_path else None
+            if target == entry["file"]:
+                continue
+            old_path = os.path.join(self.out_dir, entry["file"])
+            if target is None:
+                try:
+                    os.remove(old_path)
+                    self.removed.append(old_path)
+                except FileNotFoundError:
+                    pass
+                del self.entries[identity]
+                continue
+            if entry["digest"] != digests[new_path] or not os.path.exists(old_path):
+                # Картку все одно рендеримо заново — старий файл лише прибираємо
+                try:
+                    os.remove(old_path)
+                except FileNotFoundError:
+                    pass
+                del self.entries[identity]
+                continue
+            tmp_path = old_path + ".move"
+            os.replace(old_path, tmp_path)
+            moves.append((identity, tmp_path, new_path))
+        for identity, tmp_path, new_path in moves:
+            os.replace(tmp_path, new_path)
+            self.entries[identity]["file"] = os.path.basename(new_path)
+            self.renamed += 1
+
+    def is_fresh(self, out_path: str, digest: str) -> bool:
+        entry = self.entries.get(self.key_for(out_path))
+        fresh = (
+            entry is not None
+            and entry["digest"] == digest
+            and entry["file"] == os.path.basename(out_path)
+            and os.path.exists(out_path)
+        )
+        if fresh:
+            self.skipped += 1
+        return fresh
+
+    def record(self, out_path: str, digest: str):
+        self.entries[self.key_for(out_path)] = {"file": os.path.basename(out_path), "digest": digest}
+
+    def save(self):
+        folder = os.path.dirname(self.path)
+        if folder:
+            os.makedirs(folder, exist_ok=True)
+        tmp = self.path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as fh:
+            json.dump({"version": MANIFEST_VERSION, "cards": self.entries}, fh, ensure_ascii=False, indent=1, sort_keys=True)
+        os.replace(tmp, self.path)
@@ -1,6 +1,7 @@
 from PIL import Image, ImageDraw, ImageFont
 import os
-from renderer.core.paths import ABSOLUTE_PATH
+from renderer.core.asset_cache import get_asset_cache
+from renderer.core.paths import PROJECT_PATH
 
 class CardRenderer:
     """
@@ -13,27 +14,49 @@ class CardRenderer:
     - стати (atk, def, stb)
     - шрифти з assets/fonts
     - іконки з assets/icons
+
+    Рамка, іконки та шрифти беруться зі спільного AssetCache,
+    тож при рендері колоди кожен файл декодується лише раз.
+
+    Template може бути піксельним (canvas_width/canvas_height) або
+    міліметровим, як renderer/templates/template.json (card.width_mm,
+    height_mm) — тоді координати переводяться в px за "dpi" (300).
     """
 
-    def __init__(self, template: dict):
+    # Зони, які в міліметровому template мають інші назви
+    AREA_ALIASES = {"image": "art"}
+
+    def __init__(self, template: dict, asset_cache=None):
         self.template = template
+        self.assets = asset_cache or get_asset_cache()
+
+        if "canvas_width" in template:
+            self.scale = 1.0
+            self.canvas_size = (int(template["canvas_width"]), int(template["canvas_height"]))
+        else:
+            card_cfg = template.get("card", {})
+            self.scale = template.get("dpi", 300) / 25.4
+            self.canvas_size = (
+                round(card_cfg.get("width_mm", 63) * self.scale),
+                round(card_cfg.get("height_mm", 88) * self.scale),
+            )
 
         # Шляхи ресурсів
-        self.fonts_path = ABSOLUTE_PATH("assets/fonts")
-        self.icons_path = ABSOLUTE_PATH("assets/icons")
-        self.frames_path = ABSOLUTE_PATH("assets/frames/frame.png")
+        self.fonts_path = PROJECT_PATH("assets/fonts")
+        self.icons_path = PROJECT_PATH("assets/icons")
+        self.frames_path = PROJECT_PATH("assets/frames/frame.png")
 
         # Завантаження шрифтів
-        self.font_title = ImageFont.truetype(os.path.join(self.fonts_path, "LS_font.ttf"), 48)
-        self.font_desc = ImageFont.truetype(os.path.join(self.fonts_path, "LS_font.ttf"), 32)
-        self.font_stats = ImageFont.truetype(os.path.join(self.fonts_path, "LS_font.ttf"), 40)
+        font_file = os.path.join(self.fonts_path, "LS_font.ttf")
+        self.font_title = self.assets.get_font(font_file, 48)
+        self.font_desc = self.assets.get_font(font_file, 32)
+        self.font_stats = self.assets.get_font(font_file, 40)
 
     # -------------------------------------------------
     # ГОЛОВНИЙ РЕНДЕР-ФУНКЦІОНАЛ
     # -------------------------------------------------
     def render(self, card_data: dict):
-        W = self.template["canvas_width"]
-        H = self.template["canvas_height"]
+        W, H = self.canvas_size
 
         # Створюємо полотно
         card = Image.new("RGBA", (W, H), (0, 0, 0, 0))
@@ -42,9 +65,8 @@ class CardRenderer:
         # -------------------------------------------------
         # 1. ФОН / РАМКА
         # -------------------------------------------------
-        if os.path.exists(self.frames_path):
-            frame = Image.open(self.frames_path).convert("RGBA")
-            frame = frame.resize((W, H))
+        frame = self.assets.get_image(self.frames_path, (W, H))
+        if frame is not None:
             card.alpha_composite(frame, (0, 0))
 
         # -------------------------------------------------
@@ -54,8 +76,9 @@ class CardRenderer:
             art = Image.open(card_data["img"]).convert("RGBA")
 
             x, y, w, h = self._get_area("image")
-            art = art.resize((w, h))
-            card.alpha_composite(art, (x, y))
+            if w and h:
+                art = art.resize((w, h))
+                card.alpha_composite(art, (x, y))
 
         # -------------------------------------------------
         # 3. TITLE
@@ -80,13 +103,13 @@ class CardRenderer:
             "stb": "stb.png"
         }
 
-        for key, icon_file in stats_map.items():
+        for slot, (key, icon_file) in enumerate(stats_map.items()):
             if key in card_data:
-                x, y, w, h = self._get_area(key)
+                x, y, w, h = self._get_area(key) if key in self.template else self._get_stat_slot(slot)
                 icon_path = os.path.join(self.icons_path, icon_file)
 
-                if os.path.exists(icon_path):
-                    icon = Image.open(icon_path).convert("RGBA").resize((w, h))
+                icon = self.assets.get_image(icon_path, (w, h)) if w and h else None
+                if icon is not None:
                     card.alpha_composite(icon, (x, y))
 
                 # малюємо число поверх іконки
@@ -98,7 +121,21 @@ class CardRenderer:
     # ДОПОМІЖНА ФУНКЦІЯ: ЗОНА З LAYOUT
     # -------------------------------------------------
     def _get_area(self, key):
-        area = self.template.get(key, None)
+        area = self.template.get(key) or self.template.get(self.AREA_ALIASES.get(key, ""))
         if not area:
             return (0, 0, 0, 0)
-        return (area["x"], area["y"], area["w"], area["h"])
\ No newline at end of file
+        return tuple(round(area.get(k, 0) * self.scale) for k in ("x", "y", "w", "h"))
+
+    # -------------------------------------------------
+    # Міліметровий template має одну зону "stats" —
+    # розкладаємо atk/def/stb у ряд по третині ширини
+    # -------------------------------------------------
+    def _get_stat_slot(self, slot):
+        stats = self.template.get("stats")
+        if not stats:
+            return (0, 0, 0, 0)
+        x = stats.get("x", 0) * self.scale
+        y = stats.get("y", 0) * self.scale
+        side = stats.get("size", 4) * self.scale
+        step = (self.canvas_size[0] - 2 * x) / 3
+        return (round(x + slot * step), round(y), round(side), round(side))
\ No newline at end of file
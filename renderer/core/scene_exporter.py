@@ -3,29 +3,15 @@
 from __future__ import annotations
 
 import os
-import re
 from typing import Callable, Optional, Set
 
 from PySide6.QtGui import QPixmap
 
-from widgets.card_scene_view import CardSceneView
+from renderer.widgets.card_scene_view import CardSceneView
 
 from .models import DeckModel
-
-
-WINDOWS_FORBIDDEN = set('<>:"/\\|?*')
-
-
-def slugify_card_name(name: str) -> str:
-    """Return a filesystem-safe slug for the given card name."""
-
-    if not name:
-        return "card"
-
-    slug = "".join("_" if ch in WINDOWS_FORBIDDEN else ch for ch in name)
-    slug = re.sub(r"[^A-Za-z0-9._-]+", "_", slug)
-    slug = re.sub(r"_+", "_", slug).strip("._- ")
-    return slug.lower() or "card"
+from .naming import WINDOWS_FORBIDDEN, build_unique_path, card_suffix, slugify_card_name  # noqa: F401
+from .render_manifest import IncrementalRun, RenderManifest, scene_digest_for
 
 
 class SceneExporter:
@@ -38,25 +24,41 @@ class SceneExporter:
         export_dir: str,
         frame_path: Optional[str] = None,
         progress: Optional[Callable[[int, int, str], None]] = None,
+        manifest: Optional[RenderManifest] = None,
     ) -> str:
+        """
+        Export every card of the deck as PNG.
+
+        With a RenderManifest, cards whose content hash is unchanged are not
+        re-rendered and PNGs of cards that left the deck are removed.
+        """
         os.makedirs(export_dir, exist_ok=True)
         if frame_path:
             pixmap = QPixmap(frame_path)
             if not pixmap.isNull():
                 self.scene_view.set_frame_pixmap(pixmap)
         used_paths: Set[str] = set()
+        planned = []
         for idx, card in enumerate(deck.cards):
-            self.scene_view.apply_card_data(card.payload, deck.deck_color)
             safe_name = slugify_card_name(card.name)
-            suffix = None
-            if hasattr(card, "index") and isinstance(card.index, int):
-                suffix = f"{card.index + 1:03d}"
-            else:
-                suffix = f"{idx + 1:03d}"
-            out_path = self._build_unique_path(export_dir, safe_name, suffix, used_paths)
-            self.scene_view.export_to_png(out_path)
-            if progress:
-                progress(idx + 1, len(deck), out_path)
+            suffix = card_suffix(card, idx)
+            out_path = build_unique_path(
+                export_dir, safe_name, suffix, used_paths, avoid_existing=manifest is None
+            )
+            planned.append((idx, card.payload, out_path))
+
+        def digest_factory():
+            self.scene_view.ensure_template_loaded()
+            return scene_digest_for(self.scene_view.layout, deck.deck_color, frame_path)
+
+        with IncrementalRun(manifest, planned, digest_factory) as run:
+            for idx, payload, out_path in planned:
+                if run.needs_render(out_path):
+                    self.scene_view.apply_card_data(payload, deck.deck_color)
+                    self.scene_view.export_to_png(out_path)
+                    run.record(out_path)
+                if progress:
+                    progress(idx + 1, len(deck), out_path)
         return export_dir
 
     # ------------------------------------------------------------------
@@ -67,16 +69,4 @@ class SceneExporter:
         suffix: Optional[str],
         used_paths: Set[str],
     ) -> str:
-        stem = safe_name
-        if suffix:
-            stem = f"{safe_name}-{suffix}"
-
-        candidate = stem
-        counter = 1
-        path = os.path.join(export_dir, f"{candidate}.png")
-        while path in used_paths or os.path.exists(path):
-            candidate = f"{stem}-{counter}"
-            path = os.path.join(export_dir, f"{candidate}.png")
-            counter += 1
-        used_paths.add(path)
-        return path
+        return build_unique_path(export_dir, safe_name, suffix, used_paths)
@@ -0,0 +1,304 @@
+"""Headless QGraphicsScene card renderer: layout JSON → QImage without any view."""
+
+from __future__ import annotations
+
+import json
+import os
+from typing import Callable, Dict, Optional, Set, Tuple
+
+from PySide6.QtCore import QRectF, QSizeF, Qt
+from PySide6.QtGui import QColor, QFont, QImage, QPainter, QPen, QPixmap
+from PySide6.QtWidgets import (
+    QApplication,
+    QGraphicsDropShadowEffect,
+    QGraphicsItem,
+    QGraphicsPixmapItem,
+    QGraphicsRectItem,
+    QGraphicsScene,
+    QGraphicsTextItem,
+)
+
+from .models import DeckModel
+from .naming import build_unique_path, card_suffix, slugify_card_name
+from .render_manifest import IncrementalRun, RenderManifest, scene_digest_for
+
+STAT_KEYS = ("atk", "def", "stb", "init", "rng", "move")
+ART_ITEM_ID = "artwork"
+
+
+def ensure_offscreen_app() -> QApplication:
+    """Return the running QApplication or start one on the offscreen platform."""
+    app = QApplication.instance()
+    if app is None:
+        # Без дисплея: offscreen, якщо платформу не задано явно
+        os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+        app = QApplication([])
+    return app
+
+
+def card_text_fields(card: dict) -> Dict[str, str]:
+    """Map a card payload onto the text item ids used by the scene layouts."""
+    fields = {
+        "title": card.get("name", ""),
+        "type": card.get("type", "").upper(),
+        "description": card.get("description") or card.get("text") or card.get("effect", ""),
+    }
+    for key in STAT_KEYS:
+        fields[f"stat_{key}"] = f"{key.upper()} {card.get(key, '-')}"
+    cost = card.get("cost")
+    if cost is not None:
+        fields["cost"] = str(cost)
+    cost_type = card.get("cost_type")
+    if cost_type:
+        fields["cost_type"] = cost_type
+    return fields
+
+
+def scene_item_kind(cfg: dict) -> Optional[str]:
+    """"text", "pixmap" or "rect" for a layout item config; None for unknown types."""
+    item_type = cfg.get("type", "text")
+    if item_type == "text":
+        return "text"
+    if item_type in {"image", "pixmap", "icon"}:
+        return "pixmap"
+    if item_type in {"rect", "decor"}:
+        return "rect"
+    return None
+
+
+def fit_pixmap(pixmap: QPixmap, cfg: dict) -> QPixmap:
+    """Scale a pixmap into the item's configured size, keeping its aspect ratio."""
+    size = cfg.get("size")
+    if not size or pixmap.isNull():
+        return pixmap
+    return pixmap.scaled(
+        size.get("w", pixmap.width()),
+        size.get("h", pixmap.height()),
+        Qt.KeepAspectRatio,
+        Qt.SmoothTransformation,
+    )
+
+
+def configure_scene_item(item: QGraphicsItem, cfg: dict):
+    """Apply a layout item config (content, font, pen, pos, z, opacity, shadow) to a scene item."""
+    if isinstance(item, QGraphicsTextItem):
+        item.setPlainText(cfg.get("text", ""))
+        font_cfg = cfg.get("font", {})
+        font = QFont(font_cfg.get("family", "Arial"), font_cfg.get("size", 20))
+        font.setBold(font_cfg.get("bold", False))
+        font.setItalic(font_cfg.get("italic", False))
+        font.setUnderline(font_cfg.get("underline", False))
+        item.setFont(font)
+        item.setDefaultTextColor(QColor(cfg.get("color", "#FFFFFF")))
+        if cfg.get("text_width"):
+            item.setTextWidth(cfg["text_width"])
+        default_z = 5
+    elif isinstance(item, QGraphicsPixmapItem):
+        item.setTransformationMode(Qt.SmoothTransformation)
+        if cfg.get("asset"):
+            item.setPixmap(fit_pixmap(QPixmap(cfg["asset"]), cfg))
+        default_z = 2
+    else:
+        size = cfg.get("size", {})
+        item.setRect(QRectF(0, 0, size.get("w", 100), size.get("h", 100)))
+        pen_cfg = cfg.get("pen", {"color": "#FFFFFF", "width": 1})
+        item.setPen(QPen(QColor(pen_cfg.get("color", "#FFFFFF")), pen_cfg.get("width", 1)))
+        if cfg.get("brush"):
+            item.setBrush(QColor(cfg["brush"].get("color", "#FFFFFF")))
+        default_z = 1
+    pos = cfg.get("pos", {})
+    item.setPos(pos.get("x", 0), pos.get("y", 0))
+    item.setZValue(cfg.get("z", default_z))
+    item.setOpacity(cfg.get("opacity", 1.0))
+    shadow = cfg.get("shadow")
+    if shadow:
+        effect = QGraphicsDropShadowEffect()
+        effect.setColor(QColor(shadow.get("color", "#000000")))
+        offset = shadow.get("offset", [0, 0])
+        effect.setOffset(offset[0], offset[1])
+        effect.setBlurRadius(shadow.get("blur", 0))
+        item.setGraphicsEffect(effect)
+
+
+def build_scene_items(
+    scene: QGraphicsScene,
+    layout: dict,
+    factories: Dict[str, Callable[[str, dict], QGraphicsItem]],
+) -> Dict[str, QGraphicsItem]:
+    """
+    Create, configure and add one scene item per layout entry.
+
+    ``factories`` maps scene_item_kind() to a constructor taking (item_id, cfg):
+    the editor passes its interactive item classes, the headless renderer
+    plain Qt items. Everything read from the layout is applied here, once.
+    """
+    items: Dict[str, QGraphicsItem] = {}
+    for item_id, cfg in layout.get("items", {}).items():
+        factory = factories.get(scene_item_kind(cfg))
+        if factory is None:
+            continue
+        item = factory(item_id, cfg)
+        configure_scene_item(item, cfg)
+        items[item_id] = item
+        scene.addItem(item)
+    return items
+
+
+def relative_pos(cfg: dict, width: float, height: float) -> Optional[Tuple[float, float]]:
+    """Card-size-relative position of an item bound with bindings.relative, else None."""
+    bindings = cfg.get("bindings", {})
+    if not bindings.get("relative"):
+        return None
+    anchor = bindings.get("anchor", {})
+    rel_x = anchor.get("x")
+    rel_y = anchor.get("y")
+    if rel_x is None or rel_y is None:
+        pos = cfg.get("pos", {})
+        rel_x = pos.get("x", 0) / max(1.0, width)
+        rel_y = pos.get("y", 0) / max(1.0, height)
+    return rel_x * width, rel_y * height
+
+
+_PLAIN_ITEMS: Dict[str, Callable[[str, dict], QGraphicsItem]] = {
+    "text": lambda item_id, cfg: QGraphicsTextItem(),
+    "pixmap": lambda item_id, cfg: QGraphicsPixmapItem(),
+    "rect": lambda item_id, cfg: QGraphicsRectItem(),
+}
+
+
+class SceneCardRenderer:
+    """
+    Builds plain scene items from a layout once and re-renders them per card.
+
+    No QGraphicsView is involved: no fit-to-view, no viewport repaints and no
+    interactive item flags, so it runs in worker processes under
+    QT_QPA_PLATFORM=offscreen.
+    """
+
+    def __init__(self, layout_path: str, frame_path: Optional[str] = None):
+        ensure_offscreen_app()
+        self.layout_path = layout_path
+        self.frame_path = frame_path
+        with open(layout_path, "r", encoding="utf-8") as fh:
+            self.layout: Dict = json.load(fh)
+
+        meta = self.layout.get("meta", {})
+        self.card_size = QSizeF(meta.get("width", 744), meta.get("height", 1038))
+        self.dpi = meta.get("dpi", 300)
+
+        self.scene = QGraphicsScene()
+        self.scene.setItemIndexMethod(QGraphicsScene.NoIndex)
+        self.card_rect = QRectF(0, 0, self.card_size.width(), self.card_size.height())
+        self.scene.setSceneRect(self.card_rect)
+
+        self._border_item = QGraphicsRectItem(self.card_rect)
+        self._border_item.setPen(QPen(QColor(240, 240, 240), 2))
+        self._border_item.setBrush(Qt.NoBrush)
+        self._border_item.setZValue(-5)
+        self.scene.addItem(self._border_item)
+
+        self._frame_item = QGraphicsPixmapItem()
+        self._frame_item.setZValue(-2)
+        self._frame_item.setTransformationMode(Qt.SmoothTransformation)
+        self.scene.addItem(self._frame_item)
+        if frame_path:
+            self.set_frame_pixmap(QPixmap(frame_path))
+
+        self._default_art = QPixmap(520, 320)
+        self._default_art.fill(QColor(45, 60, 75))
+        self._placeholder_art: Optional[QPixmap] = None
+
+        self.items = build_scene_items(self.scene, self.layout, _PLAIN_ITEMS)
+        self._apply_relative_positions()
+
+    # ------------------------------------------------------------------
+    def _apply_relative_positions(self):
+        width = self.card_size.width()
+        height = self.card_size.height()
+        for item_id, item in self.items.items():
+            pos = relative_pos(self.layout.get("items", {}).get(item_id, {}), width, height)
+            if pos is not None:
+                item.setPos(*pos)
+
+    # ------------------------------------------------------------------
+    def set_frame_pixmap(self, pixmap: QPixmap):
+        if pixmap.isNull():
+            return
+        self._frame_item.setPixmap(pixmap)
+        self._frame_item.setPos(0, 0)
+
+    def _art_pixmap(self, art_path: Optional[str]) -> QPixmap:
+        cfg = self.layout.get("items", {}).get(ART_ITEM_ID, {})
+        if art_path and os.path.exists(art_path):
+            pixmap = QPixmap(art_path)
+            if not pixmap.isNull():
+                return fit_pixmap(pixmap, cfg)
+        # Заглушку масштабуємо один раз на всю колоду
+        if self._placeholder_art is None:
+            self._placeholder_art = fit_pixmap(self._default_art, cfg)
+        return self._placeholder_art
+
+    def apply_card_data(self, card: dict, deck_color: str):
+        """Mutate the existing items for one card; nothing is rebuilt."""
+        for item_id, text in card_text_fields(card).items():
+            item = self.items.get(item_id)
+            if isinstance(item, QGraphicsTextItem):
+                item.setPlainText(text)
+        art_item = self.items.get(ART_ITEM_ID)
+        if isinstance(art_item, QGraphicsPixmapItem):
+            art_item.setPixmap(self._art_pixmap(card.get("art_path")))
+        color = QColor(deck_color) if QColor.isValidColor(deck_color) else QColor("white")
+        pen = self._border_item.pen()
+        pen.setColor(color)
+        self._border_item.setPen(pen)
+
+    def render_card(self, card: dict, deck_color: str) -> QImage:
+        self.apply_card_data(card, deck_color)
+        width = int(self.card_size.width())
+        height = int(self.card_size.height())
+        image = QImage(width, height, QImage.Format_ARGB32)
+        image.setDotsPerMeterX(int(self.dpi / 25.4 * 1000))
+        image.setDotsPerMeterY(int(self.dpi / 25.4 * 1000))
+        image.fill(Qt.transparent)
+        painter = QPainter(image)
+        painter.setRenderHint(QPainter.Antialiasing, True)
+        painter.setRenderHint(QPainter.SmoothPixmapTransform, True)
+        self.scene.render(painter, QRectF(0, 0, width, height), self.card_rect)
+        painter.end()
+        return image
+
+    def export_card(self, card: dict, deck_color: str, path: str) -> str:
+        if not self.render_card(card, deck_color).save(path, "PNG"):
+            raise OSError(f"Не вдалося зберегти {path}")
+        return path
+
+    # ------------------------------------------------------------------
+    def export_deck(
+        self,
+        deck: DeckModel,
+        export_dir: str,
+        progress: Optional[Callable[[int, int, str], None]] = None,
+        manifest: Optional[RenderManifest] = None,
+    ) -> str:
+        """Same file naming (and manifest handling) as SceneExporter.export_deck."""
+        os.makedirs(export_dir, exist_ok=True)
+        used_paths: Set[str] = set()
+        planned = []
+        for idx, card in enumerate(deck.cards):
+            out_path = build_unique_path(
+                export_dir, slugify_card_name(card.name), card_suffix(card, idx), used_paths,
+                avoid_existing=manifest is None,
+            )
+            planned.append((idx, card.payload, out_path))
+
+        def digest_factory():
+            return scene_digest_for(self.layout, deck.deck_color, self.frame_path)
+
+        with IncrementalRun(manifest, planned, digest_factory) as run:
+            for idx, payload, out_path in planned:
+                if run.needs_render(out_path):
+                    self.export_card(payload, deck.deck_color, out_path)
+                    run.record(out_path)
+                if progress:
+                    progress(idx + 1, len(deck), out_path)
+        return export_dir
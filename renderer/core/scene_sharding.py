@@ -0,0 +1,174 @@
+"""Split a deck across worker processes, each with its own offscreen scene."""
+
+from __future__ import annotations
+
+import json
+import multiprocessing
+import os
+import queue
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import Callable, Dict, Iterator, List, Optional, Set, Tuple
+
+from .models import DeckModel
+from .naming import build_unique_path, card_suffix, slugify_card_name
+from .render_manifest import IncrementalRun, RenderManifest, scene_digest_for
+
+# Тут немає імпорту PySide6: Qt підіймається лише у воркерах (spawn),
+# тож батьківський процес може бути як CLI, так і запущений GUI.
+
+SceneJob = Tuple[int, Dict, str]
+
+
+@dataclass
+class ShardProgress:
+    worker: int
+    path: str
+    done: int             # карток готово по всіх воркерах
+    total: int
+    worker_done: int
+    worker_total: int
+    cards_per_s: float    # швидкість цього воркера від його старту
+
+
+def plan_scene_jobs(deck: DeckModel, out_dir: str, avoid_existing: bool = True) -> List[SceneJob]:
+    """Assign output paths in deck order before sharding, so names never depend on workers."""
+    used_paths: Set[str] = set()
+    jobs: List[SceneJob] = []
+    for idx, card in enumerate(deck.cards):
+        out_path = build_unique_path(
+            out_dir, slugify_card_name(card.name), card_suffix(card, idx), used_paths, avoid_existing=avoid_existing
+        )
+        jobs.append((idx, card.payload, out_path))
+    return jobs
+
+
+def split_shards(jobs: List[SceneJob], workers: int) -> List[List[SceneJob]]:
+    """Contiguous, near-equal slices; the first len(jobs) % workers shards get one extra card."""
+    size, extra = divmod(len(jobs), workers)
+    shards = []
+    start = 0
+    for i in range(workers):
+        end = start + size + (1 if i < extra else 0)
+        if end > start:
+            shards.append(jobs[start:end])
+        start = end
+    return shards
+
+
+def export_shard(
+    worker: int,
+    layout_path: str,
+    frame_path: Optional[str],
+    deck_color: str,
+    jobs: List[SceneJob],
+    events,
+) -> List[Tuple[int, str]]:
+    from .scene_renderer import SceneCardRenderer
+
+    started = time.perf_counter()
+    renderer = SceneCardRenderer(layout_path, frame_path=frame_path)
+    results = []
+    for done, (index, payload, out_path) in enumerate(jobs, start=1):
+        renderer.export_card(payload, deck_color, out_path)
+        results.append((index, out_path))
+        if events is not None:
+            events.put((worker, done, len(jobs), out_path, time.perf_counter() - started))
+    return results
+
+
+def iter_export_sharded(
+    deck: DeckModel,
+    layout_path: str,
+    out_dir: str,
+    workers: Optional[int] = None,
+    frame_path: Optional[str] = None,
+    manifest: Optional[RenderManifest] = None,
+) -> Iterator[ShardProgress]:
+    """
+    Yield one ShardProgress per finished card, merged from all workers.
+
+    workers=None uses every core; workers<=1 renders in the calling process.
+    With a manifest only cards whose hash changed are rendered (and reported).
+    """
+    os.makedirs(out_dir, exist_ok=True)
+    jobs = plan_scene_jobs(deck, out_dir, avoid_existing=manifest is None)
+
+    def digest_factory():
+        with open(layout_path, "r", encoding="utf-8") as fh:
+            layout = json.load(fh)
+        return scene_digest_for(layout, deck.deck_color, frame_path)
+
+    with IncrementalRun(manifest, jobs, digest_factory) as run:
+        for event in _run_shards(deck, layout_path, run.stale, workers, frame_path):
+            run.record(event.path)
+            yield event
+
+
+def _run_shards(
+    deck: DeckModel,
+    layout_path: str,
+    jobs: List[SceneJob],
+    workers: Optional[int],
+    frame_path: Optional[str],
+) -> Iterator[ShardProgress]:
+    if not jobs:
+        return
+    total = len(jobs)
+    workers = max(1, min(workers or os.cpu_count() or 1, total))
+
+    if workers == 1:
+        from .scene_renderer import SceneCardRenderer
+
+        renderer = SceneCardRenderer(layout_path, frame_path=frame_path)
+        started = time.perf_counter()
+        for done, (_, payload, out_path) in enumerate(jobs, start=1):
+            renderer.export_card(payload, deck.deck_color, out_path)
+            elapsed = time.perf_counter() - started
+            yield ShardProgress(0, out_path, done, total, done, total, done / elapsed if elapsed else 0.0)
+        return
+
+    shards = split_shards(jobs, workers)
+    # spawn, а не fork: форк процесу з уже створеним QApplication небезпечний
+    ctx = multiprocessing.get_context("spawn")
+    with ctx.Manager() as manager, ProcessPoolExecutor(max_workers=len(shards), mp_context=ctx) as pool:
+        events = manager.Queue()
+        futures = [
+            pool.submit(export_shard, worker, layout_path, frame_path, deck.deck_color, shard, events)
+            for worker, shard in enumerate(shards)
+        ]
+        done = 0
+        while done < total:
+            try:
+                worker, worker_done, worker_total, path, elapsed = events.get(timeout=0.5)
+            except queue.Empty:
+                # Воркер упав — не чекаємо вічно на його події
+                failed = next((f for f in futures if f.done() and f.exception()), None)
+                if failed is not None:
+                    raise failed.exception()
+                continue
+            done += 1
+            yield ShardProgress(
+                worker, path, done, total, worker_done, worker_total,
+                worker_done / elapsed if elapsed else 0.0,
+            )
+        for future in futures:
+            future.result()
+
+
+def export_deck_sharded(
+    deck: DeckModel,
+    layout_path: str,
+    out_dir: str,
+    workers: Optional[int] = None,
+    frame_path: Optional[str] = None,
+    progress: Optional[Callable[[ShardProgress], None]] = None,
+    manifest: Optional[RenderManifest] = None,
+) -> List[str]:
+    """Export every card and return the PNG paths in deck order."""
+    paths = [job[2] for job in plan_scene_jobs(deck, out_dir, avoid_existing=manifest is None)]
+    for event in iter_export_sharded(deck, layout_path, out_dir, workers, frame_path, manifest):
+        if progress:
+            progress(event)
+    return paths
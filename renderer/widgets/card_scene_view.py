@@ -27,6 +27,8 @@ from PySide6.QtWidgets import (
     QGraphicsView,
 )
 
+from renderer.core.scene_renderer import build_scene_items, card_text_fields, fit_pixmap, relative_pos
+
 APP_DIR = Path(__file__).resolve().parent.parent
 DEFAULT_LAYOUT = APP_DIR / "editor" / "template_layout.json"
 
@@ -57,64 +59,25 @@ class _CardItemBase:
         return super().itemChange(change, value)  # type: ignore[misc]
 
 
+# Самі класи лише додають інтерактивність; шрифт, позицію, тінь тощо з layout
+# застосовує спільний build_scene_items — той самий, що й у headless-рендері.
 class CardTextItem(_CardItemBase, QGraphicsTextItem):
     def __init__(self, scene_view: "CardSceneView", item_id: str, config: dict):
-        QGraphicsTextItem.__init__(self, config.get("text", ""))
+        QGraphicsTextItem.__init__(self)
         _CardItemBase.__init__(self, scene_view, item_id, config)
-        font_cfg = config.get("font", {})
-        font = QFont(font_cfg.get("family", "Arial"), font_cfg.get("size", 20))
-        font.setBold(font_cfg.get("bold", False))
-        font.setItalic(font_cfg.get("italic", False))
-        font.setUnderline(font_cfg.get("underline", False))
-        self.setFont(font)
-        color = QColor(config.get("color", "#FFFFFF"))
-        self.setDefaultTextColor(color)
-        text_width = config.get("text_width")
-        if text_width:
-            self.setTextWidth(text_width)
-        self.setPos(config.get("pos", {}).get("x", 0), config.get("pos", {}).get("y", 0))
-        self.setZValue(config.get("z", 5))
-        self.setOpacity(config.get("opacity", 1.0))
         self.setTextInteractionFlags(Qt.TextEditorInteraction)
-        if config.get("shadow"):
-            self._apply_shadow(config["shadow"])
-
-    # ------------------------------------------------------------------
-    def _apply_shadow(self, cfg: dict) -> None:
-        effect = QGraphicsDropShadowEffect()
-        effect.setColor(QColor(cfg.get("color", "#000000")))
-        offset = cfg.get("offset", [0, 0])
-        effect.setOffset(offset[0], offset[1])
-        effect.setBlurRadius(cfg.get("blur", 0))
-        self.setGraphicsEffect(effect)
 
 
 class CardPixmapItem(_CardItemBase, QGraphicsPixmapItem):
     def __init__(self, scene_view: "CardSceneView", item_id: str, config: dict):
-        pixmap = QPixmap(config.get("asset", "")) if config.get("asset") else QPixmap()
-        QGraphicsPixmapItem.__init__(self, pixmap)
+        QGraphicsPixmapItem.__init__(self)
         _CardItemBase.__init__(self, scene_view, item_id, config)
-        self.setTransformationMode(Qt.SmoothTransformation)
-        self.setPos(config.get("pos", {}).get("x", 0), config.get("pos", {}).get("y", 0))
-        self.setZValue(config.get("z", 2))
-        self.setOpacity(config.get("opacity", 1.0))
 
 
 class CardRectItem(_CardItemBase, QGraphicsRectItem):
     def __init__(self, scene_view: "CardSceneView", item_id: str, config: dict):
-        rect_cfg = config.get("size", {})
-        rect = QRectF(0, 0, rect_cfg.get("w", 100), rect_cfg.get("h", 100))
-        QGraphicsRectItem.__init__(self, rect)
+        QGraphicsRectItem.__init__(self)
         _CardItemBase.__init__(self, scene_view, item_id, config)
-        pen_cfg = config.get("pen", {"color": "#FFFFFF", "width": 1})
-        pen = QPen(QColor(pen_cfg.get("color", "#FFFFFF")), pen_cfg.get("width", 1))
-        self.setPen(pen)
-        brush_cfg = config.get("brush")
-        if brush_cfg:
-            self.setBrush(QColor(brush_cfg.get("color", "#FFFFFF")))
-        self.setPos(config.get("pos", {}).get("x", 0), config.get("pos", {}).get("y", 0))
-        self.setZValue(config.get("z", 1))
-        self.setOpacity(config.get("opacity", 1.0))
 
 
 class CardSceneView(QGraphicsView):
@@ -187,12 +150,11 @@ class CardSceneView(QGraphicsView):
         self._emit_selected_item()
 
     # ------------------------------------------------------------------
-    def apply_card_data(self, card: dict, deck_color: str):
-        """Populate scene items using card data from JSON."""
-        if not card:
+    def ensure_template_loaded(self):
+        """Build scene items from the layout once; later calls are no-ops."""
+        if self.scene_items and self.layout:
             return
-        
-        # Якщо layout не існує — створити дефолтний    
+        # Якщо layout не існує — створити дефолтний
         if not os.path.exists(self.layout_path):
             self._ensure_default_layout()
         # Завантажити шаблон
@@ -287,56 +249,29 @@ class CardSceneView(QGraphicsView):
     def _build_scene_items(self):
         for item in list(self.scene_items.values()):
             self._scene.removeItem(item)
-        self.scene_items.clear()
-        items = self.layout.get("items", {})
-        for item_id, cfg in items.items():
-            created = self._create_item(item_id, cfg)
-            if created:
-                self.scene_items[item_id] = created
-                self._scene.addItem(created)
+        self.scene_items = build_scene_items(
+            self._scene,
+            self.layout,
+            {
+                "text": lambda item_id, cfg: CardTextItem(self, item_id, cfg),
+                "pixmap": lambda item_id, cfg: CardPixmapItem(self, item_id, cfg),
+                "rect": lambda item_id, cfg: CardRectItem(self, item_id, cfg),
+            },
+        )
         art_item = self.scene_items.get(self._art_item_id)
         if isinstance(art_item, QGraphicsPixmapItem) and art_item.pixmap().isNull():
             self._set_image(self._art_item_id, self._default_art_pixmap, persist=False)
         self._apply_relative_positions()
         self.fit_card_to_view()
 
-    # ------------------------------------------------------------------
-    def _create_item(self, item_id: str, cfg: dict) -> Optional[QGraphicsItem]:
-        item_type = cfg.get("type", "text")
-        if item_type == "text":
-            return CardTextItem(self, item_id, cfg)
-        if item_type in {"image", "pixmap", "icon"}:
-            item = CardPixmapItem(self, item_id, cfg)
-            size = cfg.get("size")
-            if size and not item.pixmap().isNull():
-                scaled = item.pixmap().scaled(
-                    size.get("w", item.pixmap().width()),
-                    size.get("h", item.pixmap().height()),
-                    Qt.KeepAspectRatio,
-                    Qt.SmoothTransformation,
-                )
-                item.setPixmap(scaled)
-            return item
-        if item_type in {"rect", "decor"}:
-            return CardRectItem(self, item_id, cfg)
-        return None
-
     # ------------------------------------------------------------------
     def _apply_relative_positions(self):
         for item_id, item in self.scene_items.items():
             cfg = self.layout.get("items", {}).get(item_id, {})
-            bindings = cfg.get("bindings", {})
-            if not bindings.get("relative"):
+            pos = relative_pos(cfg, self.card_size.width(), self.card_size.height())
+            if pos is None:
                 continue
-            anchor = bindings.get("anchor", {})
-            rel_x = anchor.get("x")
-            rel_y = anchor.get("y")
-            if rel_x is None or rel_y is None:
-                pos = cfg.get("pos", {})
-                rel_x = pos.get("x", 0) / max(1.0, self.card_size.width())
-                rel_y = pos.get("y", 0) / max(1.0, self.card_size.height())
-            new_x = rel_x * self.card_size.width()
-            new_y = rel_y * self.card_size.height()
+            new_x, new_y = pos
             item.setPos(new_x, new_y)
             cfg.setdefault("pos", {})
             cfg["pos"].update({"x": new_x, "y": new_y})
@@ -484,37 +419,20 @@ class CardSceneView(QGraphicsView):
 
     # ------------------------------------------------------------------
     def apply_card_data(self, card: dict, deck_color: str):
+        """
+        Populate scene items using card data from JSON.
+
+        The layout is built only on the first call; afterwards only texts,
+        artwork and deck colour change, so a deck export reuses one scene.
+        """
         if not card:
             return
 
-        if not self._preview_item:
-            self._preview_item = QGraphicsPixmapItem(pixmap)
-            self._preview_item.setTransformationMode(Qt.SmoothTransformation)
-            self._preview_item.setZValue(20)
-            self._scene.addItem(self._preview_item)
+        self.ensure_template_loaded()
         self._deck_color = QColor(deck_color) if QColor.isValidColor(deck_color) else QColor("#FFFFFF")
         # Textual content
-        self._set_text("title", card.get("name", ""), persist=False)
-        self._set_text("type", card.get("type", "").upper(), persist=False)
-        desc = card.get("description") or card.get("text") or card.get("effect", "")
-        self._set_text("description", desc, persist=False)
-        stats = {
-            "atk": card.get("atk", "-"),
-            "def": card.get("def", "-"),
-            "stb": card.get("stb", "-"),
-            "init": card.get("init", "-"),
-            "rng": card.get("rng", "-"),
-            "move": card.get("move", "-"),
-        }
-        for key, value in stats.items():
-            label = key.upper()
-            self._set_text(f"stat_{key}", f"{label} {value}", persist=False)
-        cost = card.get("cost")
-        if cost is not None:
-            self._set_text("cost", str(cost), persist=False)
-        cost_type = card.get("cost_type")
-        if cost_type:
-            self._set_text("cost_type", cost_type, persist=False)
+        for item_id, text in card_text_fields(card).items():
+            self._set_text(item_id, text, persist=False)
         # Artwork
         art_path = card.get("art_path")
         if art_path and os.path.exists(art_path):
@@ -537,15 +455,7 @@ class CardSceneView(QGraphicsView):
     def _set_image(self, item_id: str, pixmap: QPixmap, *, persist: bool = True):
         item = self.scene_items.get(item_id)
         if isinstance(item, QGraphicsPixmapItem) and not pixmap.isNull():
-            size = self.layout.get("items", {}).get(item_id, {}).get("size")
-            if size:
-                pixmap = pixmap.scaled(
-                    size.get("w", pixmap.width()),
-                    size.get("h", pixmap.height()),
-                    Qt.KeepAspectRatio,
-                    Qt.SmoothTransformation,
-                )
-            item.setPixmap(pixmap)
+            item.setPixmap(fit_pixmap(pixmap, self.layout.get("items", {}).get(item_id, {})))
             if persist and self.edit_mode == "template":
                 cfg = self.layout.setdefault("items", {}).setdefault(item_id, {})
                 cfg["asset"] = cfg.get("asset")
@@ -1,21 +1,61 @@
+import json
+import os
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Dict, Iterable, Iterator, List, Optional
+
 import requests
 
+from renderer.core.paths import PROJECT_PATH
+
+DEFAULT_API_URL = "https://api.mymemory.translated.net/get"
+
+# Пам'ять перекладів: (мовна пара, текст) → переклад, JSON на диску. Одна й та
+# сама назва ніколи не йде до API двічі. Вимикається LS_GEN_TRANSLATION_MEMORY=0.
+MEMORY_VERSION = 1
+
+# MyMemory приймає до 500 байт у q; кілька назв ідуть одним запитом,
+# розділені переносом рядка (якщо кількість рядків не збіглася — по одній).
+MAX_QUERY_BYTES = 450
+BATCH_SEPARATOR = "\n"
+
+# Коли ліміт вичерпано, MyMemory повертає текст попередження замість перекладу
+QUOTA_WARNING_PREFIX = "MYMEMORY WARNING"
+
+
+class TranslationError(RuntimeError):
+    """API answered, but not with a translation (responseStatus != 200)."""
+
+    def __init__(self, message: str, status=None):
+        super().__init__(message)
+        self.status = status
+
+
+class TranslationQuotaError(TranslationError):
+    """Daily quota used up: retrying name by name would only spend more requests."""
+
+
 class OfflineTranslator:
-    def __init__(self):
-        self.api_url = "https://api.mymemory.translated.net/get"
+    def __init__(self, api_url: Optional[str] = None, timeout: float = 10):
+        # LS_GEN_TRANSLATE_URL — напр. локальний тестовий сервер з тим самим форматом відповіді
+        self.api_url = api_url or os.environ.get("LS_GEN_TRANSLATE_URL", DEFAULT_API_URL)
+        self.timeout = timeout
 
-    def translate(self, text: str, langpair: str = "uk|en") -> str:
+    def translate(self, text: str, langpair: str = "uk|en", session=None) -> str:
         if not text.strip():
             return ""
 
         try:
-            response = requests.get(
+            response = (session or requests).get(
                 self.api_url,
                 params={
                     "q": text,
                     "langpair": langpair
                 },
-                timeout=10
+                timeout=self.timeout
             )
 
             data = response.json()
@@ -23,11 +63,218 @@ class OfflineTranslator:
             if "responseData" not in data:
                 raise ValueError(f"Некоректна відповідь API: {data}")
 
-            return data["responseData"]["translatedText"]
+            translated = data["responseData"].get("translatedText") or ""
+            status = str(data.get("responseStatus", 200))
+            if status == "429" or translated.startswith(QUOTA_WARNING_PREFIX):
+                raise TranslationQuotaError(f"Ліміт перекладів вичерпано: {translated or status}", status)
+            if status != "200":
+                raise TranslationError(
+                    f"Переклад недоступний: {data.get('responseDetails') or translated or status}", status
+                )
+            return translated
 
+        except TranslationError:
+            raise
         except Exception as e:
             raise RuntimeError(f"Переклад недоступний: {e}") from e
 
+    def translate_batch(self, texts: List[str], langpair: str = "uk|en", session=None) -> List[str]:
+        """
+        Translate several single-line texts with one request where the answer
+        keeps the line count. Errors of the batched request (quota included)
+        propagate without the name-by-name retry.
+        """
+        if len(texts) == 1:
+            return [self.translate(texts[0], langpair, session)]
+        lines = self.translate(BATCH_SEPARATOR.join(texts), langpair, session).split(BATCH_SEPARATOR)
+        if len(lines) != len(texts):
+            return [self.translate(text, langpair, session) for text in texts]
+        return [line.strip() for line in lines]
+
     def translate_name(self, name: str) -> str:
         """Перекладає назву з української на англійську"""
         return self.translate(name, "uk|en")
+
+
+class TranslationMemory:
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        self._entries: Optional[Dict[str, str]] = None
+        self._dirty = False
+
+    @staticmethod
+    def _key(text: str, langpair: str) -> str:
+        return f"{langpair}\t{text}"
+
+    def _load(self) -> Dict[str, str]:
+        if self._entries is None:
+            try:
+                with open(self.path, "r", encoding="utf-8") as f:
+                    data = json.load(f)
+                entries = data.get("entries", {}) if data.get("version") == MEMORY_VERSION else {}
+                # Попередження про ліміт, збережені до перевірки responseStatus
+                self._entries = {
+                    key: value for key, value in entries.items() if not value.startswith(QUOTA_WARNING_PREFIX)
+                }
+                self._dirty = len(self._entries) != len(entries)
+            except (OSError, ValueError):
+                self._entries = {}
+        return self._entries
+
+    def get(self, text: str, langpair: str = "uk|en") -> Optional[str]:
+        with self._lock:
+            return self._load().get(self._key(text, langpair))
+
+    def put(self, text: str, langpair: str, translation: str):
+        if translation.startswith(QUOTA_WARNING_PREFIX):
+            return
+        with self._lock:
+            self._load()[self._key(text, langpair)] = translation
+            self._dirty = True
+
+    def save(self):
+        with self._lock:
+            if not self._dirty:
+                return
+            folder = os.path.dirname(self.path)
+            if folder:
+                os.makedirs(folder, exist_ok=True)
+            tmp = self.path + ".tmp"
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump({"version": MEMORY_VERSION, "entries": self._entries}, f, ensure_ascii=False, indent=1)
+            os.replace(tmp, self.path)
+            self._dirty = False
+
+
+_default_memory = None
+
+
+def get_translation_memory():
+    """Shared translation memory, or None when disabled with LS_GEN_TRANSLATION_MEMORY=0."""
+    global _default_memory
+    if os.environ.get("LS_GEN_TRANSLATION_MEMORY", "1") == "0":
+        return None
+    if _default_memory is None:
+        _default_memory = TranslationMemory(
+            os.environ.get("LS_GEN_TRANSLATION_MEMORY_PATH", PROJECT_PATH(os.path.join("cache", "translations.json")))
+        )
+    return _default_memory
+
+
+class SessionPool:
+    """Fixed set of requests.Session objects handed out one per in-flight request."""
+
+    def __init__(self, size: int):
+        self._sessions: "queue.Queue[requests.Session]" = queue.Queue()
+        for _ in range(max(1, size)):
+            self._sessions.put(requests.Session())
+
+    @contextmanager
+    def session(self):
+        session = self._sessions.get()
+        try:
+            yield session
+        finally:
+            self._sessions.put(session)
+
+    def close(self):
+        while True:
+            try:
+                self._sessions.get_nowait().close()
+            except queue.Empty:
+                return
+
+
+@dataclass
+class TranslationResult:
+    text: str
+    translation: str = ""
+    error: Optional[Exception] = None
+    cached: bool = False
+
+
+class TranslationService:
+    """
+    Translate many texts: memory hits first, then batched requests on a
+    bounded thread pool. Results are yielded as soon as each batch returns.
+    """
+
+    def __init__(
+        self,
+        translator: Optional[OfflineTranslator] = None,
+        memory: Optional[TranslationMemory] = None,
+        workers: int = 4,
+        batch_size: int = 8,
+    ):
+        self.translator = translator or OfflineTranslator()
+        self.memory = memory
+        self.workers = max(1, workers)
+        self.batch_size = max(1, batch_size)
+        self.sessions = SessionPool(self.workers)
+
+    def _batches(self, texts: List[str]) -> List[List[str]]:
+        batches: List[List[str]] = []
+        current: List[str] = []
+        size = 0
+        for text in texts:
+            length = len(text.encode("utf-8")) + 1
+            if BATCH_SEPARATOR in text:
+                batches.append([text])
+                continue
+            if current and (len(current) >= self.batch_size or size + length > MAX_QUERY_BYTES):
+                batches.append(current)
+                current, size = [], 0
+            current.append(text)
+            size += length
+        if current:
+            batches.append(current)
+        return batches
+
+    def _translate_batch(self, batch: List[str], langpair: str) -> List[str]:
+        with self.sessions.session() as session:
+            return self.translator.translate_batch(batch, langpair, session)
+
+    def translate_many(self, texts: Iterable[str], langpair: str = "uk|en") -> Iterator[TranslationResult]:
+        """Yield one TranslationResult per distinct non-empty text, in completion order."""
+        pending: List[str] = []
+        for text in dict.fromkeys(t for t in texts if t and t.strip()):
+            hit = self.memory.get(text, langpair) if self.memory is not None else None
+            if hit is not None:
+                yield TranslationResult(text, hit, cached=True)
+            else:
+                pending.append(text)
+        if not pending:
+            return
+
+        batches = self._batches(pending)
+        pool = ThreadPoolExecutor(max_workers=min(self.workers, len(batches)))
+        try:
+            futures = {pool.submit(self._translate_batch, batch, langpair): batch for batch in batches}
+            quota_error: Optional[TranslationQuotaError] = None
+            for future in as_completed(futures):
+                batch = futures[future]
+                if future.cancelled():
+                    for text in batch:
+                        yield TranslationResult(text, error=quota_error)
+                    continue
+                try:
+                    translations = future.result()
+                except Exception as exc:
+                    if isinstance(exc, TranslationQuotaError) and quota_error is None:
+                        # Ліміт вичерпано — решта запитів теж його лише підтвердить
+                        quota_error = exc
+                        for pending_future in futures:
+                            pending_future.cancel()
+                    for text in batch:
+                        yield TranslationResult(text, error=exc)
+                    continue
+                for text, translation in zip(batch, translations):
+                    if translation and self.memory is not None:
+                        self.memory.put(text, langpair, translation)
+                    yield TranslationResult(text, translation)
+        finally:
+            # Споживач міг зупинитися раніше — решту запитів не починаємо
+            pool.shutdown(wait=True, cancel_futures=True)
+            if self.memory is not None:
+                self.memory.save()
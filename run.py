@@ -1,13 +1,55 @@
-from PySide6.QtWidgets import QApplication
-from ui.main_window import MainWindow
-import sys, os
+import time
+
+_STARTED = time.perf_counter()
+
+import sys, os  # noqa: E402
 
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
+# --startup-timing (або LS_GEN_STARTUP_TIMING=1) — звіт про час імпорту й першого малювання
+# --prewarm-ai     (або LS_GEN_PREWARM_AI=1)     — фонове завантаження torch/diffusers після старту
+STARTUP_TIMING = "--startup-timing" in sys.argv or os.environ.get("LS_GEN_STARTUP_TIMING") == "1"
+PREWARM_AI = "--prewarm-ai" in sys.argv or os.environ.get("LS_GEN_PREWARM_AI") == "1"
+sys.argv = [arg for arg in sys.argv if arg not in {"--startup-timing", "--prewarm-ai"}]
+
+from PySide6.QtCore import QTimer  # noqa: E402
+from PySide6.QtWidgets import QApplication  # noqa: E402
+
+_QT_IMPORTED = time.perf_counter()
+
+from ui.main_window import MainWindow  # noqa: E402
+
+_UI_IMPORTED = time.perf_counter()
+
+
+def _report_startup(timings: dict):
+    timings["first_paint_s"] = time.perf_counter() - _STARTED
+    timings["torch_loaded"] = "torch" in sys.modules
+    print("[STARTUP] " + ", ".join(
+        f"{k}={v:.3f}" if isinstance(v, float) else f"{k}={v}" for k, v in timings.items()
+    ), file=sys.stderr)
+
+
 def main():
     app = QApplication(sys.argv)
     window = MainWindow()
+    window_built = time.perf_counter()
     window.show()
+
+    if STARTUP_TIMING:
+        timings = {
+            "qt_import_s": _QT_IMPORTED - _STARTED,
+            "ui_import_s": _UI_IMPORTED - _QT_IMPORTED,
+            "window_build_s": window_built - _UI_IMPORTED,
+        }
+        # Спрацьовує після першого проходу event loop, тобто після першого малювання вікна
+        QTimer.singleShot(0, lambda: _report_startup(timings))
+
+    if PREWARM_AI:
+        from ai.tools.generator import prewarm_ai_stack
+
+        QTimer.singleShot(0, prewarm_ai_stack)
+
     sys.exit(app.exec())
 
 if __name__ == "__main__":
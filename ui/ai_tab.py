@@ -9,17 +9,20 @@ from PySide6.QtWidgets import (
     QHBoxLayout,
     QLabel,
     QLineEdit,
+    QProgressBar,
     QPushButton,
+    QSpinBox,
     QTextEdit,
     QTabWidget,
     QVBoxLayout,
     QWidget,
 )
 
-from ai.app_ai import STYLE_HINT, finalize_preview, generate_ai_images
+from ai.app_ai import DEFAULT_BATCH_SIZE, STYLE_HINT, finalize_preview, generate_ai_images
 from ai.tools.generator import (
     AVAILABLE_MODELS,
     DEFAULT_NEGATIVE_PROMPT,
+    GenerationCancelled,
     get_available_loras,
 )
 from ui.preview_window import PreviewGenWindow
@@ -29,6 +32,7 @@ from ui.locales import ensure_language, format_message, get_section
 class GenerationWorker(QObject):
     finished = Signal(list)
     failed = Signal(str)
+    progress = Signal(int, int, float)  # step, total steps, seconds per step
 
     def __init__(
         self,
@@ -42,6 +46,7 @@ class GenerationWorker(QObject):
         negative_prompt: str,
         loras: list[str] | None,
         abort_event: threading.Event,
+        batch_size: int = DEFAULT_BATCH_SIZE,
     ):
         super().__init__()
         self.prompt = prompt
@@ -54,6 +59,7 @@ class GenerationWorker(QObject):
         self.negative_prompt = negative_prompt
         self.loras = loras or []
         self.abort_event = abort_event
+        self.batch_size = batch_size
 
     def run(self):
         try:
@@ -68,6 +74,8 @@ class GenerationWorker(QObject):
                 style_hint=self.style_hint,
                 negative_prompt=self.negative_prompt,
                 loras=self.loras,
+                batch_size=self.batch_size,
+                on_step=self.progress.emit,
             )
             self.finished.emit(images)
         except Exception as e:
@@ -77,6 +85,7 @@ class GenerationWorker(QObject):
 class FinalizationWorker(QObject):
     finished = Signal(list)
     failed = Signal(str)
+    progress = Signal(int, int, float)  # step, total steps, seconds per step
 
     def __init__(self, previews: list[dict], abort_event: threading.Event):
         super().__init__()
@@ -89,7 +98,15 @@ class FinalizationWorker(QObject):
             for idx, preview in enumerate(self.previews):
                 if self.abort_event.is_set():
                     break
-                path = finalize_preview(preview, steps=40)
+                try:
+                    path = finalize_preview(
+                        preview,
+                        steps=40,
+                        on_step=self.progress.emit,
+                        is_aborted=self.abort_event.is_set,
+                    )
+                except GenerationCancelled:
+                    break
                 results.append(path)
             self.finished.emit(results)
         except Exception as e:
@@ -147,6 +164,14 @@ class AiGeneratorTab(QWidget):
         layout.addWidget(self.count_label)
         layout.addWidget(self.count_edit)
 
+        # Batch size (images per pipeline call; reduced automatically on OOM)
+        self.batch_size_label = QLabel()
+        layout.addWidget(self.batch_size_label)
+        self.batch_size_spin = QSpinBox()
+        self.batch_size_spin.setRange(1, 16)
+        self.batch_size_spin.setValue(DEFAULT_BATCH_SIZE)
+        layout.addWidget(self.batch_size_spin)
+
         # Dimensions
         self.dimensions_label = QLabel()
         layout.addWidget(self.dimensions_label)
@@ -195,6 +220,12 @@ class AiGeneratorTab(QWidget):
         self.abort_button.clicked.connect(self.abort_generation)
         layout.addWidget(self.abort_button)
 
+        # Step progress of the running image/batch
+        self.progress_bar = QProgressBar()
+        self.progress_bar.setTextVisible(True)
+        self.progress_bar.setVisible(False)
+        layout.addWidget(self.progress_bar)
+
         # Preview
         self.preview_label = QLabel()
         self.preview_label.setAlignment(Qt.AlignCenter)
@@ -213,6 +244,7 @@ class AiGeneratorTab(QWidget):
             "negative_prompt": self.negative_prompt_edit.toPlainText(),
             "style_hint": self.style_hint_edit.toPlainText(),
             "count": self.count_edit.text(),
+            "batch_size": self.batch_size_spin.value(),
             "dimensions": [width, height],
             "model": self.model_combo.currentText(),
             "csv_path": self.csv_path,
@@ -236,6 +268,13 @@ class AiGeneratorTab(QWidget):
         if count is not None:
             self.count_edit.setText(str(count))
 
+        batch_size = settings.get("batch_size")
+        if batch_size is not None:
+            try:
+                self.batch_size_spin.setValue(int(batch_size))
+            except (TypeError, ValueError):
+                pass
+
         dimensions = settings.get("dimensions") or []
         if isinstance(dimensions, (list, tuple)) and len(dimensions) == 2:
             try:
@@ -278,12 +317,14 @@ class AiGeneratorTab(QWidget):
         self.style_label.setText(strings.get("style_hint", ""))
         self.csv_button.setText(strings.get("load_data", ""))
         self.count_label.setText(strings.get("count", ""))
+        self.batch_size_label.setText(strings.get("batch_size", "Batch size:"))
         self.dimensions_label.setText(strings.get("dimensions", ""))
         self.model_label.setText(strings.get("model_label", strings.get("model", "")))
         self.lora_label.setText(strings.get("lora_label", ""))
         self.generate_button.setText(strings.get("generate_button", ""))
         self.preview_button.setText(strings.get("generate_previews_button", ""))
         self.abort_button.setText(strings.get("abort_button", strings.get("abort", "")))
+        self.progress_bar.setFormat(strings.get("step_progress_format", "%v / %m"))
         no_image = strings.get("no_image", "")
         if not self.preview_label.text() or self.preview_label.text() in (
             get_section("en", "ai_generator").get("no_image", ""),
@@ -357,6 +398,7 @@ class AiGeneratorTab(QWidget):
                 negative_prompt=negative_prompt,
                 loras=loras,
                 count=desired_count,
+                batch_size=self.batch_size_spin.value(),
                 language=self.language,
                 error_notifier=self.error_notifier,
                 parent=tab_widget,
@@ -375,6 +417,7 @@ class AiGeneratorTab(QWidget):
                 loras=loras,
                 language=self.language,
                 auto_start=auto_start,
+                batch_size=self.batch_size_spin.value(),
             )
 
         tab_title = get_section(self.language, "tabs").get("preview_gen", "Preview")
@@ -403,6 +446,7 @@ class AiGeneratorTab(QWidget):
         style_hint = self.style_hint_edit.toPlainText().strip() or STYLE_HINT
         negative_prompt = self.negative_prompt_edit.toPlainText().strip() or DEFAULT_NEGATIVE_PROMPT
         model = self.model_combo.currentText()
+        loras = self._get_selected_loras()
 
         try:
             count = int(self.count_edit.text())
@@ -426,6 +470,7 @@ class AiGeneratorTab(QWidget):
             self.worker_thread.started.connect(self.worker.run)
             self.worker.finished.connect(self.generation_finished)
             self.worker.failed.connect(self.generation_failed)
+            self.worker.progress.connect(self._on_step_progress)
             self.worker.finished.connect(self.worker_thread.quit)
             self.worker.failed.connect(self.worker_thread.quit)
             self.worker_thread.finished.connect(self.worker.deleteLater)
@@ -447,12 +492,14 @@ class AiGeneratorTab(QWidget):
             style_hint,
             negative_prompt,
             loras,
-            self.abort_event
+            self.abort_event,
+            batch_size=self.batch_size_spin.value(),
         )
         self.worker.moveToThread(self.worker_thread)
         self.worker_thread.started.connect(self.worker.run)
         self.worker.finished.connect(self.generation_finished)
         self.worker.failed.connect(self.generation_failed)
+        self.worker.progress.connect(self._on_step_progress)
         self.worker.finished.connect(self.worker_thread.quit)
         self.worker.failed.connect(self.worker_thread.quit)
         self.worker_thread.finished.connect(self.worker.deleteLater)
@@ -520,12 +567,23 @@ class AiGeneratorTab(QWidget):
             if index != -1:
                 tab_widget.setCurrentIndex(index)
 
+    def _on_step_progress(self, step: int, total: int, seconds: float):
+        self.progress_bar.setVisible(True)
+        self.progress_bar.setMaximum(max(total, 1))
+        self.progress_bar.setValue(step)
+        self.progress_bar.setToolTip(
+            format_message(self.strings, "step_progress", step=step, total=total, seconds=seconds)
+        )
+
     def abort_generation(self):
         if self.abort_event:
             self.abort_event.set()
         self.abort_button.setEnabled(False)
 
     def _set_generation_controls(self, enabled: bool):
+        if enabled:
+            self.progress_bar.setVisible(False)
+            self.progress_bar.reset()
         self.generate_button.setEnabled(enabled)
         self.preview_button.setEnabled(enabled)
         self.csv_button.setEnabled(enabled)
@@ -1,24 +1,248 @@
 import csv
 import json
 import os
+import threading
 
-from PySide6.QtCore import Qt
+from PySide6.QtCore import QAbstractTableModel, QModelIndex, QObject, QSortFilterProxyModel, Qt, QThread, Signal
 from PySide6.QtGui import QGuiApplication, QKeySequence
 from PySide6.QtWidgets import (
     QFileDialog,
     QHBoxLayout,
+    QLineEdit,
     QPushButton,
-    QTableWidget,
-    QTableWidgetItem,
+    QStyle,
+    QTableView,
     QVBoxLayout,
     QWidget,
 )
 
-from renderer.widgets.translator import OfflineTranslator
+from renderer.widgets.translator import OfflineTranslator, TranslationService, get_translation_memory
 from ui.locales import ensure_language, format_message, get_section
 
 
-class DataTableWidget(QTableWidget):
+# Одна клітинка = один елемент списку колонки; QTableWidgetItem'ів немає.
+# Рядок перетворюється на текст лише коли його малює/редагує в'юха.
+MANUAL_ROLE = Qt.UserRole       # name_en введено вручну — не перекладати
+AUTO_ROLE = Qt.UserRole + 1     # останній автоматичний переклад name_en
+
+# Ширина колонок міряється по вибірці рядків, а не по всій таблиці
+SIZE_SAMPLE_ROWS = 200
+MAX_COLUMN_WIDTH = 480
+
+
+def _cell_text(value) -> str:
+    return value if isinstance(value, str) else str(value)
+
+
+class RowStore:
+    """Column-wise table data: one list per header plus name_en translation flags."""
+
+    def __init__(self, headers: list[str] | None = None, rows: list | None = None):
+        self.headers: list[str] = list(headers or [])
+        rows = rows or []
+        self.columns: list[list] = [
+            [row.get(header, "") if isinstance(row, dict) else "" for row in rows]
+            for header in self.headers
+        ]
+        self.row_count = len(rows)
+        self.manual: list[bool] = [False] * self.row_count
+        self.auto: list[str] = [""] * self.row_count
+        if "name_en" in self.headers:
+            column = self.columns[self.headers.index("name_en")]
+            self.manual = [bool(_cell_text(value).strip()) for value in column]
+
+    def text(self, row: int, col: int) -> str:
+        return _cell_text(self.columns[col][row])
+
+    def set_text(self, row: int, col: int, value: str):
+        self.columns[col][row] = value
+
+    def append_rows(self, count: int):
+        for column in self.columns:
+            column.extend([""] * count)
+        self.manual.extend([False] * count)
+        self.auto.extend([""] * count)
+        self.row_count += count
+
+    def reorder(self, order: list[int]):
+        self.columns = [[column[i] for i in order] for column in self.columns]
+        self.manual = [self.manual[i] for i in order]
+        self.auto = [self.auto[i] for i in order]
+
+    def matching_rows(self, needle: str) -> set[int]:
+        """Rows where any cell contains `needle` (case-insensitive)."""
+        needle = needle.casefold()
+        matches: set[int] = set()
+        for column in self.columns:
+            matches.update(
+                row for row, value in enumerate(column)
+                if row not in matches and needle in _cell_text(value).casefold()
+            )
+        return matches
+
+    def row_matches(self, row: int, needle: str) -> bool:
+        needle = needle.casefold()
+        return any(needle in _cell_text(column[row]).casefold() for column in self.columns)
+
+    def records(self) -> list[dict]:
+        return [
+            {header: self.text(row, col) for col, header in enumerate(self.headers)}
+            for row in range(self.row_count)
+        ]
+
+
+class DataTableModel(QAbstractTableModel):
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.store = RowStore()
+
+    def set_store(self, store: RowStore):
+        self.beginResetModel()
+        self.store = store
+        self.endResetModel()
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else self.store.row_count
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.store.headers)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        if role in (Qt.DisplayRole, Qt.EditRole):
+            return self.store.text(index.row(), index.column())
+        if role == MANUAL_ROLE:
+            return self.store.manual[index.row()]
+        if role == AUTO_ROLE:
+            return self.store.auto[index.row()]
+        return None
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role != Qt.DisplayRole:
+            return None
+        if orientation == Qt.Horizontal:
+            return self.store.headers[section] if section < len(self.store.headers) else None
+        return str(section + 1)
+
+    def flags(self, index):
+        if not index.isValid():
+            return Qt.NoItemFlags
+        return Qt.ItemIsSelectable | Qt.ItemIsEnabled | Qt.ItemIsEditable
+
+    def setData(self, index, value, role=Qt.EditRole):
+        if not index.isValid() or role != Qt.EditRole:
+            return False
+        row, col = index.row(), index.column()
+        self.store.set_text(row, col, _cell_text(value))
+        if self.store.headers[col] == "name_en":
+            # Ручна правка name_en: автопереклад її більше не перезапише
+            self.store.manual[row] = True
+            self.store.auto[row] = ""
+        self.dataChanged.emit(index, index, [Qt.DisplayRole, Qt.EditRole])
+        return True
+
+    def set_translation(self, row: int, col: int, text: str):
+        self.store.set_text(row, col, text)
+        self.store.manual[row] = False
+        self.store.auto[row] = text
+        index = self.index(row, col)
+        self.dataChanged.emit(index, index, [Qt.DisplayRole, Qt.EditRole])
+
+    def append_rows(self, count: int):
+        first = self.store.row_count
+        self.beginInsertRows(QModelIndex(), first, first + count - 1)
+        self.store.append_rows(count)
+        self.endInsertRows()
+
+    def sort(self, column, order=Qt.AscendingOrder):
+        """Reorder the store itself, like QTableWidget did, so saving keeps the sorted order."""
+        if not 0 <= column < len(self.store.headers):
+            return
+        values = self.store.columns[column]
+        order_rows = sorted(
+            range(self.store.row_count),
+            key=lambda row: _cell_text(values[row]),
+            reverse=order == Qt.DescendingOrder,
+        )
+        self.layoutAboutToBeChanged.emit()
+        old = self.persistentIndexList()
+        position = {source: target for target, source in enumerate(order_rows)}
+        self.store.reorder(order_rows)
+        self.changePersistentIndexList(old, [self.index(position[i.row()], i.column()) for i in old])
+        self.layoutChanged.emit()
+
+
+class DataFilterProxy(QSortFilterProxyModel):
+    """
+    Text filter over DataTableModel.
+
+    Matching rows are computed once per filter string from the column store
+    instead of Qt asking data() for every cell, then patched for appended and
+    edited rows; sorting is forwarded to the source model, which sorts its
+    columns in Python in one pass.
+    """
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._needle = ""
+        self._accepted: set[int] | None = None
+
+    def setSourceModel(self, model):
+        previous = self.sourceModel()
+        if previous is not None:
+            previous.dataChanged.disconnect(self._on_source_data_changed)
+            previous.rowsInserted.disconnect(self._on_source_rows_inserted)
+            previous.modelReset.disconnect(self._refresh_accepted)
+        # До super(): слоти викликаються в порядку підключення, тож збіги
+        # оновлюються раніше, ніж проксі перевірить рядки через filterAcceptsRow
+        model.dataChanged.connect(self._on_source_data_changed)
+        model.rowsInserted.connect(self._on_source_rows_inserted)
+        model.modelReset.connect(self._refresh_accepted)
+        super().setSourceModel(model)
+
+    def set_filter_text(self, text: str):
+        self._needle = text.strip()
+        self._refresh_accepted()
+        self.invalidateRowsFilter()
+
+    def _refresh_accepted(self):
+        source = self.sourceModel()
+        self._accepted = source.store.matching_rows(self._needle) if self._needle and source else None
+
+    def _update_rows(self, first: int, last: int):
+        store = self.sourceModel().store
+        for row in range(first, last + 1):
+            if store.row_matches(row, self._needle):
+                self._accepted.add(row)
+            else:
+                self._accepted.discard(row)
+
+    def _on_source_data_changed(self, top_left, bottom_right, roles=()):
+        if self._accepted is not None:
+            self._update_rows(top_left.row(), bottom_right.row())
+
+    def _on_source_rows_inserted(self, parent, first, last):
+        if self._accepted is None:
+            return
+        if last + 1 == self.sourceModel().rowCount():
+            # Дописані в кінець (вставка з буфера) — номери решти не зсунулись
+            self._update_rows(first, last)
+        else:
+            self._refresh_accepted()
+
+    def filterAcceptsRow(self, source_row, source_parent):
+        return self._accepted is None or source_row in self._accepted
+
+    def sort(self, column, order=Qt.AscendingOrder):
+        self.sourceModel().sort(column, order)
+        if self._needle:
+            # Номери рядків у джерелі змінилися — перерахувати збіги
+            self._refresh_accepted()
+            self.invalidateRowsFilter()
+
+
+class DataTableView(QTableView):
     def keyPressEvent(self, event):
         if event.matches(QKeySequence.Copy):
             self.copy_selection()
@@ -29,46 +253,120 @@ class DataTableWidget(QTableWidget):
         super().keyPressEvent(event)
 
     def copy_selection(self):
-        ranges = self.selectedRanges()
+        ranges = self.selectionModel().selection()
         if not ranges:
             return
         selected = ranges[0]
+        model = self.model()
         rows = []
-        for row in range(selected.topRow(), selected.bottomRow() + 1):
-            values = []
-            for col in range(selected.leftColumn(), selected.rightColumn() + 1):
-                item = self.item(row, col)
-                values.append(item.text() if item else "")
+        for row in range(selected.top(), selected.bottom() + 1):
+            values = [
+                model.index(row, col).data() or ""
+                for col in range(selected.left(), selected.right() + 1)
+            ]
             rows.append("\t".join(values))
         QGuiApplication.clipboard().setText("\n".join(rows))
 
     def paste_selection(self):
-        start_row = self.currentRow()
-        start_col = self.currentColumn()
-        if start_row < 0 or start_col < 0:
+        current = self.currentIndex()
+        if not current.isValid():
+            return
+        proxy = self.model()
+        source = proxy.sourceModel()
+        lines = QGuiApplication.clipboard().text().splitlines()
+        if not lines:
             return
-        text = QGuiApplication.clipboard().text()
-        lines = text.splitlines()
-        required_rows = start_row + len(lines)
-        if required_rows > self.rowCount():
-            self.setRowCount(required_rows)
-        column_limit = self.columnCount()
-        for r_offset, line in enumerate(lines):
-            cells = line.split("\t")
-            for c_offset, cell in enumerate(cells):
+        # Рядки вставки в координатах джерела; чого бракує — дописуємо в кінець
+        target_rows = []
+        missing = 0
+        for offset in range(len(lines)):
+            proxy_row = current.row() + offset
+            if proxy_row < proxy.rowCount():
+                target_rows.append(proxy.mapToSource(proxy.index(proxy_row, 0)).row())
+            else:
+                target_rows.append(source.rowCount() + missing)
+                missing += 1
+        if missing:
+            source.append_rows(missing)
+        column_limit = source.columnCount()
+        start_col = current.column()
+        for source_row, line in zip(target_rows, lines):
+            for c_offset, cell in enumerate(line.split("\t")):
                 target_col = start_col + c_offset
                 if target_col >= column_limit:
                     break
-                self.setItem(start_row + r_offset, target_col, QTableWidgetItem(cell))
+                source.setData(source.index(source_row, target_col), cell)
+
+    def fit_columns(self, columns=None, rows=None):
+        """
+        Size columns to their header and a sample of cells.
+
+        By default up to SIZE_SAMPLE_ROWS rows spread evenly over the table
+        are measured; `rows` narrows it (an edit only measures its own row
+        and never shrinks the column).
+        """
+        model = self.model()
+        if model is None:
+            return
+        count = model.rowCount()
+        grow_only = rows is not None
+        if rows is None:
+            step = max(1, count // SIZE_SAMPLE_ROWS)
+            rows = range(0, count, step)
+        metrics = self.fontMetrics()
+        header = self.horizontalHeader()
+        padding = 2 * self.style().pixelMetric(QStyle.PM_FocusFrameHMargin, None, self) + 12
+        for col in columns if columns is not None else range(model.columnCount()):
+            width = header.sectionSizeHint(col)
+            for row in rows:
+                text = model.index(row, col).data() or ""
+                width = max(width, metrics.horizontalAdvance(text.split("\n", 1)[0]) + padding)
+            width = min(width, MAX_COLUMN_WIDTH)
+            if not grow_only or width > header.sectionSize(col):
+                header.resizeSection(col, width)
+
+
+class TranslationWorker(QObject):
+    """Runs TranslationService off the GUI thread and streams each result back."""
+
+    translated = Signal(str, str)
+    failed = Signal(str)
+    finished = Signal()
+
+    def __init__(self, service: TranslationService, names: list[str], stop_event: threading.Event):
+        super().__init__()
+        self.service = service
+        self.names = names
+        self.stop_event = stop_event
+
+    def run(self):
+        try:
+            results = self.service.translate_many(self.names)
+            for result in results:
+                if self.stop_event.is_set():
+                    results.close()
+                    break
+                if result.error is not None:
+                    self.failed.emit(str(result.error))
+                elif result.translation:
+                    self.translated.emit(result.text, result.translation)
+        except Exception as exc:
+            self.failed.emit(str(exc))
+        self.finished.emit()
 
 
 class DataEditorWidget(QWidget):
     def __init__(self, parent=None, error_notifier=None):
         super().__init__(parent)
         self.translator = OfflineTranslator()
+        self.translation_service = TranslationService(self.translator, get_translation_memory())
+        self.translation_thread: QThread | None = None
+        self.translation_worker: TranslationWorker | None = None
+        self.translation_stop: threading.Event | None = None
+        # name → рядки джерела; перебудовується після сортування/правок name
+        self._rows_by_name: dict[str, list[int]] | None = None
         self.headers: list[str] = []
         self.current_path: str | None = None
-        self.updating = False
         self.translation_error_shown = False
         self.json_prefix: dict | None = None
         self.error_notifier = error_notifier
@@ -86,9 +384,23 @@ class DataEditorWidget(QWidget):
         button_row.addWidget(self.save_btn)
         layout.addLayout(button_row)
 
-        self.table = DataTableWidget()
+        self.filter_edit = QLineEdit()
+        self.filter_edit.setClearButtonEnabled(True)
+        self.filter_edit.textChanged.connect(self.apply_filter)
+        layout.addWidget(self.filter_edit)
+
+        self.model = DataTableModel(self)
+        self.proxy = DataFilterProxy(self)
+        self.proxy.setSourceModel(self.model)
+        self.table = DataTableView()
+        self.table.setModel(self.proxy)
         self.table.setSortingEnabled(True)
-        self.table.cellChanged.connect(self.on_cell_changed)
+        # Без цього QTableView сортував би відразу після setModel за колонкою 0
+        self.table.horizontalHeader().setSortIndicator(-1, Qt.AscendingOrder)
+        self.model.dataChanged.connect(self.on_data_changed)
+        self.model.layoutChanged.connect(self._invalidate_name_index)
+        self.model.modelReset.connect(self._invalidate_name_index)
+        self.model.rowsInserted.connect(self._invalidate_name_index)
         layout.addWidget(self.table)
 
         self.setLayout(layout)
@@ -106,6 +418,7 @@ class DataEditorWidget(QWidget):
         self.load_btn.setText(self.strings.get("load", ""))
         self.save_btn.setText(self.strings.get("save", ""))
         self.translate_btn.setText(self.strings.get("translate", ""))
+        self.filter_edit.setPlaceholderText(self.strings.get("filter", ""))
 
     def load_file(self):
         path, _ = QFileDialog.getOpenFileName(
@@ -221,26 +534,15 @@ class DataEditorWidget(QWidget):
         )
 
     def _populate_table(self, data):
-        self.updating = True
         self.headers = self._collect_headers(data)
         self._ensure_name_en()
-        self.table.setSortingEnabled(False)
-        self.table.clear()
-        self.table.setColumnCount(len(self.headers))
-        self.table.setHorizontalHeaderLabels(self.headers)
-        self.table.setRowCount(len(data))
-
-        for row_index, row in enumerate(data):
-            for col_index, header in enumerate(self.headers):
-                value = row.get(header, "") if isinstance(row, dict) else ""
-                item = QTableWidgetItem(str(value))
-                self.table.setItem(row_index, col_index, item)
-                if header == "name_en" and str(value).strip():
-                    item.setData(Qt.UserRole, True)
+        self.table.horizontalHeader().setSortIndicator(-1, Qt.AscendingOrder)
+        self.model.set_store(RowStore(self.headers, data))
+        self.proxy.set_filter_text(self.filter_edit.text())
+        self.table.fit_columns()
 
-        self.table.setSortingEnabled(True)
-        self.table.resizeColumnsToContents()
-        self.updating = False
+    def apply_filter(self, text: str):
+        self.proxy.set_filter_text(text)
 
     def _collect_headers(self, data):
         headers: list[str] = []
@@ -258,70 +560,97 @@ class DataEditorWidget(QWidget):
             self.headers.insert(0, "name")
 
     def _gather_rows(self):
-        rows = []
-        for row in range(self.table.rowCount()):
-            record = {}
-            for col, header in enumerate(self.headers):
-                item = self.table.item(row, col)
-                record[header] = item.text() if item else ""
-            rows.append(record)
-        return rows
-
-    def on_cell_changed(self, row, column):
-        if self.updating or column >= len(self.headers):
-            return
-        header = self.headers[column]
-        if header == "name_en":
-            item = self.table.item(row, column)
-            if item:
-                item.setData(Qt.UserRole, True)
-                item.setData(Qt.UserRole + 1, "")
-            self.table.resizeColumnsToContents()
-            return
-        self.table.resizeColumnsToContents()
+        return self.model.store.records()
+
+    def on_data_changed(self, top_left, bottom_right, roles=()):
+        if "name" in self.headers and top_left.column() <= self.headers.index("name") <= bottom_right.column():
+            self._invalidate_name_index()
+        # Міряємо лише змінені клітинки і лише розширюємо колонку
+        proxy_rows = [
+            self.proxy.mapFromSource(self.model.index(row, top_left.column())).row()
+            for row in range(top_left.row(), bottom_right.row() + 1)
+        ]
+        proxy_rows = [row for row in proxy_rows if row >= 0]
+        if proxy_rows:
+            self.table.fit_columns(range(top_left.column(), bottom_right.column() + 1), proxy_rows)
 
     def translate_names(self):
         if "name" not in self.headers or "name_en" not in self.headers:
             return
-        for row in range(self.table.rowCount()):
-            self._update_translation_for_row(row)
-
-    def _update_translation_for_row(self, row):
-        name_en_index = self.headers.index("name_en")
-        name_item = self.table.item(row, self.headers.index("name"))
-        target_item = self.table.item(row, name_en_index)
-        current_name = name_item.text() if name_item else ""
-        current_target = target_item.text() if target_item else ""
-        manual = bool(target_item and target_item.data(Qt.UserRole))
-        auto_value = target_item.data(Qt.UserRole + 1) if target_item else ""
-        if manual and current_target:
+        if self.translation_thread is not None:
             return
-        if not manual and current_target and current_target != auto_value:
-            if target_item:
-                target_item.setData(Qt.UserRole, True)
+        names = [
+            self.model.store.text(row, self.headers.index("name"))
+            for row in range(self.model.rowCount())
+            if self._needs_translation(row)
+        ]
+        if not names:
             return
-        try:
-            translation = self.translator.translate_name(current_name)
-        except Exception as exc:
-            if not self.translation_error_shown:
-                self._emit_error(
-                    self.strings.get("translation_title", ""),
-                    format_message(self.strings, "translation_body", details=exc),
-                    level="warning",
-                )
-                self.translation_error_shown = True
+
+        self.translate_btn.setEnabled(False)
+        self.translation_stop = threading.Event()
+        self.translation_thread = QThread()
+        self.translation_worker = TranslationWorker(self.translation_service, names, self.translation_stop)
+        self.translation_worker.moveToThread(self.translation_thread)
+        self.translation_thread.started.connect(self.translation_worker.run)
+        self.translation_worker.translated.connect(self._apply_translation)
+        self.translation_worker.failed.connect(self._on_translation_failed)
+        self.translation_worker.finished.connect(self.translation_thread.quit)
+        self.translation_thread.finished.connect(self.translation_worker.deleteLater)
+        self.translation_thread.finished.connect(self.translation_thread.deleteLater)
+        self.translation_thread.finished.connect(self._on_translation_finished)
+        self.translation_thread.start()
+
+    def _needs_translation(self, row) -> bool:
+        store = self.model.store
+        current_target = store.text(row, self.headers.index("name_en"))
+        manual = store.manual[row]
+        if manual and current_target:
+            return False
+        if not manual and current_target and current_target != store.auto[row]:
+            store.manual[row] = True
+            return False
+        return bool(store.text(row, self.headers.index("name")).strip())
+
+    def _invalidate_name_index(self, *args):
+        self._rows_by_name = None
+
+    def _apply_translation(self, name: str, translation: str):
+        if "name" not in self.headers or "name_en" not in self.headers:
             return
-        if translation:
-            self.updating = True
-            if target_item is None:
-                target_item = QTableWidgetItem()
-                self.table.setItem(row, name_en_index, target_item)
-            target_item.setText(translation)
-            target_item.setData(Qt.UserRole, False)
-            target_item.setData(Qt.UserRole + 1, translation)
-            self.table.resizeColumnsToContents()
-            self.updating = False
+        if self._rows_by_name is None:
+            name_index = self.headers.index("name")
+            self._rows_by_name = {}
+            for row in range(self.model.rowCount()):
+                self._rows_by_name.setdefault(self.model.store.text(row, name_index), []).append(row)
+        # Правила перевіряємо ще раз: рядок могли змінити, поки йшов запит
+        name_en_index = self.headers.index("name_en")
+        for row in self._rows_by_name.get(name, []):
+            if self._needs_translation(row):
+                self.model.set_translation(row, name_en_index, translation)
 
+    def _on_translation_failed(self, details: str):
+        if not self.translation_error_shown:
+            self._emit_error(
+                self.strings.get("translation_title", ""),
+                format_message(self.strings, "translation_body", details=details),
+                level="warning",
+            )
+            self.translation_error_shown = True
+
+    def _on_translation_finished(self):
+        self.translation_thread = None
+        self.translation_worker = None
+        self.translation_stop = None
+        self.translate_btn.setEnabled(True)
+
+    def shutdown_translation(self):
+        """Stop streaming translations (called when the app closes)."""
+        if self.translation_stop is not None:
+            self.translation_stop.set()
+        if self.translation_thread is not None:
+            self.translation_thread.quit()
+            self.translation_thread.wait(15000)
 
     def _emit_error(self, title: str, message: str, level: str = "error"):
         if self.error_notifier:
@@ -338,3 +667,6 @@ class DataTab(QWidget):
 
     def set_language(self, language: str):
         self.data_editor.set_language(language)
+
+    def shutdown(self):
+        self.data_editor.shutdown_translation()
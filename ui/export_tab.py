@@ -3,6 +3,8 @@ import os
 
 from PySide6.QtCore import Signal
 from PySide6.QtWidgets import (
+    QCheckBox,
+    QComboBox,
     QFileDialog,
     QGroupBox,
     QHBoxLayout,
@@ -13,7 +15,8 @@ from PySide6.QtWidgets import (
     QWidget,
 )
 
-from renderer.core.pdf_exporter import export_pdf_from_list
+from renderer.core.atlas_exporter import export_atlas
+from renderer.core.pdf_exporter import PAPER_SIZES, export_pdf_from_list, export_pdf_imposed
 from ui.locales import (
     available_languages,
     ensure_language,
@@ -71,10 +74,23 @@ class ExportTab(QWidget):
 
         layout.addLayout(settings_row)
 
+        pdf_row = QHBoxLayout()
+        self.nup_check = QCheckBox()
+        pdf_row.addWidget(self.nup_check)
+        self.paper_combo = QComboBox()
+        for paper in PAPER_SIZES:
+            self.paper_combo.addItem(paper.upper() if paper != "letter" else "Letter", paper)
+        pdf_row.addWidget(self.paper_combo)
+        layout.addLayout(pdf_row)
+
         self.export_btn = QPushButton()
         self.export_btn.clicked.connect(self.export_pdf_deck)
         layout.addWidget(self.export_btn)
 
+        self.atlas_btn = QPushButton()
+        self.atlas_btn.clicked.connect(self.export_atlas_deck)
+        layout.addWidget(self.atlas_btn)
+
         self.language_box = QGroupBox()
         language_layout = QHBoxLayout()
         self.language_buttons: dict[str, QRadioButton] = {}
@@ -102,7 +118,10 @@ class ExportTab(QWidget):
         os.makedirs(export_path, exist_ok=True)
 
         out = os.path.join(export_path, "deck.pdf")
-        export_pdf_from_list(rendered_cards, out)
+        if self.nup_check.isChecked():
+            export_pdf_imposed(rendered_cards, out, paper=self.paper_combo.currentData())
+        else:
+            export_pdf_from_list(rendered_cards, out)
 
         self._emit_error(
             self.strings.get("done_title", ""),
@@ -110,6 +129,32 @@ class ExportTab(QWidget):
             level="info",
         )
 
+    def export_atlas_deck(self):
+        rendered_cards = self.get_rendered_cards()
+        if not rendered_cards:
+            self._emit_error(
+                self.strings.get("error_title", ""),
+                self.strings.get("render_first", ""),
+                level="warning",
+            )
+            return
+
+        export_path = self.export_dir.text().strip() or "export"
+        try:
+            index = export_atlas(rendered_cards, os.path.join(export_path, "atlas"), "deck")
+        except Exception as exc:
+            self._emit_error(
+                self.strings.get("error_title", ""),
+                format_message(self.strings, "atlas_failed", error=exc),
+            )
+            return
+
+        self._emit_error(
+            self.strings.get("done_title", ""),
+            format_message(self.strings, "atlas_exported", path=index["index_path"]),
+            level="info",
+        )
+
     def choose_export_folder(self):
         start_dir = self.export_dir.text() or "export"
         folder = QFileDialog.getExistingDirectory(
@@ -126,6 +171,8 @@ class ExportTab(QWidget):
             "language": self.language,
             "export_dir": self.get_export_dir(),
             "settings_dir": self.get_settings_dir(),
+            "pdf_nup": self.nup_check.isChecked(),
+            "pdf_paper": self.paper_combo.currentData(),
         }
         if self.get_ai_settings:
             settings["ai_generator"] = self.get_ai_settings()
@@ -188,6 +235,10 @@ class ExportTab(QWidget):
         self.export_dir.setText(loaded.get("export_dir", ""))
         if "settings_dir" in loaded:
             self.settings_dir.setText(str(loaded.get("settings_dir") or ""))
+        self.nup_check.setChecked(bool(loaded.get("pdf_nup", False)))
+        paper_index = self.paper_combo.findData(loaded.get("pdf_paper", "a4"))
+        if paper_index >= 0:
+            self.paper_combo.setCurrentIndex(paper_index)
         loaded_language = loaded.get("language")
         if loaded_language:
             loaded_language = ensure_language(loaded_language)
@@ -216,6 +267,8 @@ class ExportTab(QWidget):
         self.load_settings_btn.setText(strings.get("load_settings", ""))
         self.save_settings_btn.setText(strings.get("save_settings", ""))
         self.export_btn.setText(strings.get("export_pdf", ""))
+        self.nup_check.setText(strings.get("pdf_nup", ""))
+        self.atlas_btn.setText(strings.get("export_atlas", ""))
         self.language_box.setTitle(strings.get("language_label", ""))
 
         language_labels = strings.get("languages", self.available_languages)
@@ -98,3 +98,8 @@ class MainWindow(QMainWindow):
 
     def on_language_changed(self, language: str):
         self.set_language(language)
+
+    def closeEvent(self, event):
+        self.render_tab.shutdown_watch()
+        self.data_tab.shutdown()
+        super().closeEvent(event)
@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import os
+import threading
 from typing import List
 
 from PySide6.QtCore import QObject, Qt, QThread, Signal
@@ -10,6 +11,7 @@ from PySide6.QtWidgets import (
     QGridLayout,
     QHBoxLayout,
     QLabel,
+    QProgressBar,
     QPushButton,
     QScrollArea,
     QTabWidget,
@@ -17,8 +19,8 @@ from PySide6.QtWidgets import (
     QWidget,
 )
 
-from ai.app_ai import generate_previews
-from ui.locales import ensure_language, get_section
+from ai.app_ai import DEFAULT_BATCH_SIZE, generate_previews
+from ui.locales import ensure_language, format_message, get_section
 
 
 class HoverPreviewLabel(QLabel):
@@ -111,6 +113,7 @@ class PreviewItem(QWidget):
 class PreviewGeneratorWorker(QObject):
     finished = Signal(list)
     failed = Signal(str)
+    progress = Signal(int, int, float)  # step, total steps, seconds per step
 
     def __init__(
         self,
@@ -125,6 +128,8 @@ class PreviewGeneratorWorker(QObject):
         count: int,
         language: str,
         row_indices: list[int] | None = None,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        abort_event: threading.Event | None = None,
     ):
         super().__init__()
         self.prompt = prompt
@@ -138,6 +143,8 @@ class PreviewGeneratorWorker(QObject):
         self.count = count
         self.language = language
         self.row_indices = row_indices
+        self.batch_size = batch_size
+        self.abort_event = abort_event or threading.Event()
 
     def run(self):
         try:
@@ -153,6 +160,9 @@ class PreviewGeneratorWorker(QObject):
                 loras=self.loras,
                 language=self.language,
                 row_indices=self.row_indices,
+                batch_size=self.batch_size,
+                is_aborted=self.abort_event.is_set,
+                on_step=self.progress.emit,
             )
             self.finished.emit(previews)
         except Exception as exc:  # pragma: no cover - UI thread safety
@@ -178,6 +188,7 @@ class PreviewGenWindow(QWidget):
         parent=None,
         error_notifier=None,
         auto_start: bool = True,
+        batch_size: int = DEFAULT_BATCH_SIZE,
     ):
         super().__init__(parent)
         self.prompt = prompt
@@ -189,12 +200,14 @@ class PreviewGenWindow(QWidget):
         self.negative_prompt = negative_prompt
         self.loras = loras or []
         self.count = count
+        self.batch_size = batch_size
         self.language = ensure_language(language)
         self.error_notifier = error_notifier
         self.strings: dict = {}
         self.preview_data: List[dict | None] = [None] * count
         self.worker_thread: QThread | None = None
         self.worker: PreviewGeneratorWorker | None = None
+        self.abort_event: threading.Event | None = None
 
         self._setup_ui()
         self.set_language(self.language)
@@ -241,11 +254,19 @@ class PreviewGenWindow(QWidget):
         self.apply_button.clicked.connect(self.apply_selection)
         self.regenerate_bottom = QPushButton()
         self.regenerate_bottom.clicked.connect(self.regenerate_unselected)
+        self.abort_button = QPushButton()
+        self.abort_button.setEnabled(False)
+        self.abort_button.clicked.connect(self.abort_generation)
         actions_layout.addWidget(self.apply_button)
         actions_layout.addWidget(self.regenerate_bottom)
+        actions_layout.addWidget(self.abort_button)
         actions_layout.addStretch(1)
         root_layout.addLayout(actions_layout)
 
+        self.progress_bar = QProgressBar()
+        self.progress_bar.setVisible(False)
+        root_layout.addWidget(self.progress_bar)
+
         self.setLayout(root_layout)
 
     def set_language(self, language: str):
@@ -260,6 +281,8 @@ class PreviewGenWindow(QWidget):
         self.regenerate_top.setText(strings.get("regenerate", "Regenerate"))
         self.regenerate_bottom.setText(strings.get("regenerate", "Regenerate"))
         self.apply_button.setText(strings.get("apply", "Use selected"))
+        self.abort_button.setText(strings.get("abort", "Stop"))
+        self.progress_bar.setFormat(strings.get("step_progress_format", "%v / %m"))
 
     def refresh_generation(
         self,
@@ -273,6 +296,7 @@ class PreviewGenWindow(QWidget):
         loras: list[str] | None,
         language: str,
         auto_start: bool = True,
+        batch_size: int | None = None,
     ):
         self.prompt = prompt
         self.csv_path = csv_path
@@ -283,6 +307,8 @@ class PreviewGenWindow(QWidget):
         self.negative_prompt = negative_prompt
         self.loras = loras or []
         self.language = ensure_language(language)
+        if batch_size is not None:
+            self.batch_size = batch_size
         self.preview_data = [None] * self.count
         for item in self.items:
             item.set_preview(None)
@@ -294,6 +320,7 @@ class PreviewGenWindow(QWidget):
         if count <= 0:
             return
         self._set_controls_enabled(False)
+        self.abort_event = threading.Event()
         self.worker_thread = QThread()
         self.worker = PreviewGeneratorWorker(
             self.prompt,
@@ -307,6 +334,8 @@ class PreviewGenWindow(QWidget):
             count,
             self.language,
             row_indices=target_indices,
+            batch_size=self.batch_size,
+            abort_event=self.abort_event,
         )
         self.worker.moveToThread(self.worker_thread)
         self.worker_thread.started.connect(self.worker.run)
@@ -314,6 +343,7 @@ class PreviewGenWindow(QWidget):
             lambda previews: self._previews_finished(previews, target_indices)
         )
         self.worker.failed.connect(self._previews_failed)
+        self.worker.progress.connect(self._on_step_progress)
         self.worker.finished.connect(self.worker_thread.quit)
         self.worker.failed.connect(self.worker_thread.quit)
         self.worker_thread.finished.connect(self.worker.deleteLater)
@@ -332,6 +362,17 @@ class PreviewGenWindow(QWidget):
         self._emit_error(self.strings.get("error_title", "Error"), message, level="error")
         self._set_controls_enabled(True)
 
+    def _on_step_progress(self, step: int, total: int, seconds: float):
+        self.progress_bar.setVisible(True)
+        self.progress_bar.setMaximum(max(total, 1))
+        self.progress_bar.setValue(step)
+        self.progress_bar.setToolTip(format_message(self.strings, "step_time", seconds=seconds))
+
+    def abort_generation(self):
+        if self.abort_event:
+            self.abort_event.set()
+        self.abort_button.setEnabled(False)
+
     def regenerate_unselected(self):
         target_indices = [idx for idx, item in enumerate(self.items) if not item.checkbox.isChecked()]
         self._start_generation(len(target_indices), target_indices)
@@ -359,6 +400,10 @@ class PreviewGenWindow(QWidget):
             item.checkbox.setChecked(False)
 
     def _set_controls_enabled(self, enabled: bool):
+        if enabled:
+            self.progress_bar.setVisible(False)
+            self.progress_bar.reset()
+        self.abort_button.setEnabled(not enabled)
         self.regenerate_top.setEnabled(enabled)
         self.regenerate_bottom.setEnabled(enabled)
         self.apply_button.setEnabled(enabled)
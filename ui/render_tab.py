@@ -1,8 +1,11 @@
+import multiprocessing
 import os
 import tempfile
+import threading
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 
-from PySide6.QtCore import Signal
+from PySide6.QtCore import QObject, QThread, Signal
 from PySide6.QtWidgets import (
     QFileDialog,
     QHBoxLayout,
@@ -11,14 +14,81 @@ from PySide6.QtWidgets import (
     QWidget,
 )
 
+from renderer.core.deck_watch import DeckWatchSession
 from renderer.core.json_loader import load_template
-from renderer.core.paths import ABSOLUTE_PATH
+from renderer.core.paths import ABSOLUTE_PATH, PROJECT_PATH
 from renderer.core.psd_importer import PsdImporter
 from renderer.core.renderer import CardRenderer
+from renderer.core.scene_sharding import export_shard, plan_scene_jobs
+from renderer.widgets.card_scene_view import CardSceneView
 from renderer.widgets.drag_canvas import DragCanvas
 from renderer.widgets.property_panel import PropertyPanel
 from ui.locales import ensure_language, format_message, get_section
 
+WATCH_LAYOUT = PROJECT_PATH("renderer/layouts/template_layout.json")
+
+
+class DeckWatchWorker(QObject):
+    """
+    Watches deck/layout/arts in a worker thread and re-renders affected cards.
+
+    QPixmap can't be used off the GUI thread, so PNGs are painted in one
+    spawned process; the UI thread only receives payloads for the preview.
+    """
+
+    updated = Signal(dict)
+    failed = Signal(str)
+    warned = Signal(str)
+    finished = Signal()
+
+    def __init__(self, deck_path: str, layout_path: str, export_root: str, stop_event: threading.Event):
+        super().__init__()
+        self.deck_path = deck_path
+        self.layout_path = layout_path
+        self.export_root = export_root
+        self.stop_event = stop_event
+
+    def run(self):
+        try:
+            session = DeckWatchSession(self.deck_path, layout_paths=[self.layout_path])
+            update = session.initial()
+            out_dir = os.path.join(self.export_root, update.deck.name)
+            os.makedirs(out_dir, exist_ok=True)
+            previous_paths: set = set()
+            ctx = multiprocessing.get_context("spawn")
+            with ProcessPoolExecutor(max_workers=1, mp_context=ctx) as pool:
+                while update is not None and not self.stop_event.is_set():
+                    jobs = plan_scene_jobs(update.deck, out_dir, avoid_existing=False)
+                    selected = [jobs[idx] for idx in update.indices]
+                    if selected:
+                        try:
+                            pool.submit(
+                                export_shard, 0, self.layout_path, None, update.deck.deck_color, selected, None
+                            ).result()
+                        except (OSError, ValueError) as exc:
+                            # Напівзбережений layout — чекаємо наступного збереження, як і для колоди
+                            self.warned.emit(str(exc))
+                            update = session.next_update(self.stop_event)
+                            continue
+                    current_paths = {job[2] for job in jobs}
+                    for stale in previous_paths - current_paths:
+                        if os.path.exists(stale):
+                            os.remove(stale)
+                    previous_paths = current_paths
+                    self.updated.emit(
+                        {
+                            "reason": update.reason,
+                            "layout_changed": update.layout_changed,
+                            "deck_color": update.deck.deck_color,
+                            "cards": [(idx, payload) for idx, payload, _ in selected],
+                            "paths": [job[2] for job in jobs],
+                        }
+                    )
+                    update = session.next_update(self.stop_event)
+        except Exception as exc:
+            self.failed.emit(str(exc))
+        self.finished.emit()
+
 
 class RenderTab(QWidget):
     cardsRendered = Signal(list)
@@ -34,6 +104,10 @@ class RenderTab(QWidget):
 
         self.rendered_cards: list[str] = []
         self.current_art: str | None = None
+        self.watch_thread: QThread | None = None
+        self.watch_worker: DeckWatchWorker | None = None
+        self.watch_stop: threading.Event | None = None
+        self.watch_view: CardSceneView | None = None
 
         layout = QHBoxLayout()
 
@@ -68,6 +142,12 @@ class RenderTab(QWidget):
         self.render_button.clicked.connect(self.render_card)
         right.addWidget(self.render_button)
 
+        # Toggle: watch a deck JSON and re-render changed cards in the background
+        self.watch_button = QPushButton()
+        self.watch_button.setCheckable(True)
+        self.watch_button.toggled.connect(self.toggle_watch)
+        right.addWidget(self.watch_button)
+
         layout.addLayout(right)
         self.setLayout(layout)
 
@@ -165,6 +245,93 @@ class RenderTab(QWidget):
         self.rendered_cards = [save_path]
         self.cardsRendered.emit(self.rendered_cards)
 
+    # ------------------------------------------------------------------
+    def toggle_watch(self, enabled: bool):
+        if not enabled:
+            self.stop_watch()
+            return
+        deck_path, _ = QFileDialog.getOpenFileName(
+            self,
+            self.strings.get("watch_open_title", ""),
+            "",
+            "JSON (*.json)",
+        )
+        if not deck_path:
+            self.watch_button.setChecked(False)
+            return
+
+        if self.watch_view is None:
+            self.watch_view = CardSceneView(WATCH_LAYOUT)
+            self.watch_view.resize(520, 720)
+        self.watch_view.setWindowTitle(self.strings.get("watch_window_title", ""))
+        self.watch_view.show()
+
+        export_root = (self.get_export_dir() or "export").strip() or "export"
+        self.watch_stop = threading.Event()
+        self.watch_thread = QThread()
+        self.watch_worker = DeckWatchWorker(deck_path, WATCH_LAYOUT, export_root, self.watch_stop)
+        self.watch_worker.moveToThread(self.watch_thread)
+        self.watch_thread.started.connect(self.watch_worker.run)
+        self.watch_worker.updated.connect(self._on_watch_update)
+        self.watch_worker.failed.connect(self._on_watch_failed)
+        self.watch_worker.warned.connect(self._on_watch_warned)
+        self.watch_worker.finished.connect(self.watch_thread.quit)
+        self.watch_thread.finished.connect(self.watch_worker.deleteLater)
+        self.watch_thread.finished.connect(self.watch_thread.deleteLater)
+        # Прив'язка до конкретного потоку: finished старого спостерігача не має
+        # скидати новий, запущений після швидкого повторного вмикання
+        thread = self.watch_thread
+        thread.finished.connect(lambda: self._on_watch_stopped(thread))
+        thread.start()
+
+    def stop_watch(self):
+        if self.watch_stop is not None:
+            self.watch_stop.set()
+            # Кнопка повернеться, коли потік справді завершиться
+            if self.watch_thread is not None:
+                self.watch_button.setEnabled(False)
+
+    def shutdown_watch(self):
+        """Stop watching and close the preview window (called when the app closes)."""
+        self.stop_watch()
+        if self.watch_thread is not None:
+            self.watch_thread.quit()
+            self.watch_thread.wait(5000)
+        if self.watch_view is not None:
+            self.watch_view.close()
+
+    def _on_watch_update(self, update: dict):
+        # Лише легкі зміни на UI-потоці: сцена вже побудована, міняємо тексти/арт
+        if self.watch_view is not None:
+            if update["layout_changed"]:
+                self.watch_view.load_template(WATCH_LAYOUT)
+            if update["cards"]:
+                _, payload = update["cards"][0]
+                self.watch_view.apply_card_data(payload, update["deck_color"])
+            self.watch_view.setWindowTitle(
+                format_message(self.strings, "watch_status", count=len(update["cards"]), reason=update["reason"])
+            )
+        self.rendered_cards = update["paths"]
+        self.cardsRendered.emit(self.rendered_cards)
+
+    def _on_watch_failed(self, message: str):
+        self._emit_error(self.strings.get("error_title", ""), message, level="error")
+
+    def _on_watch_warned(self, message: str):
+        self._emit_error(self.strings.get("error_title", ""), message, level="warning")
+
+    def _on_watch_stopped(self, thread: QThread):
+        if thread is not self.watch_thread:
+            return
+        self.watch_thread = None
+        self.watch_worker = None
+        self.watch_stop = None
+        if self.watch_button.isChecked():
+            self.watch_button.blockSignals(True)
+            self.watch_button.setChecked(False)
+            self.watch_button.blockSignals(False)
+        self.watch_button.setEnabled(True)
+
     def get_rendered_cards(self) -> list[str]:
         return self.rendered_cards
 
@@ -176,6 +343,7 @@ class RenderTab(QWidget):
         self.import_psd_button.setText(strings.get("import_psd", "Import PSD"))
         self.apply_ai_button.setText(strings.get("apply_ai", ""))
         self.render_button.setText(strings.get("render_card", ""))
+        self.watch_button.setText(strings.get("watch_deck", "Watch deck"))
 
     def _emit_error(self, title: str, message: str, level: str = "error"):
         if self.error_notifier: